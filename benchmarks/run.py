@@ -0,0 +1,179 @@
+"""
+Micro-benchmarks for the request parser, the router, the response serializer and the whole dispatch path.
+
+Usage:
+    python -m benchmarks.run                                  # run everything and print a table
+    python -m benchmarks.run --filter router --output out.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.run --save-baseline                  # overwrite benchmarks/baseline.json
+
+Each benchmark reports the median ops/sec over several rounds and the memory allocated by a
+single operation as measured by tracemalloc. With --baseline the run exits with status 1 when a
+benchmark is slower than the baseline by more than the threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from src.rollasback.http_request import HttpRequest
+
+from benchmarks import workloads
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def collect_benchmarks():
+    """
+    Returns: dict: Benchmark name mapped to a zero-argument callable running one operation.
+    """
+    benchmarks = {}
+    for name, raw in workloads.REQUESTS.items():
+        benchmarks[f"parser.{name}"] = lambda raw=raw: HttpRequest(raw)
+        # The server reuses the request object of a keep-alive connection
+        benchmarks[f"parser.{name}_reused"] = lambda raw=raw, request=HttpRequest(None): request.parse(raw)
+
+    for route_count in (10, 100, 1000):
+        pipeline = workloads.make_app(route_count)
+        first = workloads.routed_request(0)
+        last = workloads.routed_request(route_count - 1)
+        missing = HttpRequest(workloads.request_string(path="/missing"))
+        benchmarks[f"router.{route_count}_routes_first"] = lambda p=pipeline, r=first: p(r)
+        benchmarks[f"router.{route_count}_routes_last"] = lambda p=pipeline, r=last: p(r)
+        benchmarks[f"router.{route_count}_routes_miss"] = lambda p=pipeline, r=missing: p(r)
+
+    pipeline = workloads.make_app(10, metrics=True)
+    request = workloads.routed_request(9)
+    benchmarks["router.10_routes_last_with_metrics"] = lambda: pipeline(request)
+
+    # Parse, route, handle and serialize without the network
+    client = workloads.make_client(10)
+    benchmarks["dispatch.10_routes_test_client"] = lambda: client.get("/resource9/42?page=1")
+
+    for name, size in workloads.RESPONSE_SIZES.items():
+        response = workloads.make_response(size)
+        benchmarks[f"serializer.{name}"] = lambda response=response: bytes(response)
+        benchmarks[f"serializer.{name}_build"] = lambda size=size: bytes(workloads.make_response(size))
+    return benchmarks
+
+
+def measure(func, rounds=5, min_time=0.1):
+    """
+    Measures the throughput and the per-operation allocations of a callable.
+    Args:
+        func: The zero-argument callable to measure.
+        rounds (int): Number of timed rounds, the median is reported.
+        min_time (float): Minimum duration of a round in seconds.
+    Returns: dict: ops_per_sec, allocated_bytes and allocated_blocks.
+    """
+    func()  # warm up
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    results = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            results.append(iterations / (time.perf_counter() - start))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        "ops_per_sec": round(statistics.median(results), 1),
+        "allocated_bytes": max(peak - baseline, 0),
+        "allocated_blocks": blocks,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline.
+    Returns: list: (name, baseline ops/sec, current ops/sec, change) of the regressed benchmarks.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = current["ops_per_sec"] / previous["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((name, previous["ops_per_sec"], current["ops_per_sec"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RollAsBack micro-benchmarks")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum duration of a round in seconds")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against the results stored in this file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before failing (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH}")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, func in sorted(collect_benchmarks().items()):
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, rounds=args.rounds, min_time=args.min_time)
+        result = results[name]
+        print(f"{name:<45} {result['ops_per_sec']:>14,.1f} ops/s {result['allocated_bytes']:>12,} B "
+              f"{result['allocated_blocks']:>8,} blocks")
+
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, previous, current, change in regressions:
+            print(f"REGRESSION {name}: {previous:,.1f} -> {current:,.1f} ops/s ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regression above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
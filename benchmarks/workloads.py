@@ -0,0 +1,109 @@
+"""
+Reproducible workloads for the parser, router and serializer benchmarks.
+Every builder is deterministic so that results can be compared against a stored baseline.
+"""
+import json
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_request import HttpRequest
+from src.rollasback.http_response import HttpResponse
+
+SMALL_HEADERS = {
+    "Host": "localhost:8080",
+    "User-Agent": "rollasback-bench/1.0",
+    "Accept": "*/*",
+}
+
+# A browser-like header block, about 1.5 KB
+LARGE_HEADERS = dict(SMALL_HEADERS, **{
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,tr;q=0.8,de;q=0.7",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Referer": "https://www.example.com/some/long/path/to/a/page?with=query&and=more",
+    "Cookie": "; ".join(f"cookie{i}={'v' * 40}" for i in range(12)),
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "same-origin",
+    "X-Request-Id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+    "X-Forwarded-For": "203.0.113.195, 70.41.3.18, 150.172.238.178",
+})
+
+
+def request_string(method="GET", path="/", headers=None, body=""):
+    """
+    Builds a raw HTTP/1.1 request string.
+    """
+    lines = [f"{method} {path} HTTP/1.1"]
+    lines.extend(f"{key}: {value}" for key, value in (headers or SMALL_HEADERS).items())
+    return "\r\n".join(lines) + "\r\n\r\n" + body
+
+
+def json_body(items):
+    return json.dumps({"items": [{"id": i, "name": f"item-{i}", "tags": ["a", "b"]} for i in range(items)]})
+
+
+def xml_body(items):
+    return "<root>" + "".join(f"<item id=\"{i}\"><name>item-{i}</name></item>" for i in range(items)) + "</root>"
+
+
+def urlencoded_body(fields):
+    return "&".join(f"field{i}=value{i}" for i in range(fields))
+
+
+REQUESTS = {
+    "get_small_headers": request_string(),
+    "get_large_headers": request_string(headers=LARGE_HEADERS),
+    "post_json_small": request_string("POST", "/api", dict(SMALL_HEADERS, **{"Content-Type": "application/json"}),
+                                      json_body(5)),
+    "post_json_large": request_string("POST", "/api", dict(SMALL_HEADERS, **{"Content-Type": "application/json"}),
+                                      json_body(500)),
+    "post_xml": request_string("POST", "/api", dict(SMALL_HEADERS, **{"Content-Type": "application/xml"}),
+                               xml_body(50)),
+    "post_urlencoded": request_string("POST", "/api", dict(SMALL_HEADERS, **{
+        "Content-Type": "application/x-www-form-urlencoded"}), urlencoded_body(50)),
+}
+
+RESPONSE_SIZES = {
+    "response_100b": 100,
+    "response_10kb": 10 * 1024,
+    "response_1mb": 1024 * 1024,
+    "response_4mb": 4 * 1024 * 1024,
+}
+
+
+def build_app(route_count, metrics=False):
+    app = RollAsBack(f"bench-{route_count}")
+    response = HttpResponse("ok", response_headers={})
+
+    def handler(request):
+        return response
+
+    for i in range(route_count):
+        app.endpoint(f"/resource{i}/{{item_id}}")(handler)
+    if metrics:
+        app.enable_metrics()
+    return app
+
+
+def make_app(route_count, metrics=False):
+    """
+    Builds an app with route_count parametrised routes and returns its compiled pipeline.
+    """
+    return build_app(route_count, metrics).build_pipeline()
+
+
+def make_client(route_count):
+    """
+    Builds an app with route_count parametrised routes and returns its in-process test client.
+    """
+    return build_app(route_count).test_client()
+
+
+def routed_request(route_index):
+    return HttpRequest(request_string(path=f"/resource{route_index}/42?page=1"))
+
+
+def make_response(size):
+    return HttpResponse("x" * size, response_headers={})
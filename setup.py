@@ -11,7 +11,7 @@ setup(
         'requests',
         'urllib3'
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     description='Web backend framework written in Python named as RollAsBack.',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
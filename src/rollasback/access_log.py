@@ -0,0 +1,243 @@
+"""
+Author(s): CodeWiki
+File name: access_log.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import atexit
+import json
+import logging as log
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+
+APP_LOGGER_NAME = "rollasback"
+ACCESS_LOGGER_NAME = "rollasback.access"
+ACCESS_FIELDS = ("client", "method", "path", "route", "status", "bytes", "duration_ms")
+# Written only when the record has them, eg: the phase timings of the server
+OPTIONAL_ACCESS_FIELDS = ("timings",)
+
+_setup_lock = threading.Lock()
+_app_logger_ready = False
+
+
+class BatchingStreamHandler(log.StreamHandler):
+    """
+    StreamHandler that buffers formatted records and writes them with a single call
+    once the buffer is full or when flushed.
+    Attributes:
+        capacity (int): Number of records buffered before a write.
+    """
+
+    def __init__(self, stream=None, capacity=256):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+            if len(self.buffer) >= self.capacity:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.stream is None or getattr(self.stream, "closed", False):
+                # The stream can be closed before the interpreter runs the atexit hooks
+                self.buffer = []
+                return
+            if self.buffer:
+                self.stream.write("".join(self.buffer))
+                self.buffer = []
+            super().flush()
+        finally:
+            self.release()
+
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record as it is, formatting happens on the listener thread.
+    Only suitable for in-process queues.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers when the queue stays empty for flush_interval seconds,
+    so buffered records are written in batches under load and promptly when idle.
+    """
+    _flush = object()
+
+    def __init__(self, log_queue, *handlers, flush_interval=0.5):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block, timeout=self.flush_interval)
+        except queue.Empty:
+            return self._flush
+
+    def handle(self, record):
+        if record is self._flush:
+            self.flush()
+            return
+        super().handle(record)
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        super().stop()
+        self.flush()
+
+
+class JsonFormatter(log.Formatter):
+    """
+    Formats access records as one JSON object per line.
+    """
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S")}
+        for field in ACCESS_FIELDS:
+            entry[field] = getattr(record, field, None)
+        for field in OPTIONAL_ACCESS_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry, separators=(",", ":"))
+
+
+def _open_stream(target):
+    # Returns the stream and whether it was opened here
+    if target is None or target == "-":
+        return sys.stdout, False
+    if target == "stderr":
+        return sys.stderr, False
+    if isinstance(target, str):
+        return open(target, "a", encoding="utf-8"), True
+    return target, False
+
+
+def start_listener(logger, handler, flush_interval=0.5):
+    """
+    Routes a logger through a queue so that records are written by a background thread.
+    Args:
+        logger (Logger): The logger to attach the QueueHandler to.
+        handler (Handler): The handler writing the records, called on the listener thread.
+        flush_interval (float): Seconds of idle queue after which buffered records are written.
+    Returns: BatchingQueueListener: The started listener.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = BatchingQueueListener(log_queue, handler, flush_interval=flush_interval)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def setup_app_logger():
+    """
+    Returns the application logger, configuring its queue handler only once per process
+    so creating several apps does not duplicate the output. Records still propagate to the
+    handlers configured on the root logger.
+    Returns: Logger: The "rollasback" logger.
+    """
+    global _app_logger_ready
+    logger = log.getLogger(APP_LOGGER_NAME)
+    with _setup_lock:
+        if not _app_logger_ready:
+            logger.setLevel(log.INFO)
+            handler = BatchingStreamHandler(sys.stderr, capacity=64)
+            handler.setFormatter(log.Formatter("%(asctime)s:%(name)s:%(levelname)s:%(message)s"))
+            start_listener(logger, handler)
+            _app_logger_ready = True
+    return logger
+
+
+class AccessLogger:
+    """
+    Writes one structured record per request through a queue, the request thread only samples,
+    filters and enqueues the raw fields.
+    Attributes:
+        sample_rate (float): Fraction of the successful requests to log, 4xx and 5xx are always logged.
+        level (int): Minimum level of the logged records, 2xx/3xx are INFO, 4xx WARNING and 5xx ERROR.
+        logger (Logger): The logger of this access log, kept out of the logging registry so that it is released with
+            the AccessLogger. With propagate its records also reach the handlers of the "rollasback.access" logger
+            and its parents.
+    """
+
+    def __init__(self, target=None, sample_rate=1.0, level=log.INFO, capacity=256, flush_interval=0.5,
+                 formatter=None, propagate=False):
+        self.sample_rate = sample_rate
+        self.level = level
+        self.logger = log.Logger(ACCESS_LOGGER_NAME, level)
+        if propagate:
+            self.logger.parent = log.getLogger(ACCESS_LOGGER_NAME)
+        stream, self.__owns_stream = _open_stream(target)
+        handler = BatchingStreamHandler(stream, capacity=capacity)
+        handler.setFormatter(formatter or JsonFormatter())
+        self.listener = start_listener(self.logger, handler, flush_interval=flush_interval)
+
+    def log(self, client, method, path, route, status, size, duration, timings=None):
+        """
+        Logs a finished request.
+        Args:
+            client (str): The client address.
+            method (str): The HTTP method.
+            path (str): The requested path.
+            route (str): The matched route path, None if nothing matched.
+            status (int): The response status code.
+            size (int): Number of bytes sent.
+            duration (float): Request duration in seconds.
+            timings (dict): Milliseconds per phase and span of the request, None when the server does not time them.
+        """
+        if status >= 500:
+            level = log.ERROR
+        elif status >= 400:
+            level = log.WARNING
+        else:
+            level = log.INFO
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return
+        if level < self.level:
+            return
+        self.logger.log(level, "%s %s %s", method, path, status, extra={
+            "client": client, "method": method, "path": path, "route": route,
+            "status": status, "bytes": size, "duration_ms": round(duration * 1000, 3), "timings": timings,
+        })
+
+    def close(self):
+        """
+        Writes the buffered records and stops the listener thread.
+        """
+        self.listener.stop()
+        atexit.unregister(self.listener.stop)
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        for handler in self.listener.handlers:
+            if self.__owns_stream:
+                handler.stream.close()
+            handler.close()
@@ -14,20 +14,71 @@ with the software or the use or other dealings in the software.
 
 Copyright @ CodeWiki by MIT License
 """
+import asyncio
+import base64
+import binascii
+import inspect
 import logging as log
+import os
 import re
+import select
+import signal
 import socket
+import ssl
+import subprocess
+import sys
+import threading
 import time
-from rollasback.http_response import HttpResponse, RESPONSEMEMETYPES
-from rollasback.http_request import HttpRequest
+from dataclasses import replace
+from functools import partial
+from .access_log import AccessLogger, setup_app_logger
+from .background import BackgroundTaskPool
+from .client import UpstreamClient
+from .connection import Connection, ConnectionLimits, RequestReadError
+from .event_loop import EventLoopThread
+from .gateway import ResponseBody, asgi_request, response_parts, wsgi_request
+from .http_response import (HttpResponse, HTTPRESPONSECODES, RESPONSEMEMETYPES, RawResponse, StreamingResponse,
+                            serialize)
+from .http_request import HttpRequest, REQUEST_METHODS
+from .http2 import Http2Connection
+from .listener import (DEFAULT_UNIX_SOCKET_MODE, fd_listener, systemd_listen_fds, tcp_listener,
+                       unix_listener)
+from .metrics import MetricsRegistry, DEFAULT_BUCKETS, UNMATCHED_ROUTE
+from .middleware import compose
+from .process_pool import EXECUTORS, ProcessPool
+from .profiler import RequestProfiler, PROFILE_HEADER, SORT_KEYS
+from .ratelimit import RateLimiter
+from .redirects import RedirectTable
+from .sse import EventHub
+from .tls import server_context
+from .testing import TestClient
+from .timing import RequestTiming, ServerTiming
+from .websocket import (ASGIWebSocket, AsyncWebSocket, BlockingWebSocket, HandshakeError, ThreadedWebSocket,
+                        WebSocket, handshake, handshake_response, GOING_AWAY, INTERNAL_ERROR, NORMAL_CLOSURE)
 from urllib.parse import urlparse, parse_qs
 
+# Set for a process started by a reload: the inherited listening socket and the pipe signalling readiness
+LISTEN_FD_ENV = "ROLLASBACK_LISTEN_FD"
+READY_FD_ENV = "ROLLASBACK_READY_FD"
+
+CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
+H2C_UPGRADE_RESPONSE = b"HTTP/1.1 101 Switching Protocols\r\nConnection: Upgrade\r\nUpgrade: h2c\r\n\r\n"
+
 
 class Route:
-    def __init__(self, path, func):
+    def __init__(self, path, func, max_body_size=None, rate_limit=None, subprotocols=(), executor="thread",
+                 timeout=None):
         self.path = path
         self.func = func
+        self.handler = func
+        self.max_body_size = max_body_size
+        self.rate_limit = rate_limit
+        self.subprotocols = tuple(subprotocols)
+        self.executor = executor
+        self.timeout = timeout
+        self.is_async = inspect.iscoroutinefunction(func)
         self.regex_pattern = self.generate_regex_pattern()
+        self.regex = re.compile(self.regex_pattern)
 
     def generate_regex_pattern(self):
         """
@@ -54,97 +105,1029 @@ class RollAsBack:
         self.name = name
         self.config = {}
         self.routes = []
+        self.websocket_routes = []
+        self.middlewares = []
+        self.before_request_hooks = []
+        self.after_request_hooks = []
+        self.metrics = None
+        self.profiler = None
+        self.access_log = None
+        self.rate_limiter = None
+        self.http_client = None
+        self.redirect_table = None
+        self.event_hubs = []
+        self.tls_context = None
+        self.process_pool = None
+        self.server_timing = None
+        self.background = BackgroundTaskPool()
+        self.event_loop = EventLoopThread()
+        self.__internal_paths = set()
+        self.__not_found_handler = self.__not_found
+        self.__router = self.__route
+        self.__connections = set()
+        self.__connections_changed = threading.Condition()
+        # The loop only holds weak references to its tasks
+        self.__websocket_tasks = set()
+        self.__stopping = threading.Event()
+        self.__reloading = threading.Event()
+        self.__wakeup = socket.socketpair()
         self.backlog = backlog
         self.kwargs = kwargs
-        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__socket = None
+        # The socket file this process removes when it stops, None when it is not ours
+        self.__unix_path = None
+        self.__http2 = False
+        self.__pipeline = None
+        self.__pipeline_lock = threading.Lock()
         self.logger = self.__setup_logger()
 
+    @property
+    def server_address(self):
+        """
+        The address the server is listening on, None before start_server.
+        """
+        return self.__ip_address
+
     def __setup_logger(self):
-        logger = log.getLogger(__name__)
-        logger.setLevel(log.INFO)
-        log.Formatter('%(asctime)s:%(name)s:%(levelname)s:%(message)s')
-        logger.addHandler(log.StreamHandler())
-        return logger
+        return setup_app_logger()
+
+    def endpoint(self, path, max_body_size=None, rate_limit=None, executor="thread", timeout=None):
+        """
+        Registers the decorated function as the handler of the path.
+        An async def handler runs on the event loop thread of the app, blocking handlers on the connection thread.
+        :param path: The path of the endpoint, eg: /user/{user_id}
+        :param max_body_size: Largest accepted request body in bytes, overrides ConnectionLimits.max_body_size.
+        :param rate_limit: RateLimiter applied to this route only, on top of the limit of enable_rate_limit.
+        :param executor: "process" runs a CPU-bound handler in the process pool of the app, outside of the GIL of
+            the server. The handler must be a module level function.
+        :param timeout: Seconds a process handler may take before a 504, the timeout of the pool when None.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, not {executor!r}")
 
-    def endpoint(self, path):
         def decorator(func):
-            route = Route(path, func)
+            if executor == "process" and inspect.iscoroutinefunction(func):
+                raise ValueError("An async def handler can not run in the process pool")
+            route = Route(path, func, max_body_size=max_body_size, rate_limit=rate_limit, executor=executor,
+                          timeout=timeout)
             self.routes.append(route)
             return func
 
         return decorator
 
-    def start_server(self, host, port):
-        self.__socket.bind((host, port))
-        self.__socket.listen(5)
-        self.__ip_address = self.__socket.getsockname()
+    def websocket(self, path, max_message_size=None, subprotocols=()):
+        """
+        Registers the decorated function as the WebSocket handler of the path, called with the open WebSocket.
+        An async def handler gets an AsyncWebSocket served by the event loop thread of the app and holds no thread
+        while it waits, a blocking handler gets a WebSocket and keeps its connection thread.
+        Hooks and middlewares do not run on WebSocket handshakes.
+        :param path: The path of the endpoint, eg: /live/{channel}
+        :param max_message_size: Largest accepted message in bytes, overrides ConnectionLimits.max_message_size.
+        :param subprotocols: Subprotocols the handler speaks, in order of preference.
+        """
+        def decorator(func):
+            self.websocket_routes.append(Route(path, func, max_body_size=max_message_size, subprotocols=subprotocols))
+            return func
+
+        return decorator
+
+    def middleware(self, func):
+        """
+        Registers a middleware with the signature ``func(request, call_next)``.
+        Returning a response without calling ``call_next`` short-circuits the request.
+        """
+        self.middlewares.append(func)
+        return func
+
+    def before_request(self, func):
+        """
+        Registers a hook called with the request before routing. Returning a response skips the handler.
+        """
+        self.before_request_hooks.append(func)
+        return func
+
+    def after_request(self, func):
+        """
+        Registers a hook called with the request and the response. Returning a response replaces it.
+        """
+        self.after_request_hooks.append(func)
+        return func
+
+    def enable_metrics(self, path="/__metrics", buckets=DEFAULT_BUCKETS):
+        """
+        Records per-route request counts, status codes, in-flight requests and latency histograms,
+        and serves them in the Prometheus text format on the given path.
+        :param path: The path of the metrics endpoint.
+        :param buckets: Upper bounds of the latency histogram buckets in seconds.
+        :return: The MetricsRegistry of the app.
+        """
+        self.metrics = MetricsRegistry(buckets=buckets)
+
+        @self.endpoint(path)
+        def metrics_endpoint(request):
+            page = self.metrics.render() + self.background.render()
+            if self.http_client is not None:
+                page += self.http_client.render()
+            return HttpResponse(page, response_headers={},
+                                mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+        self.__internal_paths.add(path)
+        return self.metrics
+
+    def enable_profiling(self, sample_rate=0.0, header=PROFILE_HEADER, token=None, path="/__profile",
+                         allow_anonymous=False):
+        """
+        Profiles route handlers with cProfile and serves the statistics aggregated per route on the given path.
+        A request is profiled when it is sampled or when it carries the header with the token.
+        cProfile only sees the thread serving the request: async and process handlers are not profiled.
+        The endpoint takes the query parameters route, format (text or prof), sort and limit,
+        and requires the same header. Without a token it is only served when allow_anonymous is set.
+        :param sample_rate: Fraction of the requests to profile, between 0 and 1.
+        :param header: Name of the header that requests profiling.
+        :param token: Secret value the header must carry, header triggering is disabled when None.
+        :param path: The path of the profile endpoint.
+        :param allow_anonymous: Serves the endpoint without a token, to every client.
+        :return: The RequestProfiler of the app.
+        """
+        self.profiler = RequestProfiler(sample_rate=sample_rate, header=header, token=token)
+        if token is None and not allow_anonymous:
+            # The statistics stay readable in-process with app.profiler.report() and dump()
+            return self.profiler
+
+        @self.endpoint(path)
+        def profile_endpoint(request):
+            if token is not None and not self.profiler.is_trusted(request):
+                return HttpResponse("Forbidden", response_headers={}, status=403)
+            route = request.query_params.get("route", [None])[0]
+            if request.query_params.get("format", ["text"])[0] == "prof":
+                data = self.profiler.dump(route)
+                if data is None:
+                    return HttpResponse("No profile collected", response_headers={}, status=404)
+                filename = (route or "all").strip("/").replace("/", "_") or "root"
+                return HttpResponse(data, response_headers={
+                    "Content-Disposition": f'attachment; filename="{filename}.prof"'
+                }, mimetype="application/octet-stream")
+            sort = request.query_params.get("sort", ["cumulative"])[0]
+            if sort not in SORT_KEYS:
+                return HttpResponse(f"Unknown sort key, use one of: {', '.join(sorted(SORT_KEYS))}",
+                                    response_headers={}, status=400)
+            limit = request.query_params.get("limit", ["30"])[0]
+            if not (limit.isascii() and limit.isdigit()):
+                return HttpResponse("limit must be a non-negative integer", response_headers={}, status=400)
+            limit = int(limit)
+            report = "".join(f"{name}: {count} profiled requests\n" for name, count in self.profiler.routes().items())
+            report += self.profiler.report(route, sort=sort, limit=limit)
+            return HttpResponse(report, response_headers={}, mimetype=RESPONSEMEMETYPES.text_plain)
+
+        self.__internal_paths.add(path)
+        return self.profiler
+
+    def enable_rate_limit(self, rate, burst=None, key="ip", max_keys=10000):
+        """
+        Limits the requests of every client to the whole app with token buckets.
+        Requests over the limit get a pre-serialized 429 with Retry-After before any hook or handler runs.
+        Routes take their own limit with endpoint(path, rate_limit=RateLimiter(...)).
+        :param rate: Sustained requests per second of a client.
+        :param burst: Requests a client can send at once, defaults to the rate.
+        :param key: "ip", "header:<Name>" or a function of the request returning the client key.
+        :param max_keys: Maximum number of clients tracked, the least recently seen are forgotten first.
+        :return: The RateLimiter of the app.
+        """
+        self.rate_limiter = RateLimiter(rate, burst=burst, key=key, max_keys=max_keys)
+        return self.rate_limiter
+
+    def enable_http_client(self, connect_timeout=2.0, read_timeout=10.0, max_connections=10, retries=2,
+                           backoff=0.05, breaker_threshold=5, breaker_reset=30.0):
+        """
+        Creates the HTTP client shared by the handlers to call upstream services, app.http_client.
+        Connections are kept alive and pooled per host, and its counters are added to the metrics endpoint.
+        :param connect_timeout: Seconds to establish a connection or wait for a free one.
+        :param read_timeout: Seconds a read may wait for data.
+        :param max_connections: Open connections per host.
+        :param retries: Retries of idempotent requests failing with a connection error or a timeout.
+        :param backoff: Seconds before the first retry, doubled on each retry.
+        :param breaker_threshold: Consecutive failures opening the circuit of a host.
+        :param breaker_reset: Seconds an open circuit rejects requests before a trial request.
+        :return: The UpstreamClient of the app.
+        """
+        self.http_client = UpstreamClient(connect_timeout=connect_timeout, read_timeout=read_timeout,
+                                          max_connections=max_connections, retries=retries, backoff=backoff,
+                                          breaker_threshold=breaker_threshold, breaker_reset=breaker_reset)
+        return self.http_client
+
+    def redirects(self, mapping_or_file, status=301, reload_interval=None):
+        """
+        Serves exact-path redirects from a table checked before the routes, with responses rendered once.
+        Calling it again replaces the redirects, call table.load() to read the file again.
+        :param mapping_or_file: A {source: target} or {source: (target, status)} dict, or a CSV/JSON file path.
+        :param status: Status of the redirects that do not set one, 301, 302, 303, 307 or 308.
+        :param reload_interval: Seconds between checks of the file, which is reloaded when it changes.
+        :return: The RedirectTable of the app.
+        """
+        if self.redirect_table is not None:
+            self.redirect_table.stop()
+        self.redirect_table = RedirectTable(mapping_or_file, status=status)
+        if reload_interval is not None:
+            self.redirect_table.watch(reload_interval)
+        return self.redirect_table
+
+    def event_hub(self, history=1000, queue_size=100, overflow="drop", heartbeat=15.0):
+        """
+        Creates a publish/subscribe hub of Server-Sent Events, return hub.stream(request) from a handler to subscribe.
+        The streams of the hub end when the server stops.
+        :param history: Number of events kept for clients reconnecting with a Last-Event-ID.
+        :param queue_size: Number of events a subscriber may have waiting for its connection.
+        :param overflow: "drop" drops the oldest waiting event of a full queue, "disconnect" ends the stream.
+        :param heartbeat: Idle seconds before a heartbeat comment is sent to a subscriber.
+        :return: The EventHub.
+        """
+        hub = EventHub(history=history, queue_size=queue_size, overflow=overflow, heartbeat=heartbeat)
+        self.event_hubs.append(hub)
+        return hub
+
+    def configure_background_tasks(self, workers=4, max_queue=1024):
+        """
+        Sizes the pool running the tasks added with request.add_background_task after the response is sent.
+        When the queue is full, tasks run on the connection thread after its response.
+        :param workers: Number of worker threads.
+        :param max_queue: Maximum number of tasks waiting for a worker.
+        :return: The BackgroundTaskPool of the app.
+        """
+        self.background = BackgroundTaskPool(workers=workers, max_queue=max_queue)
+        return self.background
+
+    def configure_process_pool(self, workers=None, max_tasks_per_child=None, timeout=30.0):
+        """
+        Sizes the pool running the handlers registered with executor="process", started on their first request.
+        :param workers: Number of worker processes, the number of CPUs when None.
+        :param max_tasks_per_child: Requests after which a worker process is replaced, to return its memory.
+        :param timeout: Default seconds a handler may take, the request gets a 504 after it.
+        :return: The ProcessPool of the app.
+        """
+        self.process_pool = ProcessPool(workers=workers, max_tasks_per_child=max_tasks_per_child, timeout=timeout)
+        return self.process_pool
+
+    def enable_access_log(self, target=None, sample_rate=1.0, level=log.INFO, capacity=256, flush_interval=0.5,
+                          propagate=False):
+        """
+        Writes one JSON record per request with the client, method, path, route, status, bytes and duration.
+        Records are enqueued on the request thread and formatted and written in batches by a background thread.
+        :param target: A file path, "-" or None for stdout, "stderr", or an open stream.
+        :param sample_rate: Fraction of the successful requests to log, 4xx and 5xx are always logged.
+        :param level: Minimum level of the logged records, 2xx/3xx are INFO, 4xx WARNING and 5xx ERROR.
+        :param capacity: Number of records buffered before a write.
+        :param flush_interval: Seconds of idle queue after which buffered records are written.
+        :param propagate: Also passes the records to the handlers of the "rollasback.access" logger and its parents.
+        :return: The AccessLogger of the app.
+        """
+        self.access_log = AccessLogger(target=target, sample_rate=sample_rate, level=level, capacity=capacity,
+                                       flush_interval=flush_interval, propagate=propagate)
+        return self.access_log
+
+    def enable_server_timing(self, header=True, access_log=True):
+        """
+        Times the phases of every request served by the built-in server with time.perf_counter_ns:
+        recv, parse, route, handler, serialize and send. Handlers add their own spans to request.timing.
+        :param header: Sends the phases up to the handler and the spans in a Server-Timing response header.
+            They are visible to every client, disable it when the timings should stay internal.
+        :param access_log: Adds the milliseconds of every phase and span to the access log records.
+        :return: The ServerTiming of the app.
+        """
+        self.server_timing = ServerTiming(header=header, access_log=access_log)
+        return self.server_timing
+
+    def build_pipeline(self):
+        """
+        Composes the registered hooks and the router into a single callable.
+        It is called once by start_server, hooks registered afterwards are not picked up.
+        :return: Callable taking an HttpRequest and returning the response to send.
+        """
+        for route in self.routes:
+            route.handler = self.__compile_route(route)
+        self.__not_found_handler = self.__not_found
+        if self.metrics is not None:
+            self.__not_found_handler = self.metrics.track(UNMATCHED_ROUTE, self.__not_found)
+        self.__router = self.__route
+        if self.server_timing is not None:
+            self.__router = self.server_timing.wrap("route", self.__route)
+            for route in self.routes:
+                route.handler = self.server_timing.wrap("handler", route.handler)
+        pipeline = compose(self.__dispatch, self.middlewares, self.before_request_hooks, self.after_request_hooks)
+        if self.rate_limiter is not None:
+            # Checked before any hook, a rejected request costs one dictionary lookup
+            pipeline = self.rate_limiter.wrap(pipeline)
+        return pipeline
+
+    def test_client(self, raise_server_exceptions=True):
+        """
+        Returns a client calling the app in-process, without sockets, for tests and benchmarks.
+        :param raise_server_exceptions: Re-raises handler errors instead of answering 500.
+        :return: A TestClient of the app.
+        """
+        return TestClient(self, raise_server_exceptions=raise_server_exceptions)
+
+    def __gateway_pipeline(self):
+        # Gateway servers have no start_server call, the pipeline is built on the first request
+        if self.__pipeline is None:
+            with self.__pipeline_lock:
+                if self.__pipeline is None:
+                    self.__pipeline = self.build_pipeline()
+        return self.__pipeline
 
-        self.logger.info(
-            "{} - {} Server started on : {} ".format(time.strftime('%Y-%m-%d %H:%M:%S'), self.name, self.__ip_address))
+    def __call_pipeline(self, pipeline, request):
         try:
+            return pipeline(request)
+        except Exception:
+            self.logger.exception("%s Unhandled error while serving %s %s", self.name, request.method, request.path)
+            return self.__error_response(HTTPRESPONSECODES.INTERNAL_SERVER_ERROR)
+
+    def wsgi_app(self, environ, start_response):
+        """
+        WSGI entry point, serves the app from any WSGI server, eg: gunicorn module:api.wsgi_app
+        :param environ: The WSGI environ.
+        :param start_response: The WSGI start_response callable.
+        :return: The response body as an iterable of bytes.
+        """
+        request = wsgi_request(environ)
+        response = self.__call_pipeline(self.__gateway_pipeline(), request)
+        status, headers, chunks = response_parts(response)
+        start_response(f"{status} {HTTPRESPONSECODES.RESPONSE_MESSAGES.get(status, 'Unknown')}", headers)
+
+        def on_close():
+            # The server calls close once the body is sent
+            if isinstance(response, StreamingResponse):
+                response.close()
+            self.background.submit_all(request.background_tasks)
+
+        return ResponseBody([] if request.method == "HEAD" else chunks, on_close)
+
+    async def asgi(self, scope, receive, send):
+        """
+        ASGI entry point, serves the app from any ASGI server, eg: uvicorn module:api.asgi
+        Handlers are blocking, they run in the default executor of the event loop.
+        :param scope: The ASGI connection scope.
+        :param receive: The ASGI receive awaitable.
+        :param send: The ASGI send awaitable.
+        """
+        if scope["type"] == "lifespan":
             while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    self.__gateway_pipeline()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] == "websocket":
+            await self.__asgi_websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        request = asgi_request(scope, b"".join(chunks))
+        pipeline = self.__gateway_pipeline()
+        response = await asyncio.get_running_loop().run_in_executor(None, self.__call_pipeline, pipeline, request)
+
+        status, headers, chunks = response_parts(response)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        })
+        try:
+            if request.method != "HEAD":
+                if isinstance(response, StreamingResponse):
+                    # Producing a streamed chunk can block, eg: on an upstream read
+                    loop = asyncio.get_running_loop()
+                    chunks = iter(chunks)
+                    while True:
+                        chunk = await loop.run_in_executor(None, next, chunks, None)
+                        if chunk is None:
+                            break
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                else:
+                    for chunk in chunks:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if isinstance(response, StreamingResponse):
+                response.close()
+        if request.background_tasks:
+            self.background.submit_all(request.background_tasks)
+
+    def __dispatch(self, request):
+        if self.redirect_table is not None:
+            redirect = self.redirect_table.lookup(request.path.partition("?")[0])
+            if redirect is not None:
+                return redirect
+        route, match = self.__router(request)
+        if route is None:
+            return self.__not_found_handler(request)
+        # Extract path parameters and add to the request object
+        request.path_params = list(match.groups())
+        request.route = route
+        return route.handler(request)
+
+    def __route(self, request):
+        parsed_url = urlparse(request.path)  # Parse the URL
+        request.query_params = parse_qs(parsed_url.query)  # Add the query parameters to the request object
+        return self.__match_route(parsed_url.path)
+
+    def __match_route(self, path, routes=None):
+        for route in self.routes if routes is None else routes:
+            match = route.regex.match(path)
+            if match:
+                return route, match
+        return None, None
+
+    def __compile_route(self, route):
+        handler = route.func
+        if route.executor == "process":
+            if self.process_pool is None:
+                self.process_pool = ProcessPool()
+            handler = self.process_pool.wrap(handler, route.timeout)
+        elif route.is_async:
+            # Coroutines run on the loop thread, the connection thread waits for their result
+            handler = self.event_loop.wrap(handler)
+        if route.path in self.__internal_paths:
+            return handler
+        if self.profiler is not None and route.executor != "process" and not route.is_async:
+            # cProfile would only time this thread waiting for the worker process or the event loop
+            handler = self.profiler.wrap(route.path, handler)
+        if route.rate_limit is not None:
+            handler = route.rate_limit.wrap(handler)
+        if self.metrics is not None:
+            handler = self.metrics.track(route.path, handler)
+        return handler
+
+    @staticmethod
+    def __not_found(request):
+        return HttpResponse(
+            response_message="Not Found",
+            response_headers={},
+            mimetype=RESPONSEMEMETYPES.text_plain,
+            status=404
+        )
+
+    def start_server(self, host=None, port=None, limits=None, shutdown_timeout=30.0, reload_timeout=30.0,
+                     handle_signals=True, certfile=None, keyfile=None, ssl_context=None, unix_socket=None,
+                     unix_socket_mode=DEFAULT_UNIX_SOCKET_MODE, unix_socket_group=None, fd=None, http2=False,
+                     **limit_options):
+        """
+        Starts the server and serves every connection on its own thread.
+        SIGTERM drains the server: it stops accepting, lets in-flight requests finish within shutdown_timeout
+        and returns. SIGHUP starts a new process on the same listening socket and drains this one once the
+        new process accepts connections.
+        The server listens on the first of: the sockets passed by systemd socket activation (LISTEN_FDS), fd,
+        unix_socket, then host and port.
+        :param host: The IP address or hostname to bind the server to.
+        :param port: The port number to bind the server to.
+        :param limits: ConnectionLimits with the timeouts and size limits, defaults are used when None.
+        :param shutdown_timeout: Seconds in-flight requests get to finish when the server stops.
+        :param reload_timeout: Seconds the process started by SIGHUP gets to become ready.
+        :param handle_signals: Installs the SIGTERM and SIGHUP handlers, only possible from the main thread.
+        :param certfile: PEM certificate chain, serves HTTPS with session resumption and ALPN when given.
+        :param keyfile: PEM private key, read from certfile when None.
+        :param ssl_context: An SSLContext to serve HTTPS with instead of the one built from certfile.
+        :param unix_socket: Path of a Unix domain socket to listen on instead of host and port.
+        :param unix_socket_mode: Permissions of the socket file.
+        :param unix_socket_group: Name or ID of the group owning the socket file.
+        :param fd: File descriptor of a socket already bound and listening, eg: opened by a supervisor.
+        :param http2: Serves cleartext HTTP/2 (h2c) to clients starting with the HTTP/2 preface or asking for
+            an Upgrade: h2c, other clients keep HTTP/1.1. Not used with TLS.
+        :param limit_options: Overrides of single ConnectionLimits fields, eg: header_timeout=5, max_connections=64.
+        """
+        limits = replace(limits or ConnectionLimits(), **limit_options)
+        if ssl_context is None and certfile is not None:
+            ssl_context = server_context(certfile, keyfile)
+        self.tls_context = ssl_context
+        self.__http2 = http2 and ssl_context is None
+        self.__socket = self.__open_listener(host, port, unix_socket, unix_socket_mode, unix_socket_group, fd)
+        self.__ip_address = self.__socket.getsockname()
+        self.__reload_timeout = reload_timeout
+        pipeline = self.build_pipeline()
+        # Rejections are answered from the accept loop, they are serialized once
+        overloaded = bytes(self.__error_response(HTTPRESPONSECODES.SERVICE_UNAVAILABLE))
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_server())
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, lambda signum, frame: self.reload_server())
+
+        self.logger.info("%s Server started on : %s%s", self.name, self.__ip_address,
+                         " (TLS)" if self.tls_context is not None else "")
+        self.__notify_ready()
+        try:
+            self.__accept_loop(limits, pipeline, overloaded)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.__drain(shutdown_timeout)
+
+    def __open_listener(self, host, port, unix_socket, unix_socket_mode, unix_socket_group, fd):
+        inherited = os.environ.pop(LISTEN_FD_ENV, None)
+        activated = systemd_listen_fds()
+        if inherited is not None:
+            # Started by the SIGHUP of a previous process, the socket is already bound and listening
+            listener = fd_listener(int(inherited))
+            if listener.family == socket.AF_UNIX and unix_socket is not None:
+                self.__unix_path = listener.getsockname()
+        elif activated:
+            if len(activated) > 1:
+                self.logger.warning("%s Listening on the first of %d activated sockets", self.name, len(activated))
+            listener = fd_listener(activated[0])
+        elif fd is not None:
+            listener = fd_listener(fd)
+        elif unix_socket is not None:
+            listener = unix_listener(unix_socket, self.backlog, unix_socket_mode, unix_socket_group)
+            self.__unix_path = unix_socket
+        elif port is not None:
+            listener = tcp_listener(host, port, self.backlog)
+        else:
+            raise ValueError("start_server needs a host and port, a unix_socket or an fd")
+        # Several processes can share the socket during a reload, accept must not block on a stolen connection
+        listener.setblocking(False)
+        return listener
+
+    def __accept_loop(self, limits, pipeline, overloaded):
+        wakeup = self.__wakeup[0]
+        while not self.__stopping.is_set():
+            readable, _, _ = select.select([self.__socket, wakeup], [], [])
+            if wakeup in readable:
+                wakeup.recv(4096)
+                if self.__reloading.is_set():
+                    self.__reloading.clear()
+                    if self.__start_successor():
+                        # The socket file now belongs to the new process
+                        self.__unix_path = None
+                        return
+                continue
+            try:
                 client_socket, addr = self.__socket.accept()
-                request_data = b''
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                return
+            if not addr:
+                # Clients of a Unix domain socket have no address, eg: a reverse proxy on the same host
+                addr = ("unix", 0)
+            connection = Connection(client_socket, addr, limits)
+            with self.__connections_changed:
+                accepted = len(self.__connections) < limits.max_connections
+                if accepted:
+                    self.__connections.add(connection)
+            if not accepted:
+                # A TLS client could not read a plain text 503
+                self.__reject(client_socket, overloaded if self.tls_context is None else b"")
+                continue
+            if self.tls_context is not None:
+                # Wrapping does no I/O, the handshake is done on the connection thread
+                connection.socket = self.tls_context.wrap_socket(client_socket, server_side=True,
+                                                                 do_handshake_on_connect=False)
+            threading.Thread(target=self.__serve_connection, args=(connection, pipeline), daemon=True).start()
 
-                while True:
-                    chunk = client_socket.recv(1024)
-                    if not chunk:
-                        break
-                    request_data += chunk
+    def __start_successor(self):
+        """
+        Starts a new process running the same command on the inherited listening socket.
+        :return: True once the new process accepts connections, False if it failed to start in time.
+        """
+        listen_fd = self.__socket.fileno()
+        ready_read, ready_write = os.pipe()
+        env = dict(os.environ, **{LISTEN_FD_ENV: str(listen_fd), READY_FD_ENV: str(ready_write)})
+        command = list(getattr(sys, "orig_argv", None) or [sys.executable] + sys.argv)
+        try:
+            process = subprocess.Popen(command, env=env, pass_fds=(listen_fd, ready_write))
+        except OSError:
+            self.logger.exception("%s Reload failed, could not start a new process", self.name)
+            os.close(ready_read)
+            os.close(ready_write)
+            return False
+        os.close(ready_write)
+        try:
+            readable, _, _ = select.select([ready_read], [], [], self.__reload_timeout)
+            ready = bool(readable) and os.read(ready_read, 1) == b"1"
+        finally:
+            os.close(ready_read)
+        if not ready:
+            self.logger.error("%s Reload failed, process %s did not become ready", self.name, process.pid)
+            process.kill()
+            return False
+        self.logger.info("%s Reloaded, process %s accepts connections, draining %s", self.name, process.pid,
+                         os.getpid())
+        return True
+
+    @staticmethod
+    def __notify_ready():
+        ready_fd = os.environ.pop(READY_FD_ENV, None)
+        if ready_fd is not None:
+            os.write(int(ready_fd), b"1")
+            os.close(int(ready_fd))
+
+    def __drain(self, timeout):
+        self.__stopping.set()
+        # Only our descriptor is closed, a process started by a reload keeps accepting on the socket
+        self.__socket.close()
+        if self.__unix_path is not None:
+            try:
+                os.unlink(self.__unix_path)
+            except OSError:
+                pass
+        for hub in self.event_hubs:
+            # Event streams never finish on their own
+            hub.close()
+        with self.__connections_changed:
+            connections = list(self.__connections)
+        for connection in connections:
+            if not connection.busy:
+                # Wakes up connections waiting for their next request
+                connection.shutdown()
+        deadline = time.monotonic() + timeout
+        with self.__connections_changed:
+            while self.__connections:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.__connections_changed.wait(remaining)
+            leftover = list(self.__connections)
+        for connection in leftover:
+            connection.close()
+        if leftover:
+            self.logger.warning("%s Closed %d connections still busy after %s seconds", self.name, len(leftover),
+                                timeout)
+        self.background.drain(max(deadline - time.monotonic(), 0))
+        if self.process_pool is not None:
+            self.process_pool.close()
+        self.event_loop.stop()
+        if self.redirect_table is not None:
+            self.redirect_table.stop()
+        if self.http_client is not None:
+            self.http_client.close()
+        if self.access_log is not None:
+            self.access_log.close()
+        self.logger.info("%s Server stopped", self.name)
 
-                    # Check if we reached the end of the HTTP request
-                    if b'\r\n\r\n' in request_data:
+    @staticmethod
+    def __reject(client_socket, data):
+        # Never block the accept loop on a client that is over the limit
+        try:
+            client_socket.setblocking(False)
+            if data:
+                client_socket.send(data)
+        except OSError:
+            pass
+        finally:
+            client_socket.close()
+
+    @staticmethod
+    def __error_response(status, message=None):
+        return HttpResponse(message or HTTPRESPONSECODES.RESPONSE_MESSAGES[status], response_headers={}, status=status)
+
+    def __serve_connection(self, connection, pipeline):
+        first_request = True
+        request = None
+        # Without Server-Timing the clock is read only for the duration of the access log
+        timed = self.server_timing is not None
+        received_ns = parsed_ns = 0
+        try:
+            if isinstance(connection.socket, ssl.SSLSocket):
+                connection.handshake()
+            while True:
+                try:
+                    head = connection.read_head(first_request)
+                    if head is None:
                         break
+                    start = time.perf_counter()
+                    if self.__http2 and head.method == "PRI" and head.http_version == "HTTP/2.0":
+                        # Prior knowledge, the head read is the start of the connection preface
+                        connection.buffer = head.raw + connection.buffer
+                        self.__serve_http2(connection, pipeline)
+                        break
+                    if "upgrade" in head.headers and self.websocket_routes:
+                        route, match = self.__match_route(urlparse(head.path).path, self.websocket_routes)
+                        if route is not None:
+                            self.__serve_websocket(connection, head, route, match, start)
+                            break
+                    if "transfer-encoding" in head.headers:
+                        raise RequestReadError("Chunked request bodies are not supported",
+                                               HTTPRESPONSECODES.LENGTH_REQUIRED)
+                    content_length = head.content_length
+                    body_unread = False
+                    if content_length or "expect" in head.headers:
+                        body_unread = not self.__accept_body(connection, head, content_length)
+                    body = connection.read_body(content_length) if content_length and not body_unread else b""
+                    if timed:
+                        received_ns = time.perf_counter_ns()
+                    # Built from the head already parsed, the body is never read as header lines
+                    if request is None:
+                        request = HttpRequest.from_parts(head.method, head.path, head.http_version, head.fields, body)
+                    else:
+                        # Keep-alive requests of a connection reuse its request object
+                        request.load(head.method, head.path, head.http_version, head.fields, body)
+                    if timed:
+                        parsed_ns = time.perf_counter_ns()
+                    if (self.__http2 and head.headers.get("upgrade", "").lower() == "h2c"
+                            and "http2-settings" in head.headers):
+                        settings = head.headers["http2-settings"]
+                        try:
+                            settings = base64.urlsafe_b64decode(settings + "=" * (-len(settings) % 4))
+                        except (binascii.Error, ValueError):
+                            raise RequestReadError("Invalid HTTP2-Settings")
+                        connection.send(H2C_UPGRADE_RESPONSE)
+                        self.__serve_http2(connection, pipeline, request, settings)
+                        break
+                except RequestReadError as error:
+                    connection.send(bytes(self.__error_response(error.status)))
+                    break
+                first_request = False
+                connection.busy = True
+                # The client may still send the body it was not asked for, the connection is not reused
+                keep_alive = head.keep_alive and not body_unread and not self.__stopping.is_set()
+                request.client_address = connection.address
+                if timed:
+                    request.timing = RequestTiming()
+                    request.timing.add_phase("recv", received_ns - connection.received_ns)
+                    request.timing.add_phase("parse", parsed_ns - received_ns)
+
+                try:
+                    if request.method not in REQUEST_METHODS:
+                        response = self.__error_response(HTTPRESPONSECODES.BAD_REQUEST)
+                    else:
+                        response = pipeline(request)
+                except Exception:
+                    self.logger.exception("%s Unhandled error while serving %s %s", self.name, head.method, head.path)
+                    response = self.__error_response(HTTPRESPONSECODES.INTERNAL_SERVER_ERROR)
+                    keep_alive = False
+                if timed:
+                    self.server_timing.add_header(response, request.timing)
+                    started = time.perf_counter_ns()
 
-                if len(request_data.decode("utf-8")) > 0:
-                    request = HttpRequest(request_data.decode('utf-8'))
-                    if request:
-                        send_flag = False
-                        for route in self.routes:
-                            match = re.match(route.regex_pattern, request.path)
-                            parsed_url = urlparse(request.path)  # Parse the URL
-                            query_params = parsed_url.query  # Get the query parameters
-                            request.query_params = parse_qs(
-                                query_params)  # Add the query parameters to the request object
-                            if match:
-                                # Extract path parameters and add to the request object
-                                groups = match.groups()
-                                path_params = []
-                                for i in range(len(groups)):
-                                    if "?" in groups[i]:
-                                        path_params.append(groups[i].split("?")[0])
-                                    else:
-                                        path_params.append(groups[i])
-                                request.path_params = path_params
-                                response = route.func(request)
-                                client_socket.sendall(str(response).encode('utf-8'))
-                                send_flag = True
-                        if not send_flag:
-                            client_socket.sendall(str(HttpResponse(
-                                response_message="Not Found",
-                                response_headers={},
-                                mimetype=RESPONSEMEMETYPES.text_plain,
-                                status=404
-                            )).encode("utf-8"))
-                    client_socket.close()
+                head_only = request.method == "HEAD"
+                if isinstance(response, StreamingResponse):
+                    response.connection = "keep-alive" if keep_alive else "close"
+                    size = self.__send_stream(connection, response, head_only)
+                    if timed:
+                        request.timing.add_phase("send", time.perf_counter_ns() - started)
+                    if size is None:
+                        break
                 else:
-                    continue
+                    if isinstance(response, RawResponse):
+                        # Shared between requests, it is never mutated
+                        data = response.to_bytes("keep-alive" if keep_alive else "close")
+                    else:
+                        if isinstance(response, HttpResponse):
+                            response.connection = "keep-alive" if keep_alive else "close"
+                        else:
+                            keep_alive = False
+                        data = serialize(response)
+                    if head_only and isinstance(response, HttpResponse):
+                        # The head announces the length of the body, the client reads none after it
+                        data = data[:len(data) - len(response.message)]
+                    if timed:
+                        serialized_ns = time.perf_counter_ns()
+                        connection.send(data)
+                        request.timing.add_phase("serialize", serialized_ns - started)
+                        request.timing.add_phase("send", time.perf_counter_ns() - serialized_ns)
+                    else:
+                        connection.send(data)
+                    size = len(data)
+                if self.__finish(connection, request, response, size, start):
+                    # The tasks may still use the request, the next one gets its own object
+                    request = None
+                connection.busy = False
+                if not keep_alive or self.__stopping.is_set():
+                    break
+        except OSError:
+            # The client went away or a send exceeded the write timeout
+            pass
+        finally:
+            connection.close()
+            with self.__connections_changed:
+                self.__connections.discard(connection)
+                self.__connections_changed.notify_all()
 
-        except KeyboardInterrupt:
-            self.stop_server()
+    def __finish(self, connection, request, response, size, start):
+        """
+        Logs a request once its response is sent and submits its background tasks.
+        :return: True if background tasks were submitted, they may still use the request.
+        """
+        if self.access_log is not None:
+            timings = None
+            if self.server_timing is not None and self.server_timing.access_log:
+                timings = request.timing.to_dict()
+            self.access_log.log(connection.address[0], request.method, request.path,
+                                request.route.path if request.route else None,
+                                getattr(response, "status", 200), size,
+                                time.perf_counter() - start, timings)
+        if request.background_tasks:
+            self.background.submit_all(request.background_tasks)
+            return True
+        return False
 
-    def print_log(self, message, level="INFO"):
-        if level == "INFO":
-            self.logger.info(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {self.name} :{message}")
-        elif level == "WARNING":
-            self.logger.warning(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {self.name} :{message}")
-        elif level == "ERROR":
-            self.logger.error(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {self.name} :{message}")
-        elif level == "DEBUG":
-            self.logger.debug(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {self.name} :{message}")
+    def __serve_http2(self, connection, pipeline, upgrade_request=None, settings=b""):
+        """
+        Serves the connection as HTTP/2, every stream goes through the same pipeline as an HTTP/1.1 request.
+        """
+        Http2Connection(connection, partial(self.__handle_stream, pipeline), partial(self.__finish, connection),
+                        self.__stopping, self.logger,
+                        partial(self.__max_body_size, limits=connection.limits)).serve(upgrade_request, settings)
+
+    def __handle_stream(self, pipeline, request):
+        """
+        Serves the request of an HTTP/2 stream, timed from the pipeline on: its head and body are read by the
+        connection thread, interleaved with the frames of the other streams.
+        """
+        if self.server_timing is None:
+            return self.__call_pipeline(pipeline, request)
+        request.timing = RequestTiming()
+        response = self.__call_pipeline(pipeline, request)
+        self.server_timing.add_header(response, request.timing)
+        return response
+
+    def __send_stream(self, connection, response, head_only=False):
+        """
+        Sends a StreamingResponse chunk by chunk.
+        :param head_only: Sends the head alone, the answer to a HEAD request.
+        :return: The number of bytes sent, None if the body iterable failed and the connection must be closed.
+        """
+        size = 0
+        try:
+            head = response.head()
+            connection.send(head)
+            size += len(head)
+            if head_only:
+                return size
+            for piece in response.iter_encoded():
+                connection.send(piece)
+                size += len(piece)
+        except OSError:
+            raise
+        except Exception:
+            # The head is already sent, closing the connection is the only way to signal the error
+            self.logger.exception("%s Streaming response body failed after %d bytes", self.name, size)
+            return None
+        finally:
+            response.close()
+        return size
+
+    def __serve_websocket(self, connection, head, route, match, start):
+        """
+        Completes the handshake of a WebSocket route, then serves it on this thread for a blocking handler,
+        or hands the socket over to the event loop for an async def handler.
+        """
+        try:
+            accept, subprotocol = handshake(head.method, head.http_version, head.headers, route.subprotocols)
+        except HandshakeError as error:
+            connection.send(bytes(error.response()))
+            return
+        request = HttpRequest.from_parts(head.method, head.path, head.http_version, head.fields)
+        request.client_address = connection.address
+        self.__bind_route(request, route, match)
+        data = handshake_response(accept, subprotocol)
+        connection.send(data)
+        if self.access_log is not None:
+            self.access_log.log(connection.address[0], head.method, head.path, route.path,
+                                HTTPRESPONSECODES.SWITCHING_PROTOCOLS, len(data), time.perf_counter() - start)
+        max_message_size = route.max_body_size or connection.limits.max_message_size
+        if route.is_async and not isinstance(connection.socket, ssl.SSLSocket):
+            buffered = connection.buffer
+            asyncio.run_coroutine_threadsafe(
+                self.__run_websocket(route, request, connection.detach(), buffered, subprotocol, max_message_size),
+                self.event_loop.start())
+            return
+        websocket = WebSocket(connection.socket, request, subprotocol, max_message_size, connection.buffer,
+                              connection.limits.write_timeout)
+        try:
+            if route.is_async:
+                # An encrypted socket can not be handed over to the loop, the handler runs there on a blocking one
+                self.event_loop.run(route.func(ThreadedWebSocket(websocket)))
+            else:
+                route.func(websocket)
+        except Exception:
+            self.logger.exception("%s Unhandled error in WebSocket %s", self.name, head.path)
+            websocket.close(INTERNAL_ERROR)
         else:
-            self.logger.info(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {self.name} :{message}")
+            websocket.close(GOING_AWAY if self.__stopping.is_set() else NORMAL_CLOSURE)
+
+    async def __run_websocket(self, route, request, client_socket, buffered, subprotocol, max_message_size):
+        task = asyncio.current_task()
+        self.__websocket_tasks.add(task)
+        try:
+            reader, writer = await asyncio.open_connection(sock=client_socket)
+        except OSError:
+            self.__websocket_tasks.discard(task)
+            client_socket.close()
+            return
+        websocket = AsyncWebSocket(reader, writer, request, subprotocol, max_message_size, buffered)
+        try:
+            await route.func(websocket)
+        except asyncio.CancelledError:
+            # The server is stopping
+            websocket.abort(GOING_AWAY)
+            raise
+        except Exception:
+            self.logger.exception("%s Unhandled error in WebSocket %s", self.name, request.path)
+            await websocket.close(INTERNAL_ERROR)
+        else:
+            await websocket.close()
+        finally:
+            self.__websocket_tasks.discard(task)
+
+    async def __asgi_websocket(self, scope, receive, send):
+        route, match = self.__match_route(scope["path"], self.websocket_routes)
+        await receive()  # websocket.connect
+        if route is None:
+            # Closing before accepting rejects the handshake with a 403
+            await send({"type": "websocket.close", "code": NORMAL_CLOSURE})
+            return
+        request = asgi_request(dict(scope, method="GET"), b"")
+        self.__bind_route(request, route, match)
+        offered = scope.get("subprotocols") or ()
+        subprotocol = next((protocol for protocol in route.subprotocols if protocol in offered), None)
+        websocket = ASGIWebSocket(receive, send, request, subprotocol)
+        await websocket.accept()
+        try:
+            if route.is_async:
+                await route.func(websocket)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, route.func, BlockingWebSocket(websocket, loop))
+        except Exception:
+            self.logger.exception("%s Unhandled error in WebSocket %s", self.name, request.path)
+            await websocket.close(INTERNAL_ERROR)
+        else:
+            await websocket.close()
+
+    @staticmethod
+    def __bind_route(request, route, match):
+        request.query_params = parse_qs(urlparse(request.path).query)
+        request.path_params = list(match.groups())
+        request.route = route
+
+    def __accept_body(self, connection, head, content_length):
+        """
+        Checks a request body against the limits before any of it is read, then answers Expect: 100-continue.
+        Raising closes the connection, the unread body is never received.
+        :return: False when the request is answered without its body: it expects 100-continue and, with no hook or
+            middleware registered, dispatch can only answer with a redirect or a 404.
+        """
+        expect = head.headers.get("expect")
+        if expect is not None and expect.lower() != "100-continue":
+            raise RequestReadError("Unsupported expectation", HTTPRESPONSECODES.EXPECTATION_FAILED)
+        route, _ = self.__match_route(urlparse(head.path).path)
+        max_body_size = self.__max_body_size(head.path, connection.limits, route)
+        if max_body_size is not None and content_length > max_body_size:
+            raise RequestReadError("Request body too large", HTTPRESPONSECODES.PAYLOAD_TOO_LARGE)
+        if expect is not None and head.http_version == "HTTP/1.1" and len(connection.buffer) < content_length:
+            # A hook or a middleware may answer any path, without them the route and the redirect table decide
+            if not (self.middlewares or self.before_request_hooks or self.after_request_hooks):
+                redirected = (self.redirect_table is not None
+                              and self.redirect_table.lookup(head.path.partition("?")[0]) is not None)
+                if route is None or redirected:
+                    return False
+            connection.send(CONTINUE_RESPONSE)
+        return True
+
+    def __max_body_size(self, path, limits, route=None):
+        """
+        :return: The body size limit of the route matching path, the limit of the connection when it has none.
+        """
+        if route is None:
+            route, _ = self.__match_route(urlparse(path).path)
+        if route is not None and route.max_body_size is not None:
+            return route.max_body_size
+        return limits.max_body_size
+
+    def print_log(self, message, level="INFO"):
+        levelno = log.getLevelName(level)
+        if not isinstance(levelno, int):
+            levelno = log.INFO
+        self.logger.log(levelno, "%s :%s", self.name, message)
 
     def stop_server(self):
-        self.__socket.close()
+        """
+        Stops accepting connections, start_server returns once the in-flight requests are finished.
+        Safe to call from a signal handler or another thread.
+        """
+        self.__stopping.set()
+        self.__wake_up()
+
+    def reload_server(self):
+        """
+        Starts a new process on the listening socket and drains this one once the new process is ready.
+        Safe to call from a signal handler or another thread.
+        """
+        self.__reloading.set()
+        self.__wake_up()
+
+    def __wake_up(self):
+        try:
+            self.__wakeup[1].send(b"\0")
+        except OSError:
+            pass
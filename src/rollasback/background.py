@@ -0,0 +1,164 @@
+"""
+Author(s): CodeWiki
+File name: background.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import logging as log
+import queue
+import threading
+import time
+
+from .access_log import APP_LOGGER_NAME
+
+OUTCOMES = ("completed", "failed", "inline")
+
+
+class BackgroundTaskPool:
+    """
+    A fixed number of worker threads running the tasks added to requests once their response is sent.
+
+    The queue is bounded: when it is full the task runs on the connection thread, after the response,
+    which slows down that connection instead of growing the memory without limit.
+
+    Attributes:
+        workers (int): Number of worker threads, started on the first task.
+        max_queue (int): Maximum number of tasks waiting for a worker.
+    """
+    _stop = object()
+
+    def __init__(self, workers=4, max_queue=1024):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.logger = log.getLogger(APP_LOGGER_NAME)
+        self.__queue = queue.Queue(maxsize=max_queue)
+        self.__threads = []
+        self.__lock = threading.Lock()
+        self.__idle = threading.Condition(self.__lock)
+        self.__running = 0
+        self.__closed = False
+        self.__counts = dict.fromkeys(OUTCOMES, 0)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues a task for the worker threads.
+        Args:
+            func: The callable to run.
+            args: Positional arguments of the callable.
+            kwargs: Keyword arguments of the callable.
+        Returns: bool: True if the task was queued, False if it ran on the calling thread.
+        """
+        with self.__lock:
+            if not self.__closed:
+                if not self.__threads:
+                    self.__start()
+                try:
+                    self.__queue.put_nowait((func, args, kwargs))
+                    return True
+                except queue.Full:
+                    pass
+        failed = not self.__run(func, args, kwargs)
+        with self.__lock:
+            # A failure counts as failed wherever the task ran, inline counts the others run on the calling thread
+            self.__counts["failed" if failed else "inline"] += 1
+        return False
+
+    def submit_all(self, tasks):
+        """
+        Queues (func, args, kwargs) tuples in order, see submit.
+        """
+        for func, args, kwargs in tasks:
+            self.submit(func, *args, **kwargs)
+
+    def __start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.__work, name=f"rollasback-background-{i}", daemon=True)
+            thread.start()
+            self.__threads.append(thread)
+
+    def __work(self):
+        while True:
+            task = self.__queue.get()
+            if task is self._stop:
+                self.__queue.task_done()
+                return
+            with self.__lock:
+                self.__running += 1
+            try:
+                failed = not self.__run(*task)
+            finally:
+                with self.__lock:
+                    self.__running -= 1
+                    self.__counts["failed" if failed else "completed"] += 1
+                    self.__queue.task_done()
+                    self.__idle.notify_all()
+
+    def __run(self, func, args, kwargs):
+        try:
+            func(*args, **kwargs)
+            return True
+        except Exception:
+            self.logger.exception("Background task %s failed", getattr(func, "__qualname__", func))
+            return False
+
+    def stats(self):
+        """
+        Returns: dict: queued and running tasks, and the completed, failed and inline counters.
+        """
+        with self.__lock:
+            return {"queued": self.__queue.qsize(), "running": self.__running, **self.__counts}
+
+    def render(self):
+        """
+        Returns the counters in the Prometheus text exposition format.
+        """
+        stats = self.stats()
+        lines = [
+            "# HELP rollasback_background_queue_depth Background tasks waiting for a worker.",
+            "# TYPE rollasback_background_queue_depth gauge",
+            f"rollasback_background_queue_depth {stats['queued']}",
+            "# HELP rollasback_background_tasks_running Background tasks being run.",
+            "# TYPE rollasback_background_tasks_running gauge",
+            f"rollasback_background_tasks_running {stats['running']}",
+            "# HELP rollasback_background_tasks_total Finished background tasks.",
+            "# TYPE rollasback_background_tasks_total counter",
+        ]
+        lines += [f'rollasback_background_tasks_total{{outcome="{outcome}"}} {stats[outcome]}' for outcome in OUTCOMES]
+        return "\n".join(lines) + "\n"
+
+    def drain(self, timeout=None):
+        """
+        Stops accepting tasks, later tasks run on the calling thread, and waits for the queued ones.
+        Args:
+            timeout (float): Seconds to wait, None waits until the queue is empty.
+        Returns: bool: True if every queued task finished in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__lock:
+            self.__closed = True
+            while self.__queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self.__idle.wait(remaining)
+            drained = not self.__queue.unfinished_tasks
+            threads, self.__threads = self.__threads, []
+        if drained:
+            for _ in threads:
+                self.__queue.put(self._stop)
+            for thread in threads:
+                thread.join()
+        else:
+            self.logger.warning("%d background tasks still pending after %s seconds",
+                                self.__queue.unfinished_tasks, timeout)
+        return drained
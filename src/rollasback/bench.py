@@ -0,0 +1,503 @@
+"""
+Author(s): CodeWiki
+File name: bench.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+
+End-to-end load generator:
+
+    python -m rollasback.bench myservice:api --connections 16 --duration 10 --keep-alive --mix requests.txt
+    python -m rollasback.bench myservice:api --tls
+
+The app ("module:attribute") is started with start_server on loopback in a subprocess and driven by
+the given number of concurrent connections. Use --url to target an already running server instead.
+With --tls the app serves HTTPS with a generated self-signed certificate, and the report adds the cost of
+full and resumed TLS handshakes.
+
+A request mix file has one request per line, either "[weight] METHOD PATH" or a JSON object with the
+keys method, path, headers, body and weight. Blank lines and lines starting with # are ignored.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from .tls import client_context, generate_self_signed
+
+PERCENTILES = (50, 75, 90, 95, 99, 99.9, 99.99)
+
+SERVER_SCRIPT = """
+import importlib, sys
+sys.path.insert(0, {cwd!r})
+module_name, _, attribute = {target!r}.partition(":")
+app = getattr(importlib.import_module(module_name), attribute or "app")
+app.start_server({host!r}, {port!r}, **{options!r})
+"""
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of microsecond latencies: values are grouped in log-linear buckets that keep
+    `significant_bits` bits of precision (7 bits is better than 1% relative error) at any magnitude.
+    """
+
+    def __init__(self, significant_bits=7):
+        self.significant_bits = significant_bits
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, microseconds):
+        value = max(int(microseconds), 0)
+        shift = max(value.bit_length() - self.significant_bits, 0)
+        key = (value >> shift) << shift
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percentile):
+        """
+        Returns the lowest bucket value at or below which the given percentage of the values fall.
+        """
+        if not self.total:
+            return 0
+        rank = percentile / 100 * self.total
+        cumulative = 0
+        for key in sorted(self.counts):
+            cumulative += self.counts[key]
+            if cumulative >= rank:
+                return min(key, self.max)
+        return self.max
+
+
+class Stats:
+    """
+    Per-worker counters, merged once the run is over so that workers never share a lock.
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        # Connection setup of TLS runs, full handshakes and resumed sessions apart
+        self.handshakes = LatencyHistogram()
+        self.resumed = LatencyHistogram()
+        self.requests = 0
+        self.bytes = 0
+        self.connections = 0
+        self.errors = {}
+        self.statuses = {}
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.handshakes.merge(other.handshakes)
+        self.resumed.merge(other.resumed)
+        self.requests += other.requests
+        self.bytes += other.bytes
+        self.connections += other.connections
+        for kind, count in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + count
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+
+def load_mix(path, host, keep_alive):
+    """
+    Reads a request mix file and returns the raw requests, repeated according to their weights.
+    """
+    entries = []
+    if path is None:
+        entries.append({"method": "GET", "path": "/"})
+    else:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("{"):
+                    entries.append(json.loads(line))
+                    continue
+                parts = line.split()
+                if parts[0].isdigit():
+                    entries.append({"weight": int(parts[0]), "method": parts[1], "path": parts[2]})
+                else:
+                    entries.append({"method": parts[0], "path": parts[1]})
+
+    requests = []
+    for entry in entries:
+        body = entry.get("body", "")
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        body = body.encode("utf-8")
+        headers = {"Host": host, "User-Agent": "rollasback-bench",
+                   "Connection": "keep-alive" if keep_alive else "close"}
+        headers.update(entry.get("headers", {}))
+        if body:
+            headers.setdefault("Content-Length", str(len(body)))
+        head = f"{entry.get('method', 'GET')} {entry.get('path', '/')} HTTP/1.1\r\n"
+        head += "".join(f"{key}: {value}\r\n" for key, value in headers.items()) + "\r\n"
+        requests.extend([head.encode("utf-8") + body] * int(entry.get("weight", 1)))
+    return requests
+
+
+def _receive(connection, buffer, message):
+    chunk = connection.recv(65536)
+    if not chunk:
+        raise ConnectionError(message)
+    return buffer + chunk
+
+
+def _read_line(connection, buffer, start):
+    """
+    Returns: tuple: The buffer and the position of the CRLF ending the line that starts at start.
+    """
+    while True:
+        end = buffer.find(b"\r\n", start)
+        if end >= 0:
+            return buffer, end
+        buffer = _receive(connection, buffer, "connection closed in the middle of the chunked body")
+
+
+def _read_chunked(connection, buffer, position):
+    """
+    Reads a chunked body starting at position.
+    Returns: tuple: The buffer and the position after the body, its trailer fields included.
+    """
+    while True:
+        buffer, end = _read_line(connection, buffer, position)
+        size = int(buffer[position:end].split(b";", 1)[0], 16)
+        position = end + 2
+        if size == 0:
+            break
+        while len(buffer) < position + size + 2:
+            buffer = _receive(connection, buffer, "connection closed in the middle of the chunked body")
+        position += size + 2
+    # Trailer fields, if any, end with an empty line
+    while True:
+        buffer, end = _read_line(connection, buffer, position)
+        empty = end == position
+        position = end + 2
+        if empty:
+            return buffer, position
+
+
+def read_response(connection, buffer, head_request=False):
+    """
+    Reads one response from the connection, interim 1xx responses are skipped.
+    Args:
+        head_request (bool): True if the request was a HEAD, its response has no body.
+    Returns: tuple: (status, total bytes, whether the server keeps the connection open, leftover bytes).
+    """
+    start = 0
+    while True:
+        end = buffer.find(b"\r\n\r\n", start)
+        separator = 4
+        if end < 0:
+            end = buffer.find(b"\n\n", start)
+            separator = 2
+        if end < 0:
+            buffer = _receive(connection, buffer, "connection closed before the response head")
+            continue
+        status = int(buffer[start:end].split(b" ", 2)[1])
+        if 100 <= status < 200 and status != 101:
+            # An interim response, eg: 100 Continue, the final one follows
+            start = end + separator
+            continue
+        break
+
+    head = buffer[start:end].decode("latin-1").splitlines()
+    headers = {}
+    for line in head[1:]:
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+    body_start = end + separator
+    keep_alive = headers.get("connection", "").lower() == "keep-alive"
+
+    if head_request or status in (101, 204, 304):
+        return status, body_start, keep_alive and status != 101, buffer[body_start:]
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        buffer, body_end = _read_chunked(connection, buffer, body_start)
+        return status, body_end, keep_alive, buffer[body_end:]
+    if "content-length" in headers:
+        body_end = body_start + int(headers["content-length"])
+        while len(buffer) < body_end:
+            buffer = _receive(connection, buffer, "connection closed in the middle of the body")
+        return status, body_end, keep_alive, buffer[body_end:]
+
+    # Without a length the body ends with the connection
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return status, len(buffer), False, b""
+        buffer += chunk
+
+
+def connect(address, timeout, tls, session, stats):
+    """
+    Opens a connection, over TLS resuming the session of the previous one when the server allows it.
+    """
+    connection = socket.create_connection(address, timeout=timeout)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if tls is not None:
+        start = time.perf_counter()
+        connection = tls.wrap_socket(connection, server_hostname=address[0], session=session)
+        elapsed = (time.perf_counter() - start) * 1_000_000
+        (stats.resumed if connection.session_reused else stats.handshakes).record(elapsed)
+    stats.connections += 1
+    return connection
+
+
+def worker(address, requests, deadline, request_limit, timeout, seed, stats, stop, tls=None):
+    rng = random.Random(seed)
+    connection = None
+    session = None
+    buffer = b""
+    while not stop.is_set() and time.perf_counter() < deadline:
+        if request_limit is not None:
+            with request_limit["lock"]:
+                if request_limit["remaining"] <= 0:
+                    break
+                request_limit["remaining"] -= 1
+        raw = rng.choice(requests)
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = connect(address, timeout, tls, session, stats)
+                buffer = b""
+            connection.sendall(raw)
+            status, size, keep_alive, buffer = read_response(connection, buffer, raw.startswith(b"HEAD "))
+            if tls is not None:
+                # TLS 1.3 tickets arrive after the handshake, once a response was read
+                session = connection.session
+        except socket.timeout:
+            stats.error("timeout")
+        except ConnectionRefusedError:
+            stats.error("connect")
+        except (ConnectionError, OSError, ValueError, IndexError):
+            stats.error("read")
+        else:
+            stats.latency.record((time.perf_counter() - start) * 1_000_000)
+            stats.requests += 1
+            stats.bytes += size
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status >= 500:
+                stats.error("status_5xx")
+            if keep_alive:
+                continue
+        if connection is not None:
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+
+def run_load(address, requests, connections, duration=None, total_requests=None, timeout=5.0, seed=0, tls=None):
+    """
+    Drives the server at address with concurrent connections.
+    Args:
+        address (tuple): (host, port) of the server.
+        requests (list): Raw requests to pick from.
+        connections (int): Number of concurrent connections.
+        duration (float): Seconds to run, unlimited when None.
+        total_requests (int): Number of requests to send, unlimited when None.
+        timeout (float): Socket timeout in seconds.
+        seed (int): Seed of the request picking.
+        tls (SSLContext): Client context to connect over TLS with, plain TCP when None.
+    Returns: tuple: (merged Stats, elapsed seconds).
+    """
+    stop = threading.Event()
+    deadline = time.perf_counter() + duration if duration else float("inf")
+    request_limit = {"remaining": total_requests, "lock": threading.Lock()} if total_requests else None
+    stats = [Stats() for _ in range(connections)]
+    threads = [threading.Thread(target=worker, daemon=True,
+                                args=(address, requests, deadline, request_limit, timeout, seed + i, stats[i], stop,
+                                      tls))
+               for i in range(connections)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - start
+    merged = Stats()
+    for item in stats:
+        merged.merge(item)
+    return merged, elapsed
+
+
+def free_port(host):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+def start_app(target, host, port, startup_timeout=10.0, log_output=False, **options):
+    """
+    Starts the app in a subprocess and waits until it accepts connections.
+    Args:
+        options: Keyword arguments of start_server, eg: certfile and keyfile.
+    Returns: Popen: The server process.
+    """
+    script = SERVER_SCRIPT.format(cwd=os.getcwd(), target=target, host=host, port=port, options=options)
+    output = None if log_output else subprocess.DEVNULL
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=output, stderr=output)
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"the app exited with status {process.returncode} during startup")
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"the app did not accept connections within {startup_timeout} seconds")
+
+
+def stop_app(process, timeout=10.0):
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def report(stats, elapsed, connections):
+    """
+    Returns: dict: The summary of a run.
+    """
+    summary = {
+        "connections": connections,
+        "duration_s": round(elapsed, 3),
+        "requests": stats.requests,
+        "throughput_rps": round(stats.requests / elapsed, 1) if elapsed else 0.0,
+        "transfer_bytes_per_s": round(stats.bytes / elapsed, 1) if elapsed else 0.0,
+        "connections_opened": stats.connections,
+        "errors": dict(sorted(stats.errors.items())),
+        "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+        "latency_us": dict({"min": stats.latency.min or 0, "max": stats.latency.max},
+                           **{f"p{p}": stats.latency.percentile(p) for p in PERCENTILES}),
+    }
+    if stats.handshakes.total or stats.resumed.total:
+        summary["tls_handshake_us"] = {
+            name: {"count": histogram.total, "p50": histogram.percentile(50), "p99": histogram.percentile(99)}
+            for name, histogram in (("full", stats.handshakes), ("resumed", stats.resumed))
+        }
+    return summary
+
+
+def format_report(summary):
+    lines = [
+        f"Requests:     {summary['requests']} in {summary['duration_s']} s over {summary['connections']} connections"
+        f" ({summary['connections_opened']} opened)",
+        f"Throughput:   {summary['throughput_rps']:,.1f} req/s, {summary['transfer_bytes_per_s'] / 1024:,.1f} KiB/s",
+        f"Statuses:     {summary['statuses']}",
+        f"Errors:       {summary['errors'] or 'none'}",
+        "Latency:",
+    ]
+    for name, value in summary["latency_us"].items():
+        lines.append(f"  {name:>8} {value / 1000:>10.3f} ms")
+    if "tls_handshake_us" in summary:
+        lines.append("TLS handshakes:")
+        for name, values in summary["tls_handshake_us"].items():
+            lines.append(f"  {name:>8} {values['count']:>8} x  p50 {values['p50'] / 1000:.3f} ms"
+                         f"  p99 {values['p99'] / 1000:.3f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rollasback.bench", description="RollAsBack load generator")
+    parser.add_argument("app", nargs="?", help='The app to start, as "module:attribute"')
+    parser.add_argument("--url", help="Target an already running server instead of starting the app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="Port of the started app, a free one when 0")
+    parser.add_argument("-c", "--connections", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("-n", "--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--keep-alive", action="store_true", help="Reuse connections the server keeps open")
+    parser.add_argument("--mix", help="Request mix file")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of unreported load before the run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--server-log", action="store_true", help="Show the output of the started app")
+    parser.add_argument("--tls", action="store_true",
+                        help="Serve the started app over HTTPS with a self-signed certificate and report handshakes")
+    args = parser.parse_args(argv)
+
+    if not args.app and not args.url:
+        parser.error("either an app or --url is required")
+
+    process = None
+    certificates = None
+    tls = None
+    if args.url:
+        url = urlparse(args.url)
+        https = url.scheme == "https"
+        address = (url.hostname, url.port or (443 if https else 80))
+        if https or args.tls:
+            tls = client_context(verify=False)
+    else:
+        address = (args.host, args.port or free_port(args.host))
+        options = {}
+        if args.tls:
+            certificates = tempfile.TemporaryDirectory()
+            options["certfile"] = os.path.join(certificates.name, "cert.pem")
+            options["keyfile"] = os.path.join(certificates.name, "key.pem")
+            generate_self_signed(options["certfile"], options["keyfile"])
+            tls = client_context(verify=False)
+        process = start_app(args.app, address[0], address[1], log_output=args.server_log, **options)
+
+    try:
+        requests = load_mix(args.mix, f"{address[0]}:{address[1]}", args.keep_alive)
+        if args.warmup:
+            run_load(address, requests, args.connections, duration=args.warmup, timeout=args.timeout, tls=tls)
+        stats, elapsed = run_load(address, requests, args.connections, duration=None if args.requests else args.duration,
+                                  total_requests=args.requests, timeout=args.timeout, seed=args.seed, tls=tls)
+    finally:
+        if process is not None:
+            stop_app(process)
+        if certificates is not None:
+            certificates.cleanup()
+
+    summary = report(stats, elapsed, args.connections)
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+    return 0 if stats.requests else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+Author(s): CodeWiki
+File name: client.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .headers import Headers
+from .http_response import HttpResponse, HTTPRESPONSECODES, StreamingResponse
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+# Headers describing a single connection, they are never forwarded by the proxy
+HOP_BY_HOP = frozenset(("connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+                        "transfer-encoding", "upgrade", "host", "content-length"))
+OUTCOMES = ("success", "error", "rejected")
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream request fails after its retries, status is the response code a proxy answers with."""
+
+    def __init__(self, message, status=HTTPRESPONSECODES.BAD_GATEWAY):
+        self.message = message
+        self.status = status
+        super().__init__(self.message)
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised without contacting the upstream while its circuit breaker is open."""
+
+    def __init__(self, message):
+        super().__init__(message, HTTPRESPONSECODES.SERVICE_UNAVAILABLE)
+
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failures and rejects calls for reset_timeout seconds,
+    then lets a single trial call through: its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.__trial = False
+        self.__lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self):
+        """
+        Returns: bool: True if a call may go to the upstream.
+        """
+        with self.__lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.__trial:
+                return False
+            self.__trial = True
+            return True
+
+    def record(self, success):
+        with self.__lock:
+            self.__trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class HostPool:
+    """
+    Keep-alive connections to one upstream host. Idle connections are reused last-in first-out
+    and at most max_connections are open at the same time.
+    """
+
+    def __init__(self, scheme, host, port, max_connections=10, connect_timeout=2.0, read_timeout=10.0):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breaker = None
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+        self.retries = 0
+        self.connections_created = 0
+        self.__idle = []
+        self.__slots = threading.BoundedSemaphore(max_connections)
+        self.__lock = threading.Lock()
+
+    @property
+    def idle(self):
+        return len(self.__idle)
+
+    def count(self, outcome):
+        with self.__lock:
+            if outcome == "retry":
+                self.retries += 1
+            else:
+                self.counts[outcome] += 1
+
+    def acquire(self):
+        """
+        Returns: tuple: A connected HTTPConnection and whether it was reused from the pool.
+        Raises: UpstreamError: If no connection is free within the connect timeout or connecting fails.
+        """
+        if not self.__slots.acquire(timeout=self.connect_timeout):
+            raise UpstreamError(f"No free connection to {self.host}:{self.port}", HTTPRESPONSECODES.SERVICE_UNAVAILABLE)
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop(), True
+            self.connections_created += 1
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=self.connect_timeout)
+        try:
+            connection.connect()
+        except OSError:
+            self.discard(connection)
+            raise
+        connection.sock.settimeout(self.read_timeout)
+        return connection, False
+
+    def release(self, connection):
+        """
+        Puts a connection whose response was fully read back into the pool.
+        """
+        with self.__lock:
+            self.__idle.append(connection)
+        self.__slots.release()
+
+    def discard(self, connection):
+        connection.close()
+        self.__slots.release()
+
+    def close(self):
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+
+class UpstreamResponse:
+    """
+    A response of an upstream. Its connection goes back to the pool once the body is read,
+    a streamed body must be consumed or closed.
+    Attributes:
+        status (int): The status code.
+        headers (list): (name, value) header pairs.
+    """
+
+    def __init__(self, response, pool, connection):
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.getheaders()
+        self.__response = response
+        self.__pool = pool
+        self.__connection = connection
+        self.__body = None
+
+    def header(self, name, default=None):
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    def read(self):
+        """
+        Returns: bytes: The whole body.
+        """
+        if self.__body is None:
+            self.__body = b"".join(self.iter_content())
+        return self.__body
+
+    @property
+    def text(self):
+        return self.read().decode("utf-8")
+
+    def json(self):
+        return json.loads(self.read())
+
+    def iter_content(self, chunk_size=65536):
+        """
+        Yields the body while it is received, the connection is released after the last chunk.
+        """
+        try:
+            while True:
+                chunk = self.__response.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Releases the connection, it is reused only if the body was read to its end.
+        """
+        connection, self.__connection = self.__connection, None
+        if connection is None:
+            return
+        if self.__response.isclosed() and not self.__response.will_close:
+            self.__pool.release(connection)
+        else:
+            self.__response.close()
+            self.__pool.discard(connection)
+
+
+class UpstreamClient:
+    """
+    HTTP client shared by the handlers of an app, with keep-alive connection pools per host,
+    connect and read timeouts, bounded retries of idempotent requests and a circuit breaker per host.
+
+    Attributes:
+        connect_timeout (float): Seconds to establish a connection or wait for a free one.
+        read_timeout (float): Seconds a read may wait for data.
+        max_connections (int): Open connections per host.
+        retries (int): Retries of idempotent requests failing with a connection error or a timeout.
+        backoff (float): Seconds before the first retry, doubled on each retry.
+        breaker_threshold (int): Consecutive failures opening the circuit of a host.
+        breaker_reset (float): Seconds an open circuit rejects requests before a trial request.
+    """
+
+    def __init__(self, connect_timeout=2.0, read_timeout=10.0, max_connections=10, retries=2, backoff=0.05,
+                 breaker_threshold=5, breaker_reset=30.0):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.__pools = {}
+        self.__lock = threading.Lock()
+
+    def pool(self, url):
+        """
+        Returns: HostPool: The pool of the host of the URL.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        with self.__lock:
+            pool = self.__pools.get(key)
+            if pool is None:
+                pool = HostPool(*key, max_connections=self.max_connections, connect_timeout=self.connect_timeout,
+                                read_timeout=self.read_timeout)
+                pool.breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+                self.__pools[key] = pool
+            return pool
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        """
+        Sends a request, retrying idempotent ones on connection errors and timeouts.
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (dict): Header fields.
+            body (bytes | str): The body.
+            stream (bool): Returns as soon as the headers are received, the body is read with iter_content.
+        Returns: UpstreamResponse: The response, its body is already read unless stream is True.
+        Raises: UpstreamError: If every attempt failed. CircuitOpenError: If the circuit of the host is open.
+        """
+        pool = self.pool(url)
+        parts = urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        attempts = self.retries + 1 if method.upper() in IDEMPOTENT_METHODS else 1
+        attempt = 0
+        while True:
+            if not pool.breaker.allow():
+                pool.count("rejected")
+                raise CircuitOpenError(f"Circuit open for {pool.host}:{pool.port}")
+            try:
+                connection, reused = pool.acquire()
+            except OSError as error:
+                reused, connection, failure = False, None, error
+            else:
+                try:
+                    connection.request(method, target, body=body, headers=headers or {})
+                    response = connection.getresponse()
+                except (OSError, http.client.HTTPException) as error:
+                    pool.discard(connection)
+                    if reused and isinstance(error, (ConnectionError, http.client.RemoteDisconnected)):
+                        # The upstream closed an idle keep-alive connection, it is not a failure
+                        continue
+                    failure = error
+                else:
+                    upstream = UpstreamResponse(response, pool, connection)
+                    pool.breaker.record(upstream.status < 500)
+                    pool.count("success" if upstream.status < 500 else "error")
+                    if not stream:
+                        try:
+                            upstream.read()
+                        except (OSError, http.client.HTTPException) as error:
+                            raise UpstreamError(f"{method} {url} failed while reading the body: {error!r}") from error
+                    return upstream
+            pool.breaker.record(False)
+            pool.count("error")
+            attempt += 1
+            if attempt >= attempts:
+                status = HTTPRESPONSECODES.GATEWAY_TIMEOUT if isinstance(failure, TimeoutError) \
+                    else HTTPRESPONSECODES.BAD_GATEWAY
+                raise UpstreamError(f"{method} {url} failed: {failure!r}", status) from failure
+            pool.count("retry")
+            time.sleep(self.backoff * 2 ** (attempt - 1))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def proxy(self, request, upstream):
+        """
+        Forwards a request to an upstream and streams its response back to the client.
+        Args:
+            request (HttpRequest): The incoming request, its path and query string are appended to upstream.
+            upstream (str): Base URL of the upstream, eg: http://10.0.0.2:8080
+        Returns: HttpResponse: A StreamingResponse, or a 502, 503 or 504 if the upstream failed.
+        """
+        headers = Headers([(name, value) for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP])
+        if request.client_address:
+            forwarded = headers.get("X-Forwarded-For")
+            client = request.client_address[0]
+            headers["X-Forwarded-For"] = f"{forwarded}, {client}" if forwarded else client
+        try:
+            upstream_response = self.request(request.method, upstream.rstrip("/") + request.path, headers=headers,
+                                             body=request.raw_body or None, stream=True)
+        except UpstreamError as error:
+            return HttpResponse(HTTPRESPONSECODES.RESPONSE_MESSAGES[error.status], response_headers={},
+                                status=error.status)
+        # Repeated fields such as Set-Cookie are forwarded as they came
+        response_headers = Headers([(name, value) for name, value in upstream_response.headers
+                                    if name.lower() not in HOP_BY_HOP and
+                                    name.lower() not in ("date", "server", "content-type")])
+        length = upstream_response.header("Content-Length")
+        return StreamingResponse(upstream_response.iter_content(), response_headers, status=upstream_response.status,
+                                 mimetype=upstream_response.header("Content-Type", "application/octet-stream"),
+                                 content_length=int(length) if length and length.isdigit() else None,
+                                 on_close=upstream_response.close)
+
+    def stats(self):
+        """
+        Returns: dict: Per "host:port", the request outcomes, retries, created and idle connections and circuit state.
+        """
+        with self.__lock:
+            pools = list(self.__pools.values())
+        return {f"{pool.host}:{pool.port}": {**pool.counts, "retries": pool.retries,
+                                             "connections_created": pool.connections_created, "idle": pool.idle,
+                                             "circuit": pool.breaker.state} for pool in pools}
+
+    def render(self):
+        """
+        Returns the per-host counters in the Prometheus text exposition format.
+        """
+        stats = self.stats()
+        lines = ["# HELP rollasback_upstream_requests_total Upstream requests by outcome.",
+                 "# TYPE rollasback_upstream_requests_total counter"]
+        for host, values in stats.items():
+            lines += [f'rollasback_upstream_requests_total{{host="{host}",outcome="{outcome}"}} {values[outcome]}'
+                      for outcome in OUTCOMES]
+        lines += ["# HELP rollasback_upstream_retries_total Retried upstream requests.",
+                  "# TYPE rollasback_upstream_retries_total counter"]
+        lines += [f'rollasback_upstream_retries_total{{host="{host}"}} {values["retries"]}'
+                  for host, values in stats.items()]
+        lines += ["# HELP rollasback_upstream_connections_created_total Connections opened to the upstream.",
+                  "# TYPE rollasback_upstream_connections_created_total counter"]
+        lines += [f'rollasback_upstream_connections_created_total{{host="{host}"}} {values["connections_created"]}'
+                  for host, values in stats.items()]
+        lines += ["# HELP rollasback_upstream_idle_connections Idle keep-alive connections in the pool.",
+                  "# TYPE rollasback_upstream_idle_connections gauge"]
+        lines += [f'rollasback_upstream_idle_connections{{host="{host}"}} {values["idle"]}'
+                  for host, values in stats.items()]
+        lines += ["# HELP rollasback_upstream_circuit_open 1 while the circuit breaker of the host rejects requests.",
+                  "# TYPE rollasback_upstream_circuit_open gauge"]
+        lines += [f'rollasback_upstream_circuit_open{{host="{host}"}} {int(values["circuit"] == "open")}'
+                  for host, values in stats.items()]
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        """
+        Closes the idle connections of every pool.
+        """
+        with self.__lock:
+            pools = list(self.__pools.values())
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,288 @@
+"""
+Author(s): CodeWiki
+File name: connection.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import socket
+import time
+from dataclasses import dataclass
+
+from .http_response import HTTPRESPONSECODES
+
+# Fields a request may carry once, two values would let a proxy and the server disagree on the host or the body end
+SINGLETON_FIELDS = frozenset(("host", "content-length"))
+
+
+@dataclass
+class ConnectionLimits:
+    """
+    Timeouts and size limits applied to every client connection.
+
+    Attributes:
+        header_timeout (float): Seconds allowed to receive the whole request head, once its first byte arrived.
+        body_timeout (float): Seconds allowed to receive the whole request body.
+        idle_timeout (float): Seconds a keep-alive connection may wait for the next request.
+        write_timeout (float): Seconds allowed for each send call to write all of its data. The whole body of a
+            response is one call, a StreamingResponse makes one per chunk.
+        max_connections (int): Maximum number of connections served at the same time.
+        max_header_count (int): Maximum number of header fields.
+        max_line_length (int): Maximum length of the request line and of each header line.
+        max_header_size (int): Maximum size of the whole request head.
+        max_body_size (int): Maximum request body size, checked against Content-Length. None disables the check.
+        max_message_size (int): Maximum size of a WebSocket message, fragments included.
+        max_concurrent_streams (int): Maximum number of requests in progress on one HTTP/2 connection.
+    """
+    header_timeout: float = 10.0
+    body_timeout: float = 30.0
+    idle_timeout: float = 5.0
+    write_timeout: float = 30.0
+    max_connections: int = 256
+    max_header_count: int = 100
+    max_line_length: int = 8190
+    max_header_size: int = 65536
+    max_body_size: int = 1048576
+    max_message_size: int = 1048576
+    max_concurrent_streams: int = 100
+
+
+class RequestReadError(Exception):
+    """Raised when a request can not be read, status is the response code to answer with."""
+
+    def __init__(self, message, status=HTTPRESPONSECODES.BAD_REQUEST):
+        self.message = message
+        self.status = status
+        super().__init__(self.message)
+
+
+class RequestHead:
+    """
+    The request line and the headers of a request, parsed before its body is read.
+    Attributes:
+        method (str): The HTTP method.
+        path (str): The request target.
+        http_version (str): The HTTP version.
+        headers (dict): Header fields keyed by their lowercase name, the first value of a repeated name.
+        raw (bytes): The head as received, including the empty line.
+        fields (list): Every (name, value) header field in the order and the case they were received.
+    """
+
+    def __init__(self, method, path, http_version, headers, raw, fields=()):
+        self.method = method
+        self.path = path
+        self.http_version = http_version
+        self.headers = headers
+        self.raw = raw
+        self.fields = fields
+
+    @property
+    def content_length(self):
+        value = self.headers.get("content-length")
+        if value is None:
+            return 0
+        # isdigit() alone accepts digits int() rejects, eg: "²"
+        if not (value.isascii() and value.isdigit()):
+            raise RequestReadError("Invalid Content-Length")
+        return int(value)
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.http_version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+
+def parse_head(raw, limits):
+    """
+    Parses and validates a request head.
+    Args:
+        raw (bytes): The head, ending with the empty line.
+        limits (ConnectionLimits): The limits to enforce.
+    Returns: RequestHead: The parsed head.
+    Raises: RequestReadError: If the head is malformed or over a limit.
+    """
+    lines = raw.decode("latin-1").split("\n")
+    request_line = lines[0].rstrip("\r")
+    if len(request_line) > limits.max_line_length:
+        raise RequestReadError("Request line too long", HTTPRESPONSECODES.URI_TOO_LONG)
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise RequestReadError("Malformed request line")
+
+    headers = {}
+    fields = []
+    count = 0
+    for line in lines[1:]:
+        line = line.rstrip("\r")
+        if not line:
+            # The head ends at its first empty line, what follows is the body
+            break
+        count += 1
+        if count > limits.max_header_count:
+            raise RequestReadError("Too many header fields", HTTPRESPONSECODES.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        if len(line) > limits.max_line_length:
+            raise RequestReadError("Header line too long", HTTPRESPONSECODES.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise RequestReadError("Malformed header line")
+        name = name.strip()
+        value = value.strip()
+        lowered = name.lower()
+        if lowered in headers:
+            if lowered in SINGLETON_FIELDS:
+                raise RequestReadError(f"Repeated {name} header")
+        else:
+            headers[lowered] = value
+        fields.append((name, value))
+    return RequestHead(parts[0], parts[1], parts[2], headers, raw, fields)
+
+
+def _head_end(buffer):
+    """
+    Returns: int: The end of the first empty line, CRLF or a bare LF, -1 if the head is not complete.
+    Taking the first CRLF CRLF while a bare LF LF comes earlier would read body lines as header fields.
+    """
+    lf = buffer.find(b"\n\n")
+    crlf = buffer.find(b"\n\r\n")
+    if crlf >= 0 and (lf < 0 or crlf < lf):
+        return crlf + 3
+    return lf + 2 if lf >= 0 else -1
+
+
+class Connection:
+    """
+    A client socket with a receive buffer and per-phase deadlines, so that a client sending nothing
+    or trickling bytes can not hold a server thread longer than the configured timeouts.
+    """
+
+    def __init__(self, client_socket, address, limits):
+        self.socket = client_socket
+        self.address = address
+        self.limits = limits
+        self.buffer = b""
+        self.busy = False
+        # time.perf_counter_ns() when the first byte of the current request was available
+        self.received_ns = 0
+
+    def __recv_until(self, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("deadline exceeded")
+        self.socket.settimeout(remaining)
+        return self.socket.recv(65536)
+
+    def read_head(self, first_request=True):
+        """
+        Reads a request head. The idle timeout applies until the first byte, the header timeout to the whole head.
+        Args:
+            first_request (bool): False for the following requests of a keep-alive connection.
+        Returns: RequestHead: The parsed head, None if the client closed the connection or stayed idle.
+        Raises: RequestReadError: If the head is malformed, over a limit or too slow.
+        """
+        limits = self.limits
+        if not self.buffer:
+            idle = limits.header_timeout if first_request else limits.idle_timeout
+            try:
+                chunk = self.__recv_until(time.monotonic() + idle)
+            except socket.timeout:
+                return None
+            if not chunk:
+                return None
+            self.buffer = chunk
+        self.received_ns = time.perf_counter_ns()
+
+        deadline = time.monotonic() + limits.header_timeout
+        while True:
+            end = _head_end(self.buffer)
+            if end >= 0:
+                break
+            if len(self.buffer) > limits.max_header_size:
+                raise RequestReadError("Request head too large", HTTPRESPONSECODES.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            try:
+                chunk = self.__recv_until(deadline)
+            except socket.timeout:
+                raise RequestReadError("Request head timed out", HTTPRESPONSECODES.REQUEST_TIMEOUT)
+            if not chunk:
+                if self.buffer.strip():
+                    raise RequestReadError("Connection closed in the middle of the request head")
+                return None
+            self.buffer += chunk
+
+        if end > limits.max_header_size:
+            raise RequestReadError("Request head too large", HTTPRESPONSECODES.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        raw, self.buffer = self.buffer[:end], self.buffer[end:]
+        return parse_head(raw, limits)
+
+    def read_body(self, length):
+        """
+        Reads a request body of the given length within the body timeout.
+        Args:
+            length (int): The Content-Length of the request.
+        Returns: bytes: The body.
+        Raises: RequestReadError: If the body is not received in time or the client closes the connection.
+        """
+        deadline = time.monotonic() + self.limits.body_timeout
+        while len(self.buffer) < length:
+            try:
+                chunk = self.__recv_until(deadline)
+            except socket.timeout:
+                raise RequestReadError("Request body timed out", HTTPRESPONSECODES.REQUEST_TIMEOUT)
+            if not chunk:
+                raise RequestReadError("Connection closed in the middle of the request body")
+            self.buffer += chunk
+        body, self.buffer = self.buffer[:length], self.buffer[length:]
+        return body
+
+    def handshake(self):
+        """
+        Completes the TLS handshake of the client socket, it has to finish within the header timeout.
+        Raises: OSError: If the handshake fails or times out.
+        """
+        self.socket.settimeout(self.limits.header_timeout)
+        self.socket.do_handshake()
+
+    def send(self, data):
+        """
+        Sends data, all of it has to be written within the write timeout: the socket timeout bounds the whole
+        sendall call, not each partial write.
+        """
+        self.socket.settimeout(self.limits.write_timeout)
+        self.socket.sendall(data)
+
+    def shutdown(self):
+        """
+        Ends the reading side, a thread waiting for the next request sees the connection as closed.
+        """
+        if self.socket is None:
+            return
+        try:
+            self.socket.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+
+    def detach(self):
+        """
+        Hands the socket over, eg: to the event loop serving a WebSocket. Closing the connection no longer closes it.
+        Returns: socket: The client socket.
+        """
+        client_socket, self.socket = self.socket, None
+        return client_socket
+
+    def close(self):
+        if self.socket is None:
+            return
+        try:
+            self.socket.close()
+        except OSError:
+            pass
@@ -0,0 +1,90 @@
+"""
+Author(s): CodeWiki
+File name: event_loop.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import asyncio
+import threading
+
+
+class EventLoopThread:
+    """
+    An asyncio event loop running on its own daemon thread, shared by all the coroutine handlers of an app.
+    Connection threads hand the coroutines over and wait for their result, so the awaits of
+    concurrent requests overlap on the single loop while blocking code stays on the connection threads.
+    """
+
+    def __init__(self, name="rollasback-event-loop"):
+        self.name = name
+        self.loop = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the loop thread if it is not running.
+        Returns: AbstractEventLoop: The running loop.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(target=self.loop.run_forever, name=self.name, daemon=True)
+                self.__thread.start()
+            return self.loop
+
+    def run(self, coroutine):
+        """
+        Runs a coroutine on the loop and blocks the calling thread until it is done.
+        Args:
+            coroutine: The coroutine to run.
+        Returns: Any: The result of the coroutine, its exception is raised on the calling thread.
+        """
+        loop = self.loop if self.__thread is not None else self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def wrap(self, handler):
+        """
+        Wraps an async def handler into a blocking callable running it on the loop.
+        Args:
+            handler: Coroutine function taking an HttpRequest.
+        Returns: callable: The blocking handler.
+        """
+        run = self.run
+
+        def blocking(request):
+            return run(handler(request))
+
+        return blocking
+
+    def stop(self):
+        """
+        Cancels the pending tasks, stops the loop and joins its thread.
+        """
+        with self.__lock:
+            thread, self.__thread = self.__thread, None
+        if thread is None:
+            return
+        loop = self.loop
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        thread.join()
+        loop.close()
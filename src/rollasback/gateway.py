@@ -0,0 +1,134 @@
+"""
+Author(s): CodeWiki
+File name: gateway.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+from urllib.parse import quote
+
+from .headers import Headers
+from .http_request import HttpRequest
+from .http_response import HttpResponse, HTTPRESPONSECODES, StreamingResponse
+
+CHUNK_SIZE = 65536
+# Characters left as they are when the decoded path of a gateway is quoted back into a request target
+PATH_SAFE = "/:@!$&'()*+,;=-._~%"
+# The gateway server owns the connection, these response headers are its business
+HOP_BY_HOP = frozenset(("connection", "keep-alive", "transfer-encoding", "upgrade"))
+
+
+def wsgi_request(environ):
+    """
+    Builds an HttpRequest from a WSGI environ.
+    Args:
+        environ (dict): The WSGI environ.
+    Returns: HttpRequest: The request.
+    """
+    headers = {}
+    for key, value in environ.items():
+        if key.startswith("HTTP_"):
+            headers[key[5:].replace("_", "-").title()] = value
+    if environ.get("CONTENT_TYPE"):
+        headers["Content-Type"] = environ["CONTENT_TYPE"]
+    if environ.get("CONTENT_LENGTH"):
+        headers["Content-Length"] = environ["CONTENT_LENGTH"]
+
+    path = quote(environ.get("PATH_INFO", "/").encode("latin-1"), safe=PATH_SAFE) or "/"
+    if environ.get("QUERY_STRING"):
+        path += "?" + environ["QUERY_STRING"]
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length) if length else b""
+
+    request = HttpRequest.from_parts(environ["REQUEST_METHOD"], path, environ.get("SERVER_PROTOCOL", "HTTP/1.1"),
+                                     headers, body)
+    if environ.get("REMOTE_ADDR"):
+        request.client_address = (environ["REMOTE_ADDR"], int(environ.get("REMOTE_PORT") or 0))
+    return request
+
+
+def asgi_request(scope, body):
+    """
+    Builds an HttpRequest from an ASGI http scope.
+    Args:
+        scope (dict): The ASGI connection scope.
+        body (bytes): The body received from the http.request events.
+    Returns: HttpRequest: The request.
+    """
+    headers = Headers([(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]])
+
+    raw_path = scope.get("raw_path")
+    path = raw_path.decode("latin-1") if raw_path else quote(scope["path"], safe=PATH_SAFE)
+    if scope.get("query_string"):
+        path += "?" + scope["query_string"].decode("latin-1")
+
+    request = HttpRequest.from_parts(scope["method"], path, "HTTP/" + scope.get("http_version", "1.1"), headers,
+                                     body)
+    if scope.get("client"):
+        request.client_address = tuple(scope["client"])
+    return request
+
+
+def response_parts(response):
+    """
+    Splits a response into what a gateway server sends itself.
+    Responses are serialized as on the built-in server, so custom response classes keep their headers.
+    Args:
+        response: The HttpResponse, or any object returned by the pipeline.
+    Returns: tuple: The status code, a list of (name, value) header pairs and the body as an iterable of bytes.
+        The body of a StreamingResponse is produced while it is iterated.
+    """
+    if not isinstance(response, HttpResponse):
+        return HTTPRESPONSECODES.OK, [("Content-Type", "text/plain")], iter_chunks(str(response).encode("utf-8"))
+    if isinstance(response, StreamingResponse):
+        return response.status, _header_pairs(response.head()), response.iter_body()
+    data = bytes(response)
+    end = data.find(b"\r\n\r\n")
+    if end >= 0:
+        head, body = data[:end], data[end + 4:]
+    else:
+        head, _, body = data.partition(b"\n\n")
+    return response.status, _header_pairs(head), iter_chunks(body)
+
+
+def _header_pairs(head):
+    headers = []
+    for line in head.decode("latin-1").split("\n")[1:]:
+        name, separator, value = line.rstrip("\r").partition(":")
+        if separator and name.lower() not in HOP_BY_HOP:
+            headers.append((name, value.strip()))
+    return headers
+
+
+class ResponseBody:
+    """
+    WSGI response iterable calling on_close when the server closes it, that is once the body is sent.
+    """
+
+    def __init__(self, chunks, on_close):
+        self.chunks = chunks
+        self.on_close = on_close
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.on_close()
+
+
+def iter_chunks(body, size=CHUNK_SIZE):
+    """
+    Yields the body in slices of at most size bytes, so large bodies are written out progressively.
+    """
+    view = memoryview(body)
+    for start in range(0, len(view), size):
+        yield view[start:start + size].tobytes()
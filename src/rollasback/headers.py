@@ -0,0 +1,189 @@
+"""
+Author(s): CodeWiki
+File name: headers.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+from collections.abc import Mapping, MutableMapping
+
+
+class Headers(MutableMapping):
+    """
+    HTTP header fields in the order and the case they were received or added, looked up case-insensitively.
+    A field name may repeat, eg: Set-Cookie. Item access reads the first value of a name, as the server parses
+    the head, get_all() reads them all and add() appends a field without replacing the others.
+    Headers read from a request keep their lines as received and split them on first use, and the lowercase
+    index used by lookups is built on the first lookup after a change, so a handler that reads no header pays
+    for neither.
+    """
+    __slots__ = ("__lines", "__fields_list", "__index", "__encoded")
+
+    def __init__(self, fields=None, defaults=()):
+        """
+        Args:
+            fields: A mapping, Headers, or an iterable of (name, value) pairs.
+            defaults: (name, value) pairs appended when fields has no field of the name, in the same pass.
+        """
+        self.__lines = None
+        if fields is None:
+            self.__fields = []
+        elif isinstance(fields, Headers):
+            self.__fields = list(fields.fields())
+        elif isinstance(fields, Mapping):
+            self.__fields = [(name, _text(value)) for name, value in fields.items()]
+        else:
+            self.__fields = [(name, _text(value)) for name, value in fields]
+        if defaults:
+            if self.__fields:
+                present = {field[0].lower() for field in self.__fields}
+                self.__fields.extend(field for field in defaults if field[0].lower() not in present)
+            else:
+                self.__fields.extend(defaults)
+        self.__index = None
+        self.__encoded = None
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        Builds the headers of "Name: value" lines, lines without a ": " separator are skipped.
+        Args:
+            lines: Iterable of str.
+        Returns: Headers: The headers.
+        """
+        headers = cls()
+        headers.__lines = lines
+        return headers
+
+    @property
+    def __fields(self):
+        if self.__lines is not None:
+            self.__fields_list = [line.split(": ", 1) for line in self.__lines if ": " in line]
+            self.__lines = None
+        return self.__fields_list
+
+    @__fields.setter
+    def __fields(self, fields):
+        self.__lines = None
+        self.__fields_list = fields
+
+    def __lookup(self, name):
+        if self.__index is None:
+            index = {}
+            for position, field in enumerate(self.__fields):
+                index.setdefault(field[0].lower(), []).append(position)
+            self.__index = index
+        return self.__index.get(name.lower())
+
+    def __changed(self):
+        self.__index = None
+        self.__encoded = None
+
+    def __getitem__(self, name):
+        positions = self.__lookup(name)
+        if positions is None:
+            raise KeyError(name)
+        return self.__fields[positions[0]][1]
+
+    def get_all(self, name):
+        """
+        Returns: list: The values of every field with the name, in order, empty if there is none.
+        """
+        positions = self.__lookup(name) or ()
+        return [self.__fields[position][1] for position in positions]
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self.__lookup(name) is not None
+
+    def __setitem__(self, name, value):
+        """
+        Replaces every field with the name by a single one.
+        """
+        if self.__lookup(name) is not None:
+            lowered = name.lower()
+            self.__fields = [field for field in self.__fields if field[0].lower() != lowered]
+        self.__fields.append((name, _text(value)))
+        self.__changed()
+
+    def add(self, name, value):
+        """
+        Appends a field, fields with the same name are kept.
+        """
+        self.__fields.append((name, _text(value)))
+        self.__changed()
+
+    def __delitem__(self, name):
+        if self.__lookup(name) is None:
+            raise KeyError(name)
+        lowered = name.lower()
+        self.__fields = [field for field in self.__fields if field[0].lower() != lowered]
+        self.__changed()
+
+    def __iter__(self):
+        """
+        Yields every name once, in the case it first appeared.
+        """
+        seen = set()
+        for name, _ in self.__fields:
+            lowered = name.lower()
+            if lowered not in seen:
+                seen.add(lowered)
+                yield name
+
+    def __len__(self):
+        return len({field[0].lower() for field in self.__fields})
+
+    def fields(self):
+        """
+        Returns: list: Every (name, value) field, repeated names included.
+        """
+        return [(field[0], field[1]) for field in self.__fields]
+
+    def items(self):
+        """
+        Returns: list: Every (name, value) field, repeated names included, so serializing them loses nothing.
+        """
+        return self.fields()
+
+    def copy(self):
+        return Headers(self)
+
+    def to_bytes(self):
+        """
+        Returns: bytes: The fields as "Name: value" lines, each ending with CRLF, encoded once until the next change.
+        """
+        if self.__encoded is None:
+            lines = [": ".join(field) for field in self.__fields]
+            lines.append("")
+            self.__encoded = "\r\n".join(lines).encode("utf-8")
+        return self.__encoded
+
+    __bytes__ = to_bytes
+
+    def __eq__(self, other):
+        if isinstance(other, Headers):
+            other = other.fields()
+        elif isinstance(other, Mapping):
+            other = [(name, _text(value)) for name, value in other.items()]
+        else:
+            return NotImplemented
+        return sorted((name.lower(), value) for name, value in self.__fields) == \
+            sorted((name.lower(), value) for name, value in other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Headers({self.fields()!r})"
+
+
+def _text(value):
+    return value if isinstance(value, str) else str(value)
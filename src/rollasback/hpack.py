@@ -0,0 +1,377 @@
+"""
+Author(s): CodeWiki
+File name: hpack.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import collections
+
+# RFC 7541 Appendix A
+STATIC_TABLE = (
+    (":authority", ""), (":method", "GET"), (":method", "POST"), (":path", "/"), (":path", "/index.html"),
+    (":scheme", "http"), (":scheme", "https"), (":status", "200"), (":status", "204"), (":status", "206"),
+    (":status", "304"), (":status", "400"), (":status", "404"), (":status", "500"), ("accept-charset", ""),
+    ("accept-encoding", "gzip, deflate"), ("accept-language", ""), ("accept-ranges", ""), ("accept", ""),
+    ("access-control-allow-origin", ""), ("age", ""), ("allow", ""), ("authorization", ""), ("cache-control", ""),
+    ("content-disposition", ""), ("content-encoding", ""), ("content-language", ""), ("content-length", ""),
+    ("content-location", ""), ("content-range", ""), ("content-type", ""), ("cookie", ""), ("date", ""),
+    ("etag", ""), ("expect", ""), ("expires", ""), ("from", ""), ("host", ""), ("if-match", ""),
+    ("if-modified-since", ""), ("if-none-match", ""), ("if-range", ""), ("if-unmodified-since", ""),
+    ("last-modified", ""), ("link", ""), ("location", ""), ("max-forwards", ""), ("proxy-authenticate", ""),
+    ("proxy-authorization", ""), ("range", ""), ("referer", ""), ("refresh", ""), ("retry-after", ""),
+    ("server", ""), ("set-cookie", ""), ("strict-transport-security", ""), ("transfer-encoding", ""),
+    ("user-agent", ""), ("vary", ""), ("via", ""), ("www-authenticate", ""),
+)
+STATIC_FIELDS = {field: index for index, field in enumerate(STATIC_TABLE, 1)}
+STATIC_NAMES = {}
+for _index, (_name, _) in enumerate(STATIC_TABLE, 1):
+    STATIC_NAMES.setdefault(_name, _index)
+
+DEFAULT_TABLE_SIZE = 4096
+# RFC 7541 section 4.1
+ENTRY_OVERHEAD = 32
+# Values that must never be indexed, by this encoder or by an intermediary
+SENSITIVE_NAMES = frozenset(("authorization", "proxy-authorization", "set-cookie", "cookie"))
+# Values that change with every response, indexing them only evicts useful entries
+UNINDEXED_NAMES = frozenset(("content-length", "date", "etag", "last-modified", ":path", "age", "expires"))
+
+# RFC 7541 Appendix B: the length of the Huffman code of every symbol, 256 being EOS.
+# The code is canonical, codes of one length are consecutive in symbol order, so the lengths define it.
+HUFFMAN_LENGTHS = (
+    13, 23, 28, 28, 28, 28, 28, 28, 28, 24, 30, 28, 28, 30, 28, 28,
+    28, 28, 28, 28, 28, 28, 30, 28, 28, 28, 28, 28, 28, 28, 28, 28,
+    6, 10, 10, 12, 13, 6, 8, 11, 10, 10, 8, 11, 8, 6, 6, 6,
+    5, 5, 5, 6, 6, 6, 6, 6, 6, 6, 7, 8, 15, 6, 12, 10,
+    13, 6, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7,
+    7, 7, 7, 7, 7, 7, 7, 7, 8, 7, 8, 13, 19, 13, 14, 6,
+    15, 5, 6, 5, 6, 5, 6, 6, 6, 5, 7, 7, 6, 6, 6, 5,
+    6, 7, 6, 5, 5, 6, 7, 7, 7, 7, 7, 15, 11, 14, 13, 28,
+    20, 22, 20, 20, 22, 22, 22, 23, 22, 23, 23, 23, 23, 23, 24, 23,
+    24, 24, 22, 23, 24, 23, 23, 23, 23, 21, 22, 23, 22, 23, 23, 24,
+    22, 21, 20, 22, 22, 23, 23, 21, 23, 22, 22, 24, 21, 22, 23, 23,
+    21, 21, 22, 21, 23, 22, 23, 23, 20, 22, 22, 22, 23, 22, 22, 23,
+    26, 26, 20, 19, 22, 23, 22, 25, 26, 26, 26, 27, 27, 26, 24, 25,
+    19, 21, 26, 27, 27, 26, 27, 24, 21, 21, 26, 26, 28, 27, 27, 27,
+    20, 24, 20, 21, 22, 21, 21, 23, 22, 22, 25, 25, 24, 24, 26, 23,
+    26, 27, 26, 26, 27, 27, 27, 27, 27, 28, 27, 27, 27, 27, 27, 26,
+    30,
+)
+EOS = 256
+
+
+def _canonical_codes(lengths):
+    codes = [0] * len(lengths)
+    code = 0
+    previous = 0
+    for length, symbol in sorted((length, symbol) for symbol, length in enumerate(lengths)):
+        code <<= length - previous
+        codes[symbol] = code
+        code += 1
+        previous = length
+    return codes
+
+
+HUFFMAN_CODES = _canonical_codes(HUFFMAN_LENGTHS)
+# Canonical decoding: for each length, its first code, the number of codes and the symbols in code order
+_DECODE_LENGTHS = sorted(set(HUFFMAN_LENGTHS))
+_DECODE_SYMBOLS = {length: [symbol for symbol in range(len(HUFFMAN_LENGTHS)) if HUFFMAN_LENGTHS[symbol] == length]
+                   for length in _DECODE_LENGTHS}
+_DECODE_FIRST = {length: HUFFMAN_CODES[symbols[0]] for length, symbols in _DECODE_SYMBOLS.items()}
+
+
+class HPACKError(Exception):
+    """Raised when a header block can not be decoded, it is a connection error of HTTP/2 (COMPRESSION_ERROR)."""
+
+
+class HeaderListTooLarge(HPACKError):
+    """Raised when a header block decodes to more than the maximum header list size."""
+
+
+def huffman_encode(data):
+    """
+    Args:
+        data (bytes): The string to encode.
+    Returns: bytes: The Huffman code of the string, padded with the most significant bits of EOS.
+    """
+    value = 0
+    bits = 0
+    for byte in data:
+        length = HUFFMAN_LENGTHS[byte]
+        value = (value << length) | HUFFMAN_CODES[byte]
+        bits += length
+    padding = -bits % 8
+    value = (value << padding) | ((1 << padding) - 1)
+    return value.to_bytes((bits + padding) // 8, "big")
+
+
+def huffman_length(data):
+    """
+    Returns: int: The size of the Huffman code of data in bytes.
+    """
+    return (sum(HUFFMAN_LENGTHS[byte] for byte in data) + 7) // 8
+
+
+def huffman_decode(data):
+    """
+    Args:
+        data (bytes): A Huffman coded string.
+    Returns: bytes: The decoded string.
+    Raises: HPACKError: If the code contains EOS or its padding is invalid.
+    """
+    value = int.from_bytes(data, "big")
+    remaining = len(data) * 8
+    output = bytearray()
+    while remaining:
+        for length in _DECODE_LENGTHS:
+            if length > remaining:
+                # Padding is shorter than a byte and made of the most significant bits of EOS, all ones
+                if remaining > 7 or value & ((1 << remaining) - 1) != (1 << remaining) - 1:
+                    raise HPACKError("Invalid Huffman padding")
+                return bytes(output)
+            code = (value >> (remaining - length)) & ((1 << length) - 1)
+            offset = code - _DECODE_FIRST[length]
+            symbols = _DECODE_SYMBOLS[length]
+            if offset < len(symbols):
+                symbol = symbols[offset]
+                if symbol == EOS:
+                    raise HPACKError("EOS in a Huffman coded string")
+                output.append(symbol)
+                remaining -= length
+                break
+        else:
+            raise HPACKError("Invalid Huffman code")
+    return bytes(output)
+
+
+def encode_integer(value, prefix_bits, first_byte=0):
+    """
+    Encodes an integer with an N-bit prefix, RFC 7541 section 5.1.
+    Args:
+        value (int): The integer.
+        prefix_bits (int): Bits of the first byte available to the integer.
+        first_byte (int): The flag bits above the prefix.
+    Returns: bytearray: The encoded integer.
+    """
+    limit = (1 << prefix_bits) - 1
+    if value < limit:
+        return bytearray((first_byte | value,))
+    output = bytearray((first_byte | limit,))
+    value -= limit
+    while value >= 128:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    output.append(value)
+    return output
+
+
+def decode_integer(data, position, prefix_bits):
+    """
+    Returns: tuple: (the integer, the position after it).
+    Raises: HPACKError: If the integer is truncated or too large.
+    """
+    limit = (1 << prefix_bits) - 1
+    try:
+        value = data[position] & limit
+        position += 1
+        if value < limit:
+            return value, position
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value += (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, position
+            if shift > 28:
+                raise HPACKError("Integer too large")
+    except IndexError:
+        raise HPACKError("Truncated integer")
+
+
+class _DynamicTable:
+    """
+    The dynamic table of a header compression context, newest entry first.
+    """
+
+    def __init__(self, max_size=DEFAULT_TABLE_SIZE):
+        self.entries = collections.deque()
+        self.size = 0
+        self.max_size = max_size
+
+    def add(self, name, value):
+        self.entries.appendleft((name, value))
+        self.size += len(name) + len(value) + ENTRY_OVERHEAD
+        self.__evict()
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        self.__evict()
+
+    def __evict(self):
+        while self.size > self.max_size:
+            name, value = self.entries.pop()
+            self.size -= len(name) + len(value) + ENTRY_OVERHEAD
+
+    def get(self, index):
+        """
+        Args:
+            index (int): An index of the whole address space, 1 based, the static table first.
+        """
+        if 0 < index <= len(STATIC_TABLE):
+            return STATIC_TABLE[index - 1]
+        position = index - len(STATIC_TABLE) - 1
+        if 0 <= position < len(self.entries):
+            return self.entries[position]
+        raise HPACKError(f"Invalid header index: {index}")
+
+
+class Decoder:
+    """
+    Decodes the header blocks of one direction of a connection, in the order they were received.
+
+    Attributes:
+        max_table_size (int): The largest dynamic table the peer may use, our SETTINGS_HEADER_TABLE_SIZE.
+        max_header_list_size (int): Maximum decoded size of a block, a few bytes of indexes can otherwise expand
+            to megabytes. None disables the check.
+    """
+
+    def __init__(self, max_table_size=DEFAULT_TABLE_SIZE, max_header_list_size=None):
+        self.max_table_size = max_table_size
+        self.max_header_list_size = max_header_list_size
+        self.table = _DynamicTable(max_table_size)
+
+    def decode(self, data):
+        """
+        Args:
+            data (bytes): A complete header block.
+        Returns: list: (name, value) str pairs in the order of the block.
+        Raises: HPACKError: If the block is malformed, HeaderListTooLarge if it decodes to too many bytes.
+        """
+        headers = []
+        position = 0
+        length = len(data)
+        size = 0
+        limit = self.max_header_list_size
+        while position < length:
+            byte = data[position]
+            if byte & 0x80:
+                # Indexed header field
+                index, position = decode_integer(data, position, 7)
+                name, value = self.table.get(index)
+            elif byte & 0x40:
+                # Literal with incremental indexing
+                name, value, position = self.__literal(data, position, 6)
+                self.table.add(name, value)
+            elif byte & 0x20:
+                # Dynamic table size update
+                table_size, position = decode_integer(data, position, 5)
+                if table_size > self.max_table_size:
+                    raise HPACKError("Dynamic table size over the limit")
+                self.table.resize(table_size)
+                continue
+            else:
+                # Literal without indexing, or never indexed
+                name, value, position = self.__literal(data, position, 4)
+            headers.append((name, value))
+            size += len(name) + len(value) + ENTRY_OVERHEAD
+            if limit is not None and size > limit:
+                raise HeaderListTooLarge("Header list too large")
+        return headers
+
+    def __literal(self, data, position, prefix_bits):
+        index, position = decode_integer(data, position, prefix_bits)
+        if index:
+            name = self.table.get(index)[0]
+        else:
+            name, position = self.__string(data, position)
+        value, position = self.__string(data, position)
+        return name, value, position
+
+    @staticmethod
+    def __string(data, position):
+        if position >= len(data):
+            raise HPACKError("Truncated string")
+        huffman = data[position] & 0x80
+        length, position = decode_integer(data, position, 7)
+        end = position + length
+        if end > len(data):
+            raise HPACKError("Truncated string")
+        raw = data[position:end]
+        if huffman:
+            raw = huffman_decode(raw)
+        return raw.decode("latin-1"), end
+
+
+class Encoder:
+    """
+    Encodes header blocks for one direction of a connection. Fields repeated from block to block, eg: server and
+    content-type, are added to the dynamic table and sent as a single byte after their first use.
+
+    Attributes:
+        max_table_size (int): Dynamic table size allowed by the peer, its SETTINGS_HEADER_TABLE_SIZE.
+    """
+
+    def __init__(self, max_table_size=DEFAULT_TABLE_SIZE):
+        self.table = _DynamicTable(max_table_size)
+        self.__pending_size = None
+
+    def resize(self, max_table_size):
+        """
+        Applies a new SETTINGS_HEADER_TABLE_SIZE of the peer, announced at the start of the next block.
+        """
+        if max_table_size != self.table.max_size:
+            self.table.resize(max_table_size)
+            self.__pending_size = max_table_size
+
+    def encode(self, headers):
+        """
+        Args:
+            headers: Iterable of (name, value) str pairs, names in lowercase.
+        Returns: bytes: The header block.
+        """
+        output = bytearray()
+        if self.__pending_size is not None:
+            output += encode_integer(self.__pending_size, 5, 0x20)
+            self.__pending_size = None
+        for name, value in headers:
+            index = STATIC_FIELDS.get((name, value)) or self.__dynamic_index(name, value)
+            if index:
+                output += encode_integer(index, 7, 0x80)
+                continue
+            name_index = STATIC_NAMES.get(name) or self.__dynamic_index(name)
+            if name in SENSITIVE_NAMES:
+                output += encode_integer(name_index or 0, 4, 0x10)
+            elif name in UNINDEXED_NAMES:
+                output += encode_integer(name_index or 0, 4, 0x00)
+            else:
+                output += encode_integer(name_index or 0, 6, 0x40)
+                self.table.add(name, value)
+            if not name_index:
+                output += self.__string(name)
+            output += self.__string(value)
+        return bytes(output)
+
+    def __dynamic_index(self, name, value=None):
+        for position, entry in enumerate(self.table.entries):
+            if entry[0] == name and (value is None or entry[1] == value):
+                return len(STATIC_TABLE) + 1 + position
+        return None
+
+    @staticmethod
+    def __string(text):
+        raw = text.encode("latin-1")
+        if huffman_length(raw) < len(raw):
+            raw = huffman_encode(raw)
+            return encode_integer(len(raw), 7, 0x80) + raw
+        return encode_integer(len(raw), 7) + raw
@@ -0,0 +1,593 @@
+"""
+Author(s): CodeWiki
+File name: http2.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import select
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .connection import SINGLETON_FIELDS
+from .gateway import HOP_BY_HOP, response_parts
+from .hpack import DEFAULT_TABLE_SIZE, Decoder, Encoder, HeaderListTooLarge, HPACKError
+from .http_request import HttpRequest
+from .http_response import HTTPRESPONSECODES, HttpResponse, StreamingResponse
+from .timing import NO_TIMING
+
+PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+# Frame types, RFC 9113 section 6
+DATA = 0x0
+HEADERS = 0x1
+PRIORITY = 0x2
+RST_STREAM = 0x3
+SETTINGS = 0x4
+PUSH_PROMISE = 0x5
+PING = 0x6
+GOAWAY = 0x7
+WINDOW_UPDATE = 0x8
+CONTINUATION = 0x9
+
+# Frame flags
+END_STREAM = 0x1
+ACK = 0x1
+END_HEADERS = 0x4
+PADDED = 0x8
+PRIORITY_FLAG = 0x20
+
+# Settings
+SETTINGS_HEADER_TABLE_SIZE = 0x1
+SETTINGS_ENABLE_PUSH = 0x2
+SETTINGS_MAX_CONCURRENT_STREAMS = 0x3
+SETTINGS_INITIAL_WINDOW_SIZE = 0x4
+SETTINGS_MAX_FRAME_SIZE = 0x5
+SETTINGS_MAX_HEADER_LIST_SIZE = 0x6
+
+# Error codes
+NO_ERROR = 0x0
+PROTOCOL_ERROR = 0x1
+INTERNAL_ERROR = 0x2
+FLOW_CONTROL_ERROR = 0x3
+STREAM_CLOSED = 0x5
+FRAME_SIZE_ERROR = 0x6
+REFUSED_STREAM = 0x7
+CANCEL = 0x8
+COMPRESSION_ERROR = 0x9
+ENHANCE_YOUR_CALM = 0xb
+
+DEFAULT_WINDOW_SIZE = 65535
+MAX_WINDOW_SIZE = 2 ** 31 - 1
+DEFAULT_MAX_FRAME_SIZE = 16384
+MAX_FRAME_SIZE = 2 ** 24 - 1
+# Seconds between two checks of the deadlines and of the server stopping while the client sends nothing
+POLL_INTERVAL = 0.5
+
+
+def encode_frame(frame_type, flags, stream_id, payload=b""):
+    """
+    Returns: bytes: The frame, its 9 byte header followed by the payload.
+    """
+    length = len(payload)
+    return struct.pack(">BHBBI", length >> 16, length & 0xFFFF, frame_type, flags, stream_id) + payload
+
+
+def encode_settings(settings):
+    """
+    Args:
+        settings (dict): Values keyed by setting identifier.
+    Returns: bytes: The payload of a SETTINGS frame.
+    """
+    return b"".join(struct.pack(">HI", identifier, value) for identifier, value in settings.items())
+
+
+class _ConnectionError(Exception):
+    """Ends the connection with a GOAWAY frame carrying the error code."""
+
+    def __init__(self, code, message):
+        self.code = code
+        super().__init__(message)
+
+
+class _StreamClosed(Exception):
+    """Raised in a stream worker when the stream was reset or the connection closed."""
+
+
+class _Stream:
+    """
+    A request of the connection, from its HEADERS frame until its response is sent.
+    """
+
+    def __init__(self, stream_id, method, path, headers, send_window, max_body_size, body_timeout):
+        self.id = stream_id
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = bytearray()
+        self.max_body_size = max_body_size
+        self.send_window = send_window
+        # The client is still sending the request
+        self.receiving = True
+        self.reset = False
+        self.start = time.perf_counter()
+        self.deadline = time.monotonic() + body_timeout
+
+
+class Http2Connection:
+    """
+    Serves an HTTP/2 connection without TLS (h2c). The connection thread reads the frames, every request
+    runs on a thread of the connection pool, so a slow handler does not delay the other streams.
+    Frames are written under one lock, HEADERS are encoded under the same lock since HPACK state follows
+    the order of the blocks on the wire.
+
+    Attributes:
+        connection (Connection): The client connection, its limits apply to the streams.
+        handle: Callable taking an HttpRequest and returning its response, it never raises.
+        finish: Callable taking the request, its response, the bytes sent and the perf_counter start,
+            called once a response is sent.
+        stopping (Event): Set when the server drains, the client is sent a GOAWAY and no new stream is accepted.
+        max_body_size: Callable taking the request path and returning its body size limit, or None.
+    """
+
+    def __init__(self, connection, handle, finish, stopping, logger, max_body_size=None):
+        self.connection = connection
+        self.limits = connection.limits
+        self.handle = handle
+        self.finish = finish
+        self.stopping = stopping
+        self.logger = logger
+        self.max_body_size = max_body_size or (lambda path: self.limits.max_body_size)
+        self.__buffer = bytearray(connection.buffer)
+        connection.buffer = b""
+        self.__encoder = Encoder()
+        self.__decoder = Decoder(max_header_list_size=self.limits.max_header_size)
+        self.__write_lock = threading.Lock()
+        # Guards the streams, the send windows and the closed flag
+        self.__changed = threading.Condition()
+        self.__streams = {}
+        self.__send_window = DEFAULT_WINDOW_SIZE
+        self.__initial_window = DEFAULT_WINDOW_SIZE
+        self.__max_frame_size = DEFAULT_MAX_FRAME_SIZE
+        self.__last_stream_id = 0
+        self.__last_activity = time.monotonic()
+        self.__closed = False
+        self.__goaway_sent = False
+        self.__goaway_received = False
+        self.__executor = ThreadPoolExecutor(max_workers=self.limits.max_concurrent_streams,
+                                             thread_name_prefix="http2-stream")
+
+    def serve(self, upgrade_request=None, settings=b""):
+        """
+        Serves the connection until the client closes it, stays idle or the server stops.
+        Args:
+            upgrade_request (HttpRequest): The HTTP/1.1 request that asked for the upgrade, answered on stream 1.
+            settings (bytes): The decoded HTTP2-Settings header of the upgrade request.
+        """
+        try:
+            self.__write(encode_frame(SETTINGS, 0, 0, encode_settings({
+                SETTINGS_MAX_CONCURRENT_STREAMS: self.limits.max_concurrent_streams,
+                SETTINGS_ENABLE_PUSH: 0,
+                SETTINGS_MAX_HEADER_LIST_SIZE: self.limits.max_header_size,
+            })))
+            if upgrade_request is not None:
+                self.__apply_settings(settings)
+                self.__last_stream_id = 1
+                stream = self.__open_stream(1, upgrade_request.method, upgrade_request.path, [], None)
+                stream.receiving = False
+                self.__executor.submit(self.__run_stream, stream, upgrade_request)
+            if self.__read(len(PREFACE), self.limits.header_timeout) != PREFACE:
+                raise _ConnectionError(PROTOCOL_ERROR, "Invalid connection preface")
+            self.__read_loop()
+        except _ConnectionError as error:
+            self.logger.debug("HTTP/2 connection error %d: %s", error.code, error)
+            self.__goaway(error.code)
+        except (OSError, EOFError, ValueError):
+            # The client went away, or the server closed the socket after its shutdown timeout
+            pass
+        finally:
+            with self.__changed:
+                self.__closed = True
+                self.__changed.notify_all()
+            self.__executor.shutdown(wait=True)
+
+    def __read_loop(self):
+        while True:
+            if not self.__buffer and not self.__fill(POLL_INTERVAL):
+                if self.__done():
+                    return
+                continue
+            frame_type, flags, stream_id, payload = self.__read_frame()
+            self.__last_activity = time.monotonic()
+            if frame_type == DATA:
+                self.__on_data(flags, stream_id, payload)
+            elif frame_type == HEADERS:
+                self.__on_headers(flags, stream_id, payload)
+            elif frame_type == RST_STREAM:
+                self.__on_rst_stream(stream_id, payload)
+            elif frame_type == SETTINGS:
+                self.__on_settings(flags, stream_id, payload)
+            elif frame_type == PING:
+                if len(payload) != 8:
+                    raise _ConnectionError(FRAME_SIZE_ERROR, "Invalid PING frame")
+                if not flags & ACK:
+                    self.__write(encode_frame(PING, ACK, 0, payload))
+            elif frame_type == GOAWAY:
+                self.__goaway_received = True
+            elif frame_type == WINDOW_UPDATE:
+                self.__on_window_update(stream_id, payload)
+            elif frame_type in (PUSH_PROMISE, CONTINUATION):
+                raise _ConnectionError(PROTOCOL_ERROR, "Unexpected frame")
+            # PRIORITY and unknown frame types are ignored
+            if self.__done():
+                return
+
+    def __done(self):
+        """
+        Resets the streams whose body is late and tells whether the connection is over.
+        """
+        now = time.monotonic()
+        with self.__changed:
+            expired = [stream for stream in self.__streams.values() if stream.receiving and now > stream.deadline]
+            for stream in expired:
+                del self.__streams[stream.id]
+            active = bool(self.__streams)
+            self.connection.busy = active
+        for stream in expired:
+            self.__write(encode_frame(RST_STREAM, 0, stream.id, struct.pack(">I", CANCEL)))
+        if self.stopping.is_set() and not self.__goaway_sent:
+            self.__goaway(NO_ERROR)
+        if active:
+            return False
+        if self.__goaway_sent or self.__goaway_received:
+            return True
+        if now - self.__last_activity > self.limits.idle_timeout:
+            self.__goaway(NO_ERROR)
+            return True
+        return False
+
+    def __fill(self, timeout):
+        """
+        Receives what the client sent within timeout seconds.
+        Returns: bool: False if nothing arrived.
+        Raises: EOFError: If the client closed the connection.
+        """
+        client_socket = self.connection.socket
+        readable, _, _ = select.select([client_socket], [], [], max(timeout, 0))
+        if not readable:
+            return False
+        chunk = client_socket.recv(65536)
+        if not chunk:
+            raise EOFError("Connection closed")
+        self.__buffer += chunk
+        return True
+
+    def __read(self, size, timeout):
+        deadline = time.monotonic() + timeout
+        while len(self.__buffer) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("deadline exceeded")
+            self.__fill(remaining)
+        data = bytes(self.__buffer[:size])
+        del self.__buffer[:size]
+        return data
+
+    def __read_frame(self):
+        # A frame that started arriving has to be complete within the body timeout
+        header = self.__read(9, self.limits.body_timeout)
+        length = int.from_bytes(header[:3], "big")
+        if length > DEFAULT_MAX_FRAME_SIZE:
+            raise _ConnectionError(FRAME_SIZE_ERROR, "Frame larger than SETTINGS_MAX_FRAME_SIZE")
+        stream_id = int.from_bytes(header[5:], "big") & 0x7FFFFFFF
+        return header[3], header[4], stream_id, self.__read(length, self.limits.body_timeout)
+
+    @staticmethod
+    def __strip_padding(flags, payload):
+        if not flags & PADDED:
+            return payload
+        if not payload or payload[0] >= len(payload):
+            raise _ConnectionError(PROTOCOL_ERROR, "Invalid padding")
+        return payload[1:len(payload) - payload[0]]
+
+    def __on_headers(self, flags, stream_id, payload):
+        if stream_id == 0:
+            raise _ConnectionError(PROTOCOL_ERROR, "HEADERS on stream 0")
+        block = self.__strip_padding(flags, payload)
+        if flags & PRIORITY_FLAG:
+            block = block[5:]
+        while not flags & END_HEADERS:
+            if len(block) > self.limits.max_header_size:
+                raise _ConnectionError(ENHANCE_YOUR_CALM, "Header block too large")
+            frame_type, next_flags, next_id, more = self.__read_frame()
+            if frame_type != CONTINUATION or next_id != stream_id:
+                raise _ConnectionError(PROTOCOL_ERROR, "Expected a CONTINUATION frame")
+            block += more
+            flags |= next_flags & END_HEADERS
+        if len(block) > self.limits.max_header_size:
+            raise _ConnectionError(ENHANCE_YOUR_CALM, "Header block too large")
+        try:
+            fields = self.__decoder.decode(block)
+        except HeaderListTooLarge as error:
+            raise _ConnectionError(ENHANCE_YOUR_CALM, str(error))
+        except HPACKError as error:
+            raise _ConnectionError(COMPRESSION_ERROR, str(error))
+
+        with self.__changed:
+            stream = self.__streams.get(stream_id)
+        if stream is not None:
+            # Trailers, they end the request body and are not passed to the handler
+            if stream.receiving and flags & END_STREAM:
+                self.__end_of_body(stream)
+            elif stream.receiving:
+                raise _ConnectionError(PROTOCOL_ERROR, "Trailers without END_STREAM")
+            return
+        if stream_id % 2 == 0 or stream_id <= self.__last_stream_id:
+            raise _ConnectionError(PROTOCOL_ERROR, "Invalid stream identifier")
+        self.__last_stream_id = stream_id
+        with self.__changed:
+            refused = self.__goaway_sent or len(self.__streams) >= self.limits.max_concurrent_streams
+        if refused:
+            self.__write(encode_frame(RST_STREAM, 0, stream_id, struct.pack(">I", REFUSED_STREAM)))
+            return
+
+        pseudo = {}
+        headers = []
+        cookies = []
+        for name, value in fields:
+            if name.startswith(":"):
+                pseudo[name] = value
+            elif name == "cookie":
+                # HTTP/2 clients may split the cookie header in one field per cookie
+                cookies.append(value)
+            elif name not in HOP_BY_HOP:
+                headers.append((name, value))
+        method = pseudo.get(":method")
+        path = pseudo.get(":path")
+        if not method or not path:
+            self.__write(encode_frame(RST_STREAM, 0, stream_id, struct.pack(">I", PROTOCOL_ERROR)))
+            return
+        if cookies:
+            headers.append(("cookie", "; ".join(cookies)))
+        if ":authority" in pseudo and not any(name == "host" for name, _ in headers):
+            headers.append(("host", pseudo[":authority"]))
+
+        stream = self.__open_stream(stream_id, method, path, headers, self.max_body_size(path))
+        singletons = [name for name, _ in headers if name in SINGLETON_FIELDS]
+        content_length = next((value for name, value in headers if name == "content-length"), "")
+        if len(fields) > self.limits.max_header_count:
+            self.__reject(stream, HTTPRESPONSECODES.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        elif len(singletons) != len(set(singletons)):
+            self.__reject(stream, HTTPRESPONSECODES.BAD_REQUEST)
+        elif (stream.max_body_size is not None and content_length.isdigit()
+              and int(content_length) > stream.max_body_size):
+            self.__reject(stream, HTTPRESPONSECODES.PAYLOAD_TOO_LARGE)
+        elif flags & END_STREAM:
+            self.__end_of_body(stream)
+
+    def __open_stream(self, stream_id, method, path, headers, max_body_size):
+        with self.__changed:
+            stream = _Stream(stream_id, method, path, headers, self.__initial_window, max_body_size,
+                             self.limits.body_timeout)
+            self.__streams[stream_id] = stream
+            self.connection.busy = True
+        return stream
+
+    def __on_data(self, flags, stream_id, payload):
+        if stream_id == 0:
+            raise _ConnectionError(PROTOCOL_ERROR, "DATA on stream 0")
+        if stream_id > self.__last_stream_id:
+            raise _ConnectionError(PROTOCOL_ERROR, "DATA on an idle stream")
+        # Padding counts against the flow control windows
+        frames = [encode_frame(WINDOW_UPDATE, 0, 0, struct.pack(">I", len(payload)))] if payload else []
+        data = self.__strip_padding(flags, payload)
+        with self.__changed:
+            stream = self.__streams.get(stream_id)
+        if stream is not None and stream.receiving:
+            stream.body += data
+            if stream.max_body_size is not None and len(stream.body) > stream.max_body_size:
+                self.__reject(stream, HTTPRESPONSECODES.PAYLOAD_TOO_LARGE)
+            elif flags & END_STREAM:
+                self.__end_of_body(stream)
+            elif payload:
+                frames.append(encode_frame(WINDOW_UPDATE, 0, stream_id, struct.pack(">I", len(payload))))
+        # DATA of a stream already reset or rejected only replenishes the connection window
+        if frames:
+            self.__write(*frames)
+
+    def __on_rst_stream(self, stream_id, payload):
+        if len(payload) != 4:
+            raise _ConnectionError(FRAME_SIZE_ERROR, "Invalid RST_STREAM frame")
+        with self.__changed:
+            stream = self.__streams.get(stream_id)
+            if stream is None:
+                return
+            stream.reset = True
+            if stream.receiving:
+                del self.__streams[stream_id]
+            self.__changed.notify_all()
+
+    def __on_settings(self, flags, stream_id, payload):
+        if stream_id != 0:
+            raise _ConnectionError(PROTOCOL_ERROR, "SETTINGS on a stream")
+        if flags & ACK:
+            return
+        if len(payload) % 6:
+            raise _ConnectionError(FRAME_SIZE_ERROR, "Invalid SETTINGS frame")
+        self.__apply_settings(payload)
+        self.__write(encode_frame(SETTINGS, ACK, 0))
+
+    def __apply_settings(self, payload):
+        for offset in range(0, len(payload) - len(payload) % 6, 6):
+            identifier, value = struct.unpack_from(">HI", payload, offset)
+            if identifier == SETTINGS_HEADER_TABLE_SIZE:
+                with self.__write_lock:
+                    # A larger table only costs memory here, the default size is kept as a ceiling
+                    self.__encoder.resize(min(value, DEFAULT_TABLE_SIZE))
+            elif identifier == SETTINGS_INITIAL_WINDOW_SIZE:
+                if value > MAX_WINDOW_SIZE:
+                    raise _ConnectionError(FLOW_CONTROL_ERROR, "Initial window size too large")
+                with self.__changed:
+                    delta = value - self.__initial_window
+                    self.__initial_window = value
+                    for stream in self.__streams.values():
+                        stream.send_window += delta
+                    self.__changed.notify_all()
+            elif identifier == SETTINGS_MAX_FRAME_SIZE:
+                if not DEFAULT_MAX_FRAME_SIZE <= value <= MAX_FRAME_SIZE:
+                    raise _ConnectionError(PROTOCOL_ERROR, "Invalid maximum frame size")
+                self.__max_frame_size = value
+
+    def __on_window_update(self, stream_id, payload):
+        if len(payload) != 4:
+            raise _ConnectionError(FRAME_SIZE_ERROR, "Invalid WINDOW_UPDATE frame")
+        increment = int.from_bytes(payload, "big") & 0x7FFFFFFF
+        with self.__changed:
+            if stream_id == 0:
+                if not increment:
+                    raise _ConnectionError(PROTOCOL_ERROR, "Zero window increment")
+                self.__send_window += increment
+                if self.__send_window > MAX_WINDOW_SIZE:
+                    raise _ConnectionError(FLOW_CONTROL_ERROR, "Connection window too large")
+            else:
+                stream = self.__streams.get(stream_id)
+                if stream is None:
+                    return
+                stream.send_window += increment
+            self.__changed.notify_all()
+
+    def __end_of_body(self, stream):
+        stream.receiving = False
+        request = HttpRequest.from_parts(stream.method, stream.path, "HTTP/2", stream.headers, bytes(stream.body))
+        stream.body = None
+        self.__executor.submit(self.__run_stream, stream, request)
+
+    def __reject(self, stream, status):
+        """
+        Answers a request with an error before its body is received, then ends the stream.
+        """
+        stream.receiving = False
+        stream.body = None
+        self.__executor.submit(self.__send_error, stream, status)
+
+    def __send_error(self, stream, status):
+        response = HttpResponse(HTTPRESPONSECODES.RESPONSE_MESSAGES[status], response_headers={}, status=status)
+        try:
+            self.__send_response(stream, response, False)
+            # The client may still be sending the body, it has to stop
+            self.__write(encode_frame(RST_STREAM, 0, stream.id, struct.pack(">I", NO_ERROR)))
+        except (_StreamClosed, OSError):
+            pass
+        finally:
+            self.__close_stream(stream)
+
+    def __run_stream(self, stream, request):
+        request.client_address = self.connection.address
+        response = self.handle(request)
+        size = 0
+        timed = request.timing is not NO_TIMING
+        started = time.perf_counter_ns() if timed else 0
+        try:
+            size = self.__send_response(stream, response, request.method == "HEAD")
+            if timed:
+                request.timing.add_phase("send", time.perf_counter_ns() - started)
+        except (_StreamClosed, OSError):
+            pass
+        except Exception:
+            # The headers may be sent already, resetting the stream is the only way to signal the error
+            self.logger.exception("Streaming response body failed on HTTP/2 stream %d", stream.id)
+            self.__write(encode_frame(RST_STREAM, 0, stream.id, struct.pack(">I", INTERNAL_ERROR)))
+        finally:
+            if isinstance(response, StreamingResponse):
+                response.close()
+            self.__close_stream(stream)
+        self.finish(request, response, size, stream.start)
+
+    def __close_stream(self, stream):
+        with self.__changed:
+            self.__streams.pop(stream.id, None)
+            self.__last_activity = time.monotonic()
+            self.connection.busy = bool(self.__streams)
+            self.__changed.notify_all()
+
+    def __send_response(self, stream, response, head_only):
+        """
+        Returns: int: The number of header block and body bytes sent.
+        """
+        status, headers, body = response_parts(response)
+        fields = [(":status", str(status))]
+        fields.extend((name.lower(), value) for name, value in headers)
+        if head_only:
+            return self.__send_headers(stream, fields, True)
+        if isinstance(response, StreamingResponse):
+            # Sent as soon as possible, eg: an event stream may wait a long time for its first event
+            size = self.__send_headers(stream, fields, False)
+            for chunk in body:
+                if chunk:
+                    size += self.__send_data(stream, chunk, False)
+            return size + self.__send_data(stream, b"", True)
+        data = b"".join(body)
+        if not data:
+            return self.__send_headers(stream, fields, True)
+        return self.__send_headers(stream, fields, False) + self.__send_data(stream, data, True)
+
+    def __send_headers(self, stream, fields, end_stream):
+        with self.__write_lock:
+            if stream.reset or self.__closed:
+                raise _StreamClosed()
+            block = self.__encoder.encode(fields)
+            size = self.__max_frame_size
+            pieces = [block[offset:offset + size] for offset in range(0, len(block), size)] or [b""]
+            flags = (END_STREAM if end_stream else 0) | (END_HEADERS if len(pieces) == 1 else 0)
+            frames = [encode_frame(HEADERS, flags, stream.id, pieces[0])]
+            for index, piece in enumerate(pieces[1:], 2):
+                frames.append(encode_frame(CONTINUATION, END_HEADERS if index == len(pieces) else 0, stream.id, piece))
+            self.connection.send(b"".join(frames))
+        return len(block)
+
+    def __send_data(self, stream, data, end_stream):
+        """
+        Sends data in DATA frames as the send windows of the stream and of the connection allow.
+        Raises: _StreamClosed: If the stream is reset, or the client opens no window within the write timeout.
+        """
+        view = memoryview(data)
+        sent = 0
+        while True:
+            with self.__changed:
+                while view and not (stream.reset or self.__closed) and min(self.__send_window, stream.send_window) <= 0:
+                    if not self.__changed.wait(self.limits.write_timeout):
+                        stream.reset = True
+                        self.__write(encode_frame(RST_STREAM, 0, stream.id, struct.pack(">I", CANCEL)))
+                if stream.reset or self.__closed:
+                    raise _StreamClosed()
+                size = min(len(view), self.__send_window, stream.send_window, self.__max_frame_size)
+                self.__send_window -= size
+                stream.send_window -= size
+            piece, view = view[:size], view[size:]
+            self.__write(encode_frame(DATA, END_STREAM if end_stream and not view else 0, stream.id, piece))
+            sent += size
+            if not view:
+                return sent
+
+    def __write(self, *frames):
+        with self.__write_lock:
+            self.connection.send(b"".join(frames))
+
+    def __goaway(self, code):
+        self.__goaway_sent = True
+        try:
+            self.__write(encode_frame(GOAWAY, 0, 0, struct.pack(">II", self.__last_stream_id, code)))
+        except OSError:
+            pass
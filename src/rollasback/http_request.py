@@ -20,6 +20,11 @@ import urllib.parse
 import xml.dom.minidom
 from dataclasses import dataclass
 
+from .headers import Headers
+from .timing import NO_TIMING
+
+REQUEST_METHODS = frozenset(("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"))
+HTTP_REQUEST_PATTERN = re.compile(r'^(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s\S+\sHTTP/1\.1$')
 
 
 class RequestParseError(Exception):
@@ -149,69 +154,170 @@ class CONTENTTYPES:
 class HttpRequest:
     """
     Represents an HTTP request.
+    The request string is parsed into the attributes and not kept, instances have fixed slots instead of a __dict__.
     Attributes:
         method (str): The HTTP method (e.g., GET, POST).
-        headers (dict): A dictionary containing HTTP headers.
+        headers (Headers): The header fields, looked up case-insensitively.
         path (str): The path of the requested resource.
         http_version (str): The HTTP version (default is "HTTP/1.1").
         body (str): The body of the HTTP request.
+        route (Route): The route matched by the router, None before routing or when nothing matched.
+        client_address (tuple): The address of the client, set by the server.
+        background_tasks (list): (func, args, kwargs) tuples run once the response is sent.
+        timing (RequestTiming): The phase timing of the request, handlers add their spans to it.
+            A stand-in that records nothing while the server timing is disabled.
     """
+    __slots__ = ("method", "headers", "path", "http_version", "body", "path_params", "query_params", "route",
+                 "client_address", "background_tasks", "timing", "__raw_body")
 
-    def __init__(self, request_string: str):
+    def __init__(self, request_string: str, raw_body=None):
         """
         Initializes an HttpRequest object.
         Args:
             request_string (str): The HTTP request string.
+            raw_body (bytes): The body as received, when the caller already has it.
+        """
+        self.background_tasks = []
+        self.parse(request_string, raw_body)
+
+    def parse(self, request_string, raw_body=None):
+        """
+        Resets the request and parses a new request string into it.
+        Args:
+            request_string (str): The HTTP request string.
+            raw_body (bytes): The body as received, when the caller already has it.
         """
+        if raw_body is None and request_string:
+            # Kept as text and encoded only if raw_body is read
+            raw_body = self.__split_head(request_string)[1]
+        self.__reset(raw_body)
+        self.__parse_request(request_string)
 
-        self.request_string = request_string
+    def load(self, method, path, http_version, headers, body=b""):
+        """
+        Resets the request and fills it with an already parsed request, its body parsed according to the Content-Type.
+        The server calls it with the head it read, to reuse the request object of a connection for its next
+        keep-alive request.
+        Args:
+            method (str): The HTTP method.
+            path (str): The request target, including the query string.
+            http_version (str): The HTTP version, eg: "HTTP/1.1".
+            headers (dict | Headers | list): The header fields, a list holds (name, value) pairs.
+            body (bytes): The raw body.
+        """
+        self.__reset(body)
+        self.method = method
+        self.path = path
+        self.http_version = http_version
+        self.headers = headers if isinstance(headers, Headers) else Headers(headers)
+        if body:
+            content_type = self.headers.get("Content-Type", CONTENTTYPES.text_plain)
+            try:
+                self.body = CONTENTTYPES.parse_content_type(content_type, body.decode("utf-8"))
+            except (RequestParseError, UnicodeDecodeError):
+                self.body = None
+
+    def __reset(self, raw_body):
         self.method = None
-        self.headers = {}
+        self.headers = Headers()
         self.path_params = []
         self.query_params = {}
+        self.route = None
+        self.client_address = None
+        self.timing = NO_TIMING
+        if self.background_tasks:
+            self.background_tasks = []
         self.path = None
         self.http_version = None
         self.body = None
-        self.__parse_request()
+        self.__raw_body = raw_body
+
+    @property
+    def raw_body(self):
+        """
+        Returns: bytes: The body as received, before it was parsed according to the Content-Type.
+        """
+        if self.__raw_body is None:
+            self.__raw_body = b""
+        elif isinstance(self.__raw_body, str):
+            self.__raw_body = self.__raw_body.encode("utf-8")
+        return self.__raw_body
+
+    def add_background_task(self, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) on a background worker once the response is sent to the client.
+        Args:
+            func: The callable to run, its errors are logged.
+        """
+        self.background_tasks.append((func, args, kwargs))
+
+    @classmethod
+    def from_parts(cls, method, path, http_version, headers, body=b""):
+        """
+        Builds an HttpRequest from an already parsed request, eg: the environ of a WSGI server.
+        Args:
+            method (str): The HTTP method.
+            path (str): The request target, including the query string.
+            http_version (str): The HTTP version, eg: "HTTP/1.1".
+            headers (dict | Headers | list): The header fields, a list holds (name, value) pairs.
+            body (bytes): The raw body.
+        Returns: HttpRequest: The request, its body parsed according to the Content-Type.
+        """
+        request = cls(None)
+        request.load(method, path, http_version, headers, body)
+        return request
 
-    def __is_http_request(self):
+    @staticmethod
+    def __is_http_request(request_string):
         """
         Checks if the request string is an HTTP request and returns True or False.
         Returns: bool: True if the request string is an HTTP request.
         """
-        # Define a regular expression pattern for a simple HTTP request
-        http_request_pattern = re.compile(r'^(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s\S+\sHTTP/1\.1$')
+        # Check if the first line matches a simple HTTP request
+        return bool(HTTP_REQUEST_PATTERN.match(request_string.partition("\n")[0].strip().replace("\r", "")))
 
-        # Check if the string matches the pattern
-        return bool(http_request_pattern.match(self.request_string.split("\n")[0].strip().replace("\r", "")))
+    @staticmethod
+    def __split_head(request_string):
+        """
+        Splits a request string at the first empty line, a line of whitespace when the lines end with a bare "\\n".
+        Returns: tuple: The head and the body, the body keeps its own line breaks.
+        """
+        end = request_string.find("\r\n\r\n")
+        if end >= 0:
+            head = request_string[:end]
+            # A bare LF empty line before it ends the head first
+            if "\n\n" not in head and "\n\r\n" not in head:
+                return head, request_string[end + 4:]
+        lines = request_string.split("\n")
+        for index, line in enumerate(lines):
+            if not line.strip():
+                return "\n".join(lines[:index]), "\n".join(lines[index + 1:])
+        return request_string, ""
 
-    def __parse_request(self):
+    def __parse_request(self, request_string):
         """
         Parses the HTTP request string and sets the HttpRequest object attributes.
         Returns: None
 
         """
         try:
-            if self.request_string is None or not self.__is_http_request():
+            if request_string is None or not self.__is_http_request(request_string):
                 return None
 
-            request_lines = [line.strip().replace("\r", "") for line in self.request_string.split("\n")]
-            header_list = request_lines[0].split(" ")
+            head, body = self.__split_head(request_string)
+            request_lines = [line.strip() for line in head.split("\n")]
 
-            self.method, self.path, self.http_version = header_list
-            self.headers = {header.split(": ")[0]: header.split(": ")[1] for header in request_lines[1:-2] if
-                            header and ": " in header}
-            content_type = self.headers.get("Content-Type", None)
+            self.method, self.path, self.http_version = request_lines[0].split(" ")
+            self.headers = Headers.from_lines(request_lines[1:])
 
-            try:
-                if content_type:
-                    self.body = CONTENTTYPES.parse_content_type(content_type, request_lines[-1]) if request_lines[
-                        -1] else None
-                else:
-                    self.body = CONTENTTYPES.parse_content_type(CONTENTTYPES.text_plain, request_lines[-1]) if \
-                    request_lines[-1] else None
-            except RequestParseError as e:
-                print(e.message)
+            # Without a body the header lines are not even split
+            if body:
+                content_type = self.headers.get("Content-Type") or CONTENTTYPES.text_plain
+                try:
+                    self.body = CONTENTTYPES.parse_content_type(content_type, body)
+                except RequestParseError:
+                    # The body stays None, raw_body still holds it
+                    pass
 
         except IndexError as e:
             raise RequestParseError(f"IndexError while parsing request: {e}")
@@ -220,24 +326,13 @@ class HttpRequest:
 
         return None
 
-    def __getattr__(self, attr):
-        """
-        Returns an HttpRequest object for the given attribute.
-        Args:
-            attr: The attribute name.
-        Returns: Any: The value of the attribute.
-        Raises: AttributeError: If the attribute is not found.
-        """
-        if attr in self.__dict__:
-            return self.__dict__[attr]
-        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attr}'")
-
     def __str__(self):
         """
         Returns a string representation of the HttpRequest object.
         Returns: str: A string representation of the HttpRequest object.
         """
-        return self.request_string
+        head = "".join(f"{name}: {value}\r\n" for name, value in self.headers.items())
+        return f"{self.method} {self.path} {self.http_version}\r\n{head}\r\n" + self.raw_body.decode("utf-8", "replace")
 
     def to_dict(self):
         """
@@ -283,7 +378,7 @@ class HttpRequest:
         Returns:
             int: The hash value of the HttpRequest object.
         """
-        return hash(self.to_dict())
+        return hash((self.method, self.path, self.http_version))
 
     def __repr__(self):
         """
@@ -18,6 +18,8 @@ import json
 import time
 from dataclasses import dataclass
 
+from .headers import Headers
+
 
 @dataclass
 class HTTPRESPONSECODES:
@@ -193,7 +195,17 @@ class RESPONSEMEMETYPES:
     multipart_form_data: str = "multipart/form-data"
 
 
+# Attributes a response exposes through item access, eg: response["status"]
+# Sent by every HttpResponse that does not set them, as fields of its response_headers
+DEFAULT_RESPONSE_FIELDS = (("Server", "RollAsBack V.0.0.1 beta (CodeWiki.org)"), ("Accept-Ranges", "bytes"))
+RESPONSE_FIELDS = ("date", "connection", "response_headers", "last_modified", "content_length", "content_type",
+                   "message", "status", "mimetype", "http_version")
+
+
 class HttpResponse:
+    __slots__ = ("date", "connection", "response_headers", "last_modified", "content_length", "message", "status",
+                 "mimetype", "http_version")
+
     def __init__(self, response_message, response_headers, status=200, mimetype=RESPONSEMEMETYPES.text_plain,
                  last_modified=time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())):
         """
@@ -211,7 +223,10 @@ class HttpResponse:
             __str__(): Returns a string representation of the HttpResponse object.
         """
         # Encode the response as bytes if it's a string
-        if isinstance(response_message, str):
+        if isinstance(response_message, bytes):
+            pass
+
+        elif isinstance(response_message, str):
             response_message = response_message.encode("utf-8")
 
         elif isinstance(response_message, dict):
@@ -231,15 +246,16 @@ class HttpResponse:
 
         self.date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
         self.connection = "close"
-        self.response_headers = response_headers
-        # control that if the Server property is not set, set it
-        if "Server" not in self.response_headers:
-            self.response_headers["Server"] = "RollAsBack Python Server"
-        if "Accept-Ranges" not in self.response_headers:
-            self.response_headers["Accept-Ranges"] = "bytes"
+        if isinstance(response_headers, Headers):
+            for name, value in DEFAULT_RESPONSE_FIELDS:
+                if name not in response_headers:
+                    response_headers.add(name, value)
+            self.response_headers = response_headers
+        else:
+            # The defaults are added while the fields are copied, without building the lookup index
+            self.response_headers = Headers(response_headers, DEFAULT_RESPONSE_FIELDS)
         self.last_modified = last_modified
         self.content_length = len(response_message)
-        self.content_type = mimetype
         self.message = response_message
         self.status = status
         self.mimetype = mimetype
@@ -252,15 +268,23 @@ class HttpResponse:
                Returns:
                    str: A string representation of the HttpResponse object.
         """
-        string_response = f"{self.http_version} {self.status} {HTTPRESPONSECODES.RESPONSE_MESSAGES[self.status]}\n"
-        string_response += f"Date: {self.date}\nConnection: close\n"
-        string_response += "Server: RollAsBack V.0.0.1 beta (CodeWiki.org)\nAccept-Ranges: bytes\n"
-        string_response += f"Content-Type: {self.mimetype}\nContent-Length: {self.content_length}\nLast-Modified: {self.last_modified}"
-        for key, value in self.response_headers.items():
-            string_response += f"{key}: {value}\n"
-        string_response += "\n"
-        string_response += self.message.decode("utf-8")
-        return string_response
+        return (self.__head() + self.message).decode("utf-8")
+
+    def __bytes__(self):
+        """
+        Returns the byte representation of the HttpResponse object, binary bodies are sent as they are.
+
+        Returns:
+            bytes: The status line, the headers and the body.
+        """
+        return self.__head() + self.message
+
+    def __head(self):
+        head = (f"{self.http_version} {self.status} {HTTPRESPONSECODES.RESPONSE_MESSAGES[self.status]}\r\n"
+                f"Date: {self.date}\r\nConnection: {self.connection}\r\n"
+                f"Content-Type: {self.mimetype}\r\nContent-Length: {self.content_length}\r\n"
+                f"Last-Modified: {self.last_modified}\r\n")
+        return head.encode("utf-8") + self.response_headers.to_bytes() + b"\r\n"
 
     def set_cookie(self, cookie):
         """
@@ -269,28 +293,180 @@ class HttpResponse:
         Args:
             cookie (Cookie): Cookie object to set.
         """
-        self.response_headers["Set-Cookie"] = str(cookie)
+        self.response_headers.add("Set-Cookie", str(cookie))
 
     def set_cookie_jar(self, cookie_jar):
         """
         Set a cookie jar to the response.
 
         Args:
-            cookie_jar (CookieJar): CookieJar object to set.
+            cookie_jar (CookieJar): CookieJar object to set, each cookie gets its own Set-Cookie field.
         """
-        self.response_headers["Set-Cookie"] = cookie_jar
+        for cookie in cookie_jar.get_cookies():
+            self.response_headers.add("Set-Cookie", str(cookie))
+
+    @property
+    def content_type(self):
+        """
+        Returns: str: The Content-Type, the same as mimetype.
+        """
+        return self.mimetype
+
+    @content_type.setter
+    def content_type(self, value):
+        self.mimetype = value
+
+    def __fields(self):
+        return [name for name in RESPONSE_FIELDS if hasattr(self, name)]
 
     def __repr__(self):
         return self.__str__()
 
     def __contains__(self, item):
-        return item in self.__dict__
+        return item in self.__fields()
 
     def __len__(self):
-        return len(self.__dict__)
+        return len(self.__fields())
 
     def __getitem__(self, key):
-        return self.__dict__[key]
+        if key not in self.__fields():
+            raise KeyError(key)
+        return getattr(self, key)
 
     def __setitem__(self, key, value):
-        self.__dict__[key] = value
+        setattr(self, key, value)
+
+
+
+class RawResponse(HttpResponse):
+    """
+    A response rendered to bytes once and sent as it is, for answers repeated on hot paths such as 429 or 503.
+    It carries no Date header, the same bytes are reused for its whole life.
+
+    Attributes:
+        status (int): The HTTP status code.
+        connection (str): "keep-alive" or "close", set by the server before sending.
+    """
+
+    __slots__ = ("__rendered",)
+
+    def __init__(self, response_message, response_headers=None, status=200, mimetype=RESPONSEMEMETYPES.text_plain):
+        if isinstance(response_message, str):
+            response_message = response_message.encode("utf-8")
+        self.status = status
+        self.message = response_message
+        self.mimetype = mimetype
+        self.response_headers = Headers(response_headers)
+        self.http_version = "HTTP/1.1"
+        self.connection = "close"
+        self.__rendered = {value: self.__render(value) for value in ("keep-alive", "close")}
+
+    def __render(self, connection):
+        head = (f"{self.http_version} {self.status} {HTTPRESPONSECODES.RESPONSE_MESSAGES[self.status]}\r\n"
+                f"Connection: {connection}\r\nServer: RollAsBack V.0.0.1 beta (CodeWiki.org)\r\n"
+                f"Content-Type: {self.mimetype}\r\nContent-Length: {len(self.message)}\r\n")
+        return head.encode("latin-1") + self.response_headers.to_bytes() + b"\r\n" + self.message
+
+    def to_bytes(self, connection):
+        """
+        Returns the rendered response with the given Connection header, without changing the object.
+        """
+        return self.__rendered[connection]
+
+    def __bytes__(self):
+        return self.__rendered[self.connection]
+
+    def __str__(self):
+        return bytes(self).decode("utf-8")
+
+
+class StreamingResponse(HttpResponse):
+    """
+    A response whose body is produced by an iterable of bytes and sent while it is produced.
+    Without a content_length the body is sent with chunked transfer encoding.
+
+    Attributes:
+        chunks: Iterable of bytes or str, the body.
+        response_headers (dict): Additional header fields.
+        status (int): The HTTP status code.
+        mimetype (str): The Content-Type.
+        content_length (int): The body size if it is known in advance.
+        on_close: Callable run once the body is sent or abandoned, eg: to release an upstream connection.
+    """
+
+    __slots__ = ("chunks", "on_close")
+
+    def __init__(self, chunks, response_headers=None, status=200, mimetype=RESPONSEMEMETYPES.text_plain,
+                 content_length=None, on_close=None):
+        self.chunks = chunks
+        self.response_headers = response_headers if isinstance(response_headers, Headers) else Headers(
+            response_headers)
+        self.status = status
+        self.mimetype = mimetype
+        self.content_length = content_length
+        self.on_close = on_close
+        self.http_version = "HTTP/1.1"
+        self.connection = "close"
+        self.date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+
+    @property
+    def chunked(self):
+        return self.content_length is None
+
+    def head(self):
+        """
+        Returns: bytes: The status line and the header fields.
+        """
+        reason = HTTPRESPONSECODES.RESPONSE_MESSAGES.get(self.status, "Unknown")
+        framing = "Transfer-Encoding: chunked" if self.chunked else f"Content-Length: {self.content_length}"
+        head = (f"{self.http_version} {self.status} {reason}\r\nDate: {self.date}\r\n"
+                f"Connection: {self.connection}\r\nServer: RollAsBack V.0.0.1 beta (CodeWiki.org)\r\n"
+                f"Content-Type: {self.mimetype}\r\n{framing}\r\n")
+        return head.encode("latin-1") + self.response_headers.to_bytes() + b"\r\n"
+
+    def iter_body(self):
+        """
+        Yields the body chunks as bytes, without transfer encoding.
+        """
+        for chunk in self.chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield chunk
+
+    def iter_encoded(self):
+        """
+        Yields the body as it is written on the connection, framed when chunked.
+        """
+        if not self.chunked:
+            yield from self.iter_body()
+            return
+        for chunk in self.iter_body():
+            yield b"%x\r\n%b\r\n" % (len(chunk), chunk)
+        yield b"0\r\n\r\n"
+
+    def close(self):
+        """
+        Runs on_close once, the server calls it after the body is sent or when sending failed.
+        """
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+    def __bytes__(self):
+        try:
+            return self.head() + b"".join(self.iter_encoded())
+        finally:
+            self.close()
+
+    def __str__(self):
+        return bytes(self).decode("utf-8")
+
+def serialize(response):
+    """
+    Returns the bytes sent for a value returned by a handler, responses are serialized with bytes(),
+    anything else is sent as its string.
+    """
+    if isinstance(response, HttpResponse):
+        return bytes(response)
+    return str(response).encode("utf-8")
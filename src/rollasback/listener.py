@@ -0,0 +1,107 @@
+"""
+Author(s): CodeWiki
+File name: listener.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import errno
+import os
+import socket
+import stat
+
+# sd_listen_fds(3): the first socket passed by systemd socket activation
+SD_LISTEN_FDS_START = 3
+DEFAULT_UNIX_SOCKET_MODE = 0o660
+
+
+def tcp_listener(host, port, backlog):
+    """
+    Returns: socket: A TCP socket listening on host and port.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    return listener
+
+
+def unix_listener(path, backlog, mode=DEFAULT_UNIX_SOCKET_MODE, group=None):
+    """
+    Binds a Unix domain socket, the local alternative to TCP loopback for a reverse proxy on the same host.
+    A socket file left by a process that is gone is replaced, one that still accepts connections is not.
+    The mode and the group are applied before listening, so no client can connect with the default permissions.
+    Args:
+        path (str): Path of the socket file.
+        backlog (int): Listen backlog.
+        mode (int): Permissions of the socket file, eg: 0o660 lets the group of the proxy connect.
+        group: Name or ID of the group owning the socket file, the group of the process when None.
+    Returns: socket: The listening socket.
+    Raises: OSError: If the path is in use or is not a socket.
+    """
+    _remove_stale(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+        os.chmod(path, mode)
+        if group is not None:
+            if isinstance(group, str):
+                import grp
+                group = grp.getgrnam(group).gr_gid
+            os.chown(path, -1, group)
+        listener.listen(backlog)
+    except BaseException:
+        listener.close()
+        raise
+    return listener
+
+
+def _remove_stale(path):
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, "Not a socket", path)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another server listens on the socket", path)
+
+
+def fd_listener(fd):
+    """
+    Adopts a socket that is already bound and listening, eg: opened by a supervisor before starting the process.
+    Args:
+        fd (int): The file descriptor, its family and type are detected.
+    Returns: socket: The listening socket.
+    """
+    return socket.socket(fileno=fd)
+
+
+def systemd_listen_fds():
+    """
+    Returns the sockets passed by systemd socket activation, or any supervisor following the same protocol.
+    The LISTEN_* variables are removed, so processes started by the app do not take the sockets for theirs.
+    Returns: list: The file descriptors, empty when the process was not socket activated.
+    """
+    pid = os.environ.pop("LISTEN_PID", None)
+    count = os.environ.pop("LISTEN_FDS", None)
+    os.environ.pop("LISTEN_FDNAMES", None)
+    if pid is None or count is None or not pid.isdigit() or int(pid) != os.getpid():
+        return []
+    return list(range(SD_LISTEN_FDS_START, SD_LISTEN_FDS_START + int(count)))
@@ -0,0 +1,206 @@
+"""
+Author(s): CodeWiki
+File name: metrics.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds (in seconds) of the latency histogram buckets, the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteStats:
+    """
+    Counters of a single route. The lock is only held for a handful of integer updates.
+    Attributes:
+        requests (int): Number of finished requests.
+        in_flight (int): Number of requests currently being handled.
+        status_counts (dict): Number of responses per status code.
+        bucket_counts (list): Number of requests per latency bucket, the last one is +Inf.
+        duration_sum (float): Sum of the request durations in seconds.
+    """
+    __slots__ = ("requests", "in_flight", "status_counts", "bucket_counts", "duration_sum", "lock")
+
+    def __init__(self, bucket_count):
+        self.requests = 0
+        self.in_flight = 0
+        self.status_counts = {}
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.duration_sum = 0.0
+        self.lock = threading.Lock()
+
+
+class MetricsRegistry:
+    """
+    Records per-route request counts, status codes, in-flight requests and latency histograms.
+    Attributes:
+        buckets (tuple): Upper bounds of the latency histogram buckets in seconds.
+        routes (dict): RouteStats per route path.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, quantiles=DEFAULT_QUANTILES):
+        self.buckets = tuple(sorted(buckets))
+        self.quantiles = tuple(quantiles)
+        self.routes = {}
+        self.__lock = threading.Lock()
+
+    def stats(self, route):
+        """
+        Returns the RouteStats of the given route, creating them on first use.
+        Args:
+            route (str): The route path used as label.
+        Returns: RouteStats: The counters of the route.
+        """
+        stats = self.routes.get(route)
+        if stats is None:
+            with self.__lock:
+                stats = self.routes.setdefault(route, RouteStats(len(self.buckets)))
+        return stats
+
+    def observe(self, route, status, duration):
+        """
+        Records a finished request.
+        Args:
+            route (str): The route path used as label.
+            status (int): The response status code.
+            duration (float): The request duration in seconds.
+        """
+        stats = self.stats(route)
+        index = bisect_left(self.buckets, duration)
+        with stats.lock:
+            _record(stats, status, index, duration)
+
+    def track(self, route, handler):
+        """
+        Wraps a handler so that every call is recorded under the given route.
+        Args:
+            route (str): The route path used as label.
+            handler: Callable taking an HttpRequest and returning a response.
+        Returns: callable: The instrumented handler.
+        """
+        stats = self.stats(route)
+        buckets = self.buckets
+        perf_counter = time.perf_counter
+
+        def tracked(request):
+            with stats.lock:
+                stats.in_flight += 1
+            status = 500
+            start = perf_counter()
+            try:
+                response = handler(request)
+                status = getattr(response, "status", 200)
+                return response
+            finally:
+                duration = perf_counter() - start
+                index = bisect_left(buckets, duration)
+                with stats.lock:
+                    stats.in_flight -= 1
+                    _record(stats, status, index, duration)
+
+        return tracked
+
+    def quantile(self, route, q):
+        """
+        Estimates a latency quantile of a route from its histogram, interpolating inside the bucket.
+        Args:
+            route (str): The route path used as label.
+            q (float): The quantile between 0 and 1.
+        Returns: float: The estimated latency in seconds, None if the route has no requests.
+        """
+        stats = self.routes.get(route)
+        if stats is None:
+            return None
+        with stats.lock:
+            counts = list(stats.bucket_counts)
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    # Nothing is known above the last bound
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self):
+        """
+        Renders all counters in the Prometheus text exposition format.
+        Returns: str: The metrics page.
+        """
+        requests, responses, in_flight, histogram, quantiles = [], [], [], [], []
+        for route in sorted(self.routes):
+            stats = self.routes[route]
+            with stats.lock:
+                total = stats.requests
+                current = stats.in_flight
+                status_counts = sorted(stats.status_counts.items())
+                counts = list(stats.bucket_counts)
+                duration_sum = stats.duration_sum
+            label = 'route="{}"'.format(_escape(route))
+            requests.append(f"rollasback_requests_total{{{label}}} {total}")
+            in_flight.append(f"rollasback_requests_in_flight{{{label}}} {current}")
+            for status, count in status_counts:
+                responses.append(f'rollasback_responses_total{{{label},status="{status}"}} {count}')
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                histogram.append(f'rollasback_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            histogram.append(f"rollasback_request_duration_seconds_sum{{{label}}} {duration_sum}")
+            histogram.append(f"rollasback_request_duration_seconds_count{{{label}}} {cumulative}")
+            for q in self.quantiles:
+                value = self.quantile(route, q)
+                if value is not None:
+                    quantiles.append(f'rollasback_request_duration_quantile_seconds{{{label},quantile="{q}"}} {value}')
+
+        lines = [
+            "# HELP rollasback_requests_total Requests handled per route.",
+            "# TYPE rollasback_requests_total counter",
+            *requests,
+            "# HELP rollasback_responses_total Responses per route and status code.",
+            "# TYPE rollasback_responses_total counter",
+            *responses,
+            "# HELP rollasback_requests_in_flight Requests currently handled per route.",
+            "# TYPE rollasback_requests_in_flight gauge",
+            *in_flight,
+            "# HELP rollasback_request_duration_seconds Request latency per route.",
+            "# TYPE rollasback_request_duration_seconds histogram",
+            *histogram,
+            "# HELP rollasback_request_duration_quantile_seconds Latency quantiles estimated from the histogram.",
+            "# TYPE rollasback_request_duration_quantile_seconds gauge",
+            *quantiles,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _record(stats, status, index, duration):
+    # The caller holds stats.lock
+    stats.requests += 1
+    stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+    stats.bucket_counts[index] += 1
+    stats.duration_sum += duration
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
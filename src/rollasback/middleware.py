@@ -0,0 +1,79 @@
+"""
+Author(s): CodeWiki
+File name: middleware.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+
+
+def _wrap_middleware(middleware, call_next):
+    def call(request):
+        return middleware(request, call_next)
+
+    return call
+
+
+def _wrap_before_request(hooks, call_next):
+    hooks = tuple(hooks)
+
+    def call(request):
+        for hook in hooks:
+            response = hook(request)
+            if response is not None:
+                return response
+        return call_next(request)
+
+    return call
+
+
+def _wrap_after_request(hooks, call_next):
+    hooks = tuple(hooks)
+
+    def call(request):
+        response = call_next(request)
+        for hook in hooks:
+            result = hook(request, response)
+            if result is not None:
+                response = result
+        return response
+
+    return call
+
+
+def compose(handler, middlewares=(), before_request=(), after_request=()):
+    """
+    Composes the registered hooks around a handler into a single callable.
+
+    The resulting chain runs the ``before_request`` hooks first, then the middlewares in
+    registration order and finally the handler. ``after_request`` hooks see every response,
+    including the ones returned early by a hook or a middleware.
+
+    Args:
+        handler: Callable taking an HttpRequest and returning an HttpResponse.
+        middlewares: Callables with the signature ``middleware(request, call_next)``. A middleware
+            can short-circuit the chain by returning a response without calling ``call_next``.
+        before_request: Callables with the signature ``hook(request)``. Returning a response
+            skips the rest of the chain.
+        after_request: Callables with the signature ``hook(request, response)``. Returning a
+            response replaces the current one.
+
+    Returns: callable: The handler itself when nothing is registered, otherwise the composed chain.
+    """
+    chain = handler
+    for middleware in reversed(middlewares):
+        chain = _wrap_middleware(middleware, chain)
+    if before_request:
+        chain = _wrap_before_request(before_request, chain)
+    if after_request:
+        chain = _wrap_after_request(after_request, chain)
+    return chain
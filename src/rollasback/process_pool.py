@@ -0,0 +1,237 @@
+"""
+Author(s): CodeWiki
+File name: process_pool.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import concurrent.futures
+import logging as log
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from .access_log import APP_LOGGER_NAME
+from .http_request import HttpRequest
+from .http_response import HttpResponse, HTTPRESPONSECODES, StreamingResponse
+
+EXECUTORS = ("thread", "process")
+OUTCOMES = ("completed", "failed", "timed_out")
+# ProcessPoolExecutor takes max_tasks_per_child from Python 3.11 and shutdown() takes cancel_futures from 3.9,
+# older versions recycle the pool and drop the queued calls here
+NATIVE_RECYCLING = sys.version_info >= (3, 11)
+CANCEL_FUTURES = sys.version_info >= (3, 9)
+
+
+@dataclass
+class RequestSnapshot:
+    """
+    The picklable part of an HttpRequest, sent to the worker process running the handler.
+
+    Attributes:
+        method (str): The HTTP method.
+        path (str): The request target, including the query string.
+        http_version (str): The HTTP version.
+        headers (list): Every (name, value) header field.
+        body (bytes): The raw body, parsed again in the worker according to the Content-Type.
+        query_params (dict): The parsed query string.
+        path_params (list): The values of the path parameters of the route.
+        client_address (tuple): The address of the client.
+    """
+    method: str
+    path: str
+    http_version: str
+    headers: list
+    body: bytes = b""
+    query_params: dict = field(default_factory=dict)
+    path_params: list = field(default_factory=list)
+    client_address: tuple = None
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(request.method, request.path, request.http_version, request.headers.items(), request.raw_body,
+                   request.query_params, request.path_params, request.client_address)
+
+    def to_request(self):
+        """
+        Returns: HttpRequest: A request with the same fields, its route is None in the worker.
+        """
+        request = HttpRequest.from_parts(self.method, self.path, self.http_version, self.headers, self.body)
+        request.query_params = self.query_params
+        request.path_params = self.path_params
+        request.client_address = self.client_address
+        return request
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Handler timed out")
+
+
+def _run_handler(handler, snapshot, timeout):
+    """
+    Runs in the worker process: rebuilds the request, calls the handler and sends back the response
+    with the background tasks the handler added.
+    """
+    alarm = timeout is not None and hasattr(signal, "setitimer")
+    if alarm:
+        # Tasks run on the main thread of the worker, an alarm stops a handler that runs past its timeout
+        # instead of keeping the worker busy after the server stopped waiting for it
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        request = snapshot.to_request()
+        response = handler(request)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    if isinstance(response, StreamingResponse):
+        raise TypeError("A process handler can not return a StreamingResponse, its body can not be pickled")
+    return response, request.background_tasks
+
+
+class ProcessPool:
+    """
+    Runs CPU-bound handlers in worker processes, so they do not hold the GIL of the server process.
+    The pool is started on the first call. Handlers and responses cross the process boundary pickled:
+    the handler must be a module level function, and the request it gets is rebuilt from a RequestSnapshot.
+
+    Attributes:
+        workers (int): Number of worker processes, the number of CPUs when None.
+        max_tasks_per_child (int): Calls after which a worker process is replaced, to return the memory it grew to.
+            None keeps the workers for the life of the pool. Before Python 3.11 the whole pool is replaced once it
+            made workers times max_tasks_per_child calls.
+        timeout (float): Default seconds a call may take, None waits without limit.
+    """
+
+    def __init__(self, workers=None, max_tasks_per_child=None, timeout=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout = timeout
+        self.logger = log.getLogger(APP_LOGGER_NAME)
+        self.__executor = None
+        self.__submitted = 0
+        self.__lock = threading.Lock()
+        self.__running = 0
+        self.__counts = dict.fromkeys(OUTCOMES, 0)
+
+    def __get_executor(self):
+        with self.__lock:
+            if self.__executor is None:
+                # A worker forked from the server would inherit the client sockets open at that time and keep
+                # their connections open after the server closed them, workers start from a clean process instead
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                options = {"max_tasks_per_child": self.max_tasks_per_child} if NATIVE_RECYCLING else {}
+                self.__executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method), **options)
+                self.__submitted = 0
+            return self.__executor
+
+    def run(self, handler, request, timeout=None):
+        """
+        Runs a handler in a worker process and blocks the calling thread until its response is back.
+        Args:
+            handler: Module level function taking an HttpRequest.
+            request (HttpRequest): The request, sent as a RequestSnapshot.
+            timeout (float): Seconds the call may take, the timeout of the pool when None.
+        Returns: HttpResponse: The response, a 504 if the handler did not finish in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        executor = self.__get_executor()
+        try:
+            future = executor.submit(_run_handler, handler, RequestSnapshot.from_request(request), timeout)
+        except BrokenProcessPool:
+            # A worker died, eg: killed for its memory. The next call starts a new pool
+            self.__replace(executor)
+            raise
+        with self.__lock:
+            self.__running += 1
+        if self.max_tasks_per_child and not NATIVE_RECYCLING:
+            self.__recycle(executor)
+        outcome = "failed"
+        try:
+            response, background_tasks = future.result(timeout)
+            outcome = "completed"
+        except (concurrent.futures.TimeoutError, TimeoutError):
+            # The call is still queued behind busy workers, or running and stopped by the alarm of its worker
+            future.cancel()
+            outcome = "timed_out"
+            self.logger.warning("Process handler %s timed out after %s seconds", handler.__name__, timeout)
+            return HttpResponse(HTTPRESPONSECODES.RESPONSE_MESSAGES[HTTPRESPONSECODES.GATEWAY_TIMEOUT],
+                                response_headers={}, status=HTTPRESPONSECODES.GATEWAY_TIMEOUT)
+        except BrokenProcessPool:
+            self.__replace(executor)
+            raise
+        finally:
+            with self.__lock:
+                self.__running -= 1
+                self.__counts[outcome] += 1
+        request.background_tasks.extend(background_tasks)
+        return response
+
+    def wrap(self, handler, timeout=None):
+        """
+        Wraps a handler into a blocking callable running it in the pool.
+        Args:
+            handler: Module level function taking an HttpRequest.
+            timeout (float): Seconds a call may take, the timeout of the pool when None.
+        Returns: callable: The blocking handler.
+        """
+        run = self.run
+
+        def blocking(request):
+            return run(handler, request, timeout)
+
+        return blocking
+
+    def __recycle(self, executor):
+        with self.__lock:
+            if self.__executor is not executor:
+                return
+            self.__submitted += 1
+            if self.__submitted < self.workers * self.max_tasks_per_child:
+                return
+            self.__executor = None
+        # The calls already submitted finish in the old workers, which exit once they are done
+        executor.shutdown(wait=False)
+
+    def __replace(self, executor):
+        with self.__lock:
+            if self.__executor is executor:
+                self.__executor = None
+        _shutdown(executor, wait=False)
+
+    def stats(self):
+        """
+        Returns: dict: The calls running, and the completed, failed and timed_out counters.
+        """
+        with self.__lock:
+            return dict(self.__counts, running=self.__running)
+
+    def close(self):
+        """
+        Cancels the queued calls and waits for the worker processes to exit.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            _shutdown(executor, wait=True)
+
+
+def _shutdown(executor, wait):
+    if CANCEL_FUTURES:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    else:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,161 @@
+"""
+Author(s): CodeWiki
+File name: profiler.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import random
+import threading
+
+PROFILE_HEADER = "X-RollAsBack-Profile"
+# Sort keys accepted by pstats.Stats.sort_stats, eg: "cumulative", "tottime" or "calls"
+SORT_KEYS = frozenset(pstats.Stats.sort_arg_dict_default)
+
+
+class RequestProfiler:
+    """
+    Profiles route handlers with cProfile and aggregates the statistics per route.
+
+    A request is profiled when it is picked by the sample rate or when it carries the trusted
+    header with the configured token. Only one request is profiled at a time, concurrent
+    requests run unprofiled while the profiler is busy.
+
+    Attributes:
+        sample_rate (float): Fraction of the requests to profile, between 0 and 1.
+        header (str): Name of the header that requests profiling.
+        token (str): Secret value the header must carry, header triggering is disabled when None.
+    """
+
+    def __init__(self, sample_rate=0.0, header=PROFILE_HEADER, token=None):
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.__stats = {}
+        self.__counts = {}
+        self.__busy = threading.Lock()
+        self.__lock = threading.Lock()
+
+    def is_trusted(self, request):
+        """
+        Checks if the request carries the trusted header with the configured token.
+        Args:
+            request (HttpRequest): The request to check.
+        Returns: bool: True if the token matches.
+        """
+        if self.token is None:
+            return False
+        value = request.headers.get(self.header)
+        return value is not None and hmac.compare_digest(value, self.token)
+
+    def wrap(self, route, handler):
+        """
+        Wraps a route handler so that picked requests are profiled.
+        Args:
+            route (str): The route path the statistics are aggregated under.
+            handler: Callable taking an HttpRequest and returning a response.
+        Returns: callable: The wrapped handler.
+        """
+        sample_rate = self.sample_rate
+        is_trusted = self.is_trusted
+        busy = self.__busy
+
+        def profiled(request):
+            if not (random.random() < sample_rate or is_trusted(request)):
+                return handler(request)
+            if not busy.acquire(blocking=False):
+                return handler(request)
+            try:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Another profiling tool is active in the process
+                    return handler(request)
+                try:
+                    return handler(request)
+                finally:
+                    profile.disable()
+                    self.__add(route, profile)
+            finally:
+                busy.release()
+
+        return profiled
+
+    def __add(self, route, profile):
+        with self.__lock:
+            stats = self.__stats.get(route)
+            if stats is None:
+                self.__stats[route] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            self.__counts[route] = self.__counts.get(route, 0) + 1
+
+    def routes(self):
+        """
+        Returns: dict: The number of profiled requests per route.
+        """
+        with self.__lock:
+            return dict(self.__counts)
+
+    def report(self, route=None, sort="cumulative", limit=30):
+        """
+        Returns the aggregated statistics as a sorted text report.
+        Args:
+            route (str): The route to report, all routes are merged when None.
+            sort (str): A pstats sort key such as "cumulative", "tottime" or "calls".
+            limit (int): Maximum number of functions listed.
+        Returns: str: The report, empty if nothing was profiled.
+        """
+        stream = io.StringIO()
+        stats = self.__merged(route, stream)
+        if stats is None:
+            return ""
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self, route=None):
+        """
+        Returns the aggregated statistics in the binary .prof format read by pstats and snakeviz.
+        Args:
+            route (str): The route to dump, all routes are merged when None.
+        Returns: bytes: The marshalled statistics, None if nothing was profiled.
+        """
+        stats = self.__merged(route)
+        if stats is None:
+            return None
+        return marshal.dumps(stats.stats)
+
+    def reset(self):
+        """
+        Drops all the collected statistics.
+        """
+        with self.__lock:
+            self.__stats.clear()
+            self.__counts.clear()
+
+    def __merged(self, route, stream=None):
+        with self.__lock:
+            if route is not None:
+                selected = [self.__stats[route]] if route in self.__stats else []
+            else:
+                selected = list(self.__stats.values())
+            if not selected:
+                return None
+            merged = pstats.Stats(stream=stream)
+            merged.add(*selected)
+        return merged
@@ -0,0 +1,134 @@
+"""
+Author(s): CodeWiki
+File name: ratelimit.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from .http_response import HTTPRESPONSECODES, RawResponse
+
+HEADER_KEY_PREFIX = "header:"
+
+
+def client_ip(request):
+    """
+    Returns: str: The IP address of the client, "unknown" when the server did not set it.
+    """
+    address = request.client_address
+    return address[0] if address else "unknown"
+
+
+def key_function(key):
+    """
+    Resolves a rate limit key into a function of the request.
+    Args:
+        key: "ip", "header:<Name>" keyed on a header and falling back to the client IP, or a callable.
+    Returns: callable: Function taking an HttpRequest and returning the bucket key.
+    """
+    if callable(key):
+        return key
+    if key == "ip":
+        return client_ip
+    if isinstance(key, str) and key.startswith(HEADER_KEY_PREFIX):
+        name = key[len(HEADER_KEY_PREFIX):]
+
+        def header_key(request):
+            value = request.headers.get(name)
+            return value if value is not None else client_ip(request)
+
+        return header_key
+    raise ValueError(f"Unknown rate limit key: {key!r}")
+
+
+class RateLimiter:
+    """
+    Token buckets keyed per client. Each key gets burst tokens, refilled at rate tokens per second,
+    and every request takes one. Buckets live in a table of at most max_keys entries evicting the least
+    recently seen key, so memory stays flat when requests come from many addresses.
+
+    Attributes:
+        rate (float): Tokens added per second, the sustained requests per second of a key.
+        burst (int): Bucket size, the requests a key can send at once.
+        max_keys (int): Maximum number of buckets kept.
+        rejected (int): Number of requests answered with 429.
+    """
+
+    def __init__(self, rate, burst=None, key="ip", max_keys=10000):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, math.ceil(rate))
+        self.max_keys = max_keys
+        self.key = key_function(key)
+        self.rejected = 0
+        # [tokens, last refill] per key, ordered from the least to the most recently seen
+        self.__buckets = OrderedDict()
+        self.__lock = threading.Lock()
+        # An empty bucket has a token again after at most 1 / rate seconds
+        self.retry_after = max(1, math.ceil(1 / rate))
+        self.response = RawResponse(HTTPRESPONSECODES.RESPONSE_MESSAGES[HTTPRESPONSECODES.TOO_MANY_REQUESTS],
+                                    {"Retry-After": str(self.retry_after)},
+                                    status=HTTPRESPONSECODES.TOO_MANY_REQUESTS)
+
+    def acquire(self, key, now=None):
+        """
+        Takes a token from the bucket of the key.
+        Args:
+            key: The bucket key.
+            now (float): The current monotonic time, mainly for tests.
+        Returns: bool: True if the request is allowed.
+        """
+        if now is None:
+            now = time.monotonic()
+        buckets = self.__buckets
+        with self.__lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.max_keys:
+                    buckets.popitem(last=False)
+                buckets[key] = [self.burst - 1, now]
+                return True
+            buckets.move_to_end(key)
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                self.rejected += 1
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+    def __len__(self):
+        return len(self.__buckets)
+
+    def wrap(self, handler):
+        """
+        Wraps a handler so that requests over the limit get the pre-serialized 429 without calling it.
+        Args:
+            handler: Callable taking an HttpRequest and returning a response.
+        Returns: callable: The wrapped handler.
+        """
+        key = self.key
+        acquire = self.acquire
+        response = self.response
+
+        def limited(request):
+            if not acquire(key(request)):
+                return response
+            return handler(request)
+
+        return limited
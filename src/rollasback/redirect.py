@@ -18,17 +18,18 @@ class Redirect(HttpResponse):
         )
 
     def __str__(self):
+        body = "<html><head><meta http-equiv=\"refresh\" content=\"{}; url={}\"></head></html>".format(
+            self.blink_sec, self.location)
         string_response = f"{self.http_version} {self.status} {HTTPRESPONSECODES.RESPONSE_MESSAGES[self.status]}\n"
         string_response += f"Location: {self.location}\n"
-        string_response += f"Date: {self.date}\nConnection: close\n"
+        string_response += f"Date: {self.date}\nConnection: {self.connection}\n"
         string_response += "Server: RollAsBack V.0.0.1 beta (CodeWiki.org)\nAccept-Ranges: bytes\n"
-        string_response += f"Content-Type: {self.mimetype}\nContent-Length: {self.content_length}\nLast-Modified: {self.last_modified}"
+        string_response += f"Content-Type: {self.mimetype}\nContent-Length: {len(body.encode('utf-8'))}\nLast-Modified: {self.last_modified}\n"
         for key, value in self.response_headers.items():
             string_response += f"{key}: {value}\n"
         string_response += "Injected-Header: True\n"
         string_response += "\n"
-        string_response += "<html><head><meta http-equiv=\"refresh\" content=\"{}; url={}\"></head></html>".format(
-            self.blink_sec, self.location)
+        string_response += body
 
         return string_response
 
@@ -57,9 +58,9 @@ class Blink(HttpResponse):
     def __str__(self):
         string_response = f"{self.http_version} {self.status} {HTTPRESPONSECODES.RESPONSE_MESSAGES[self.status]}\n"
         string_response += f"Location: {self.location}\n"
-        string_response += f"Date: {self.date}\nConnection: close\n"
+        string_response += f"Date: {self.date}\nConnection: {self.connection}\n"
         string_response += "Server: RollAsBack V.0.0.1 beta (CodeWiki.org)\nAccept-Ranges: bytes\n"
-        string_response += f"Content-Type: {self.mimetype}\nContent-Length:zzz \nLast-Modified: {self.last_modified}"
+        string_response += f"Content-Type: {self.mimetype}\nContent-Length:zzz \nLast-Modified: {self.last_modified}\n"
         for key, value in self.response_headers.items():
             string_response += f"{key}: {value}\n"
         string_response += "Injected-Header: true\n"
@@ -72,8 +73,6 @@ class Blink(HttpResponse):
         # modify yhe content length
         string_response = string_response.replace("zzz", str(len(string_response.split("\n\n")[1])))
 
-        print(string_response)
-
         return string_response
 
     def __repr__(self):
@@ -0,0 +1,162 @@
+"""
+Author(s): CodeWiki
+File name: redirects.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import csv
+import html
+import json
+import logging as log
+import os
+import threading
+
+from .access_log import APP_LOGGER_NAME
+from .http_response import RawResponse, RESPONSEMEMETYPES
+
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+
+
+def _normalize(path):
+    return path.rstrip("/") or "/"
+
+
+def render_redirect(location, status):
+    """
+    Renders a redirect once, the returned response is shared by every request it answers.
+    Args:
+        location (str): The target URL.
+        status (int): 301, 302, 303, 307 or 308.
+    Returns: RawResponse: The redirect.
+    """
+    if status not in REDIRECT_STATUSES:
+        raise ValueError(f"Invalid redirect status: {status}")
+    escaped = html.escape(location, quote=True)
+    body = f'<html><head><meta http-equiv="refresh" content="0; url={escaped}"></head></html>'
+    return RawResponse(body, {"Location": location}, status=status, mimetype=RESPONSEMEMETYPES.text_html)
+
+
+def read_redirects(path, status=301):
+    """
+    Reads redirects from a CSV or JSON file.
+    CSV rows are "source,target" or "source,target,status". JSON is an object mapping sources to targets,
+    or a list of {"from": ..., "to": ..., "status": ...} objects.
+    Args:
+        path (str): The file, its extension selects the format.
+        status (int): Status of the entries that do not set one.
+    Returns: list: (source, target, status) tuples.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.endswith(".json"):
+            data = json.load(file)
+            if isinstance(data, dict):
+                return [(source, target, status) for source, target in data.items()]
+            return [(entry["from"], entry["to"], int(entry.get("status", status))) for entry in data]
+        entries = []
+        for row in csv.reader(file):
+            if not row or row[0].startswith("#"):
+                continue
+            entries.append((row[0].strip(), row[1].strip(), int(row[2]) if len(row) > 2 and row[2].strip() else status))
+        return entries
+
+
+class RedirectTable:
+    """
+    Exact-path redirects looked up in a dictionary before routing, each answered with bytes rendered once.
+    Loading builds a new dictionary and swaps it in, so a reload never blocks or disturbs requests.
+
+    Attributes:
+        source: The mapping or the CSV/JSON file path the table was loaded from.
+        status (int): Status of the entries that do not set one.
+    """
+
+    def __init__(self, source, status=301):
+        self.source = source
+        self.status = status
+        self.logger = log.getLogger(APP_LOGGER_NAME)
+        self.__table = {}
+        self.__mtime = None
+        self.__watcher = None
+        self.__stop = threading.Event()
+        self.load(source)
+
+    def load(self, source=None):
+        """
+        Replaces the redirects with the ones of the source.
+        Args:
+            source: A {source: target} or {source: (target, status)} mapping, or a CSV/JSON file path.
+                The current source is read again when None.
+        Returns: int: Number of redirects loaded.
+        """
+        if source is None:
+            source = self.source
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            mtime = os.stat(path).st_mtime
+            entries = read_redirects(path, self.status)
+        else:
+            mtime = None
+            entries = [(key, *value) if isinstance(value, tuple) else (key, value, self.status)
+                       for key, value in source.items()]
+        # Targets shared by many sources are rendered once
+        rendered = {}
+        table = {}
+        for path, target, status in entries:
+            response = rendered.get((target, status))
+            if response is None:
+                response = rendered[(target, status)] = render_redirect(target, status)
+            table[_normalize(path)] = response
+        self.__table = table
+        self.source = source
+        self.__mtime = mtime
+        return len(table)
+
+    def lookup(self, path):
+        """
+        Args:
+            path (str): The request path, without the query string.
+        Returns: RawResponse: The redirect of the path, None if there is none.
+        """
+        return self.__table.get(_normalize(path))
+
+    def __len__(self):
+        return len(self.__table)
+
+    def __contains__(self, path):
+        return _normalize(path) in self.__table
+
+    def watch(self, interval=5.0):
+        """
+        Reloads the file of the table whenever its modification time changes, checked every interval seconds.
+        A file that fails to load is logged and the previous redirects stay in place.
+        """
+        if self.__watcher is not None or not isinstance(self.source, (str, os.PathLike)):
+            return
+        self.__watcher = threading.Thread(target=self.__watch, args=(interval,), name="rollasback-redirects",
+                                          daemon=True)
+        self.__watcher.start()
+
+    def __watch(self, interval):
+        while not self.__stop.wait(interval):
+            try:
+                if os.stat(self.source).st_mtime != self.__mtime:
+                    count = self.load()
+                    self.logger.info("Reloaded %d redirects from %s", count, self.source)
+            except (OSError, ValueError, KeyError, IndexError):
+                self.logger.exception("Could not reload the redirects from %s", self.source)
+
+    def stop(self):
+        """
+        Stops watching the file.
+        """
+        self.__stop.set()
@@ -0,0 +1,254 @@
+"""
+Author(s): CodeWiki
+File name: sse.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import collections
+import json
+import threading
+
+from .http_response import StreamingResponse
+
+EVENT_STREAM = "text/event-stream"
+OVERFLOW_POLICIES = ("drop", "disconnect")
+# A comment line, ignored by EventSource, sent on idle streams to notice clients that went away
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def encode_event(data="", event=None, id=None, retry=None):
+    """
+    Encodes an event in the text/event-stream format.
+    Args:
+        data: str, bytes, or a dict or list sent as JSON. Every line becomes a "data:" field.
+        event (str): The event type, "message" on the client when None.
+        id (str): The event ID, sent back by the client in Last-Event-ID when it reconnects.
+        retry (int): Milliseconds the client waits before reconnecting.
+    Returns: bytes: The event, ending with the blank line that dispatches it.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    elif isinstance(data, (dict, list)):
+        data = json.dumps(data, separators=(",", ":"))
+    elif not isinstance(data, str):
+        data = str(data)
+    fields = []
+    if event is not None:
+        fields.append(f"event: {_single_line(event)}\n")
+    if id is not None:
+        fields.append(f"id: {_single_line(id)}\n")
+    if retry is not None:
+        fields.append(f"retry: {int(retry)}\n")
+    for line in data.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        fields.append(f"data: {line}\n")
+    fields.append("\n")
+    return "".join(fields).encode("utf-8")
+
+
+def _single_line(value):
+    value = str(value)
+    if "\n" in value or "\r" in value or "\0" in value:
+        raise ValueError(f"Invalid event field: {value!r}")
+    return value
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    A text/event-stream response, sent event by event while the iterable produces them.
+    The iterable yields encoded events as bytes, eg: from encode_event() or a Subscription, or the data of an event
+    as a str, dict or list, encoded on the way.
+
+    Attributes:
+        retry (int): Milliseconds the client waits before reconnecting, sent before the first event.
+    """
+
+    __slots__ = ("retry",)
+
+    def __init__(self, events, response_headers=None, status=200, on_close=None, retry=None):
+        super().__init__(events, response_headers, status=status, mimetype=EVENT_STREAM, on_close=on_close)
+        self.retry = retry
+        # Proxies must not cache or buffer the stream
+        if "Cache-Control" not in self.response_headers:
+            self.response_headers["Cache-Control"] = "no-cache"
+        if "X-Accel-Buffering" not in self.response_headers:
+            self.response_headers["X-Accel-Buffering"] = "no"
+
+    def iter_body(self):
+        if self.retry is not None:
+            yield f"retry: {int(self.retry)}\n\n".encode("utf-8")
+        for event in self.chunks:
+            if not isinstance(event, bytes):
+                event = encode_event(event)
+            if event:
+                yield event
+
+
+class Subscription:
+    """
+    The events of a hub for one client, iterated by its EventStreamResponse.
+    Events wait in a bounded queue until the connection takes them, the hub applies its overflow policy
+    when a slow client lets the queue fill up.
+
+    Attributes:
+        dropped (int): Number of events dropped because the queue was full.
+        closed (bool): True once the subscription ended, the iteration stops.
+    """
+
+    def __init__(self, hub, queue_size, heartbeat):
+        self.hub = hub
+        self.heartbeat = heartbeat
+        self.dropped = 0
+        self.closed = False
+        self.queue = collections.deque(maxlen=queue_size)
+        # Events replayed after a reconnection, sent before the queue
+        self.backlog = collections.deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Returns: bytes: The next event, or a heartbeat comment after heartbeat idle seconds.
+        Raises: StopIteration: Once the subscription is closed.
+        """
+        with self.hub.changed:
+            if self.backlog and not self.closed:
+                return self.backlog.popleft()
+            # Every subscriber is woken by a publish, the ones without an event wait again
+            self.hub.changed.wait_for(lambda: self.queue or self.closed, self.heartbeat)
+            if self.closed:
+                raise StopIteration
+            if self.queue:
+                return self.queue.popleft()
+        return HEARTBEAT
+
+    def close(self):
+        """
+        Unsubscribes from the hub, events still queued are discarded.
+        """
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    Publishes events to every subscribed client.
+    A published event is encoded once and the same bytes are queued for every subscriber, so a broadcast costs
+    one queue append per subscriber whatever the size of the event. The last events are kept in a ring buffer
+    and replayed to clients reconnecting with a Last-Event-ID.
+
+    Attributes:
+        history (int): Number of events kept for replay.
+        queue_size (int): Number of events a subscriber may have waiting for its connection.
+        overflow (str): What happens when the queue of a subscriber is full: "drop" drops its oldest waiting event,
+            "disconnect" ends its stream, the client reconnects and catches up from the ring buffer.
+        heartbeat (float): Idle seconds before a heartbeat comment is sent to a subscriber.
+    """
+
+    def __init__(self, history=1000, queue_size=100, overflow="drop", heartbeat=15.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+        self.history = history
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.heartbeat = heartbeat
+        self.changed = threading.Condition()
+        self.__events = collections.deque(maxlen=history)
+        self.__subscribers = set()
+        self.__next_id = 1
+        self.__closed = False
+
+    def publish(self, data="", event=None, id=None):
+        """
+        Sends an event to every subscriber.
+        Args:
+            data: str, bytes, or a dict or list sent as JSON.
+            event (str): The event type.
+            id (str): The event ID, a sequence number when None.
+        Returns: str: The ID of the event.
+        """
+        with self.changed:
+            # Encoded under the lock so the ring buffer keeps the order of the sequence numbers
+            if id is None:
+                id = str(self.__next_id)
+                self.__next_id += 1
+            encoded = encode_event(data, event, id)
+            self.__events.append((id, encoded))
+            for subscriber in list(self.__subscribers):
+                if len(subscriber.queue) == self.queue_size:
+                    subscriber.dropped += 1
+                    if self.overflow == "disconnect":
+                        self.__remove(subscriber)
+                        continue
+                # The queue is bounded, appending to a full one drops its oldest event
+                subscriber.queue.append(encoded)
+            self.changed.notify_all()
+        return id
+
+    def subscribe(self, last_event_id=None):
+        """
+        Args:
+            last_event_id (str): The last event the client received, the events after it are queued first.
+                When it is no longer in the ring buffer, every buffered event is.
+        Returns: Subscription: The subscription, closed at once if the hub is closed.
+        """
+        subscription = Subscription(self, self.queue_size, self.heartbeat)
+        with self.changed:
+            if self.__closed:
+                subscription.closed = True
+                return subscription
+            if last_event_id is not None:
+                subscription.backlog.extend(self.__replay(last_event_id))
+            self.__subscribers.add(subscription)
+        return subscription
+
+    def __replay(self, last_event_id):
+        events = list(self.__events)
+        for position in range(len(events) - 1, -1, -1):
+            if events[position][0] == last_event_id:
+                return [encoded for _, encoded in events[position + 1:]]
+        return [encoded for _, encoded in events]
+
+    def stream(self, request, retry=None):
+        """
+        Subscribes the client of a request, resuming after its Last-Event-ID header.
+        Args:
+            request (HttpRequest): The request of the client.
+            retry (int): Milliseconds the client waits before reconnecting.
+        Returns: EventStreamResponse: The response to return from the handler.
+        """
+        subscription = self.subscribe(request.headers.get("Last-Event-ID"))
+        return EventStreamResponse(subscription, on_close=subscription.close, retry=retry)
+
+    def unsubscribe(self, subscription):
+        with self.changed:
+            self.__remove(subscription)
+            self.changed.notify_all()
+
+    def __remove(self, subscription):
+        subscription.closed = True
+        subscription.queue.clear()
+        subscription.backlog.clear()
+        self.__subscribers.discard(subscription)
+
+    def __len__(self):
+        return len(self.__subscribers)
+
+    def close(self):
+        """
+        Ends every stream and refuses new subscribers, the app calls it when the server stops.
+        """
+        with self.changed:
+            self.__closed = True
+            for subscriber in list(self.__subscribers):
+                self.__remove(subscriber)
+            self.changed.notify_all()
@@ -0,0 +1,174 @@
+"""
+Author(s): CodeWiki
+File name: testing.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import json
+from urllib.parse import urlencode
+
+from .connection import ConnectionLimits, RequestReadError, parse_head
+from .headers import Headers
+from .http_request import HttpRequest, REQUEST_METHODS
+from .http_response import HttpResponse, HTTPRESPONSECODES, StreamingResponse, serialize
+
+TEST_CLIENT_ADDRESS = ("testclient", 50000)
+
+
+def _error_response(status):
+    return HttpResponse(HTTPRESPONSECODES.RESPONSE_MESSAGES[status], response_headers={}, status=status)
+
+
+def _decode_chunked(data):
+    body = b""
+    while True:
+        size_line, _, data = data.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            return body
+        body += data[:size]
+        data = data[size + 2:]
+
+
+class TestResponse:
+    """
+    A response parsed back from the bytes the server would have sent.
+    Attributes:
+        status (int): The status code.
+        reason (str): The reason phrase.
+        headers (Headers): The header fields, get_all() returns every value of a repeated name.
+        body (bytes): The body.
+        raw (bytes): The whole serialized response.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        end = raw.find(b"\r\n\r\n")
+        if end >= 0:
+            head, self.body = raw[:end], raw[end + 4:]
+        else:
+            head, _, self.body = raw.partition(b"\n\n")
+        lines = head.decode("latin-1").split("\n")
+        _, status, self.reason = lines[0].rstrip("\r").split(" ", 2)
+        self.status = int(status)
+        self.headers = Headers()
+        for line in lines[1:]:
+            name, separator, value = line.rstrip("\r").partition(":")
+            if separator:
+                self.headers.add(name, value.strip())
+        if self.body and self.headers.get("Transfer-Encoding") == "chunked":
+            self.body = _decode_chunked(self.body)
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.body)
+
+    def __repr__(self):
+        return f"TestResponse(status={self.status}, body={self.body[:60]!r})"
+
+
+class TestClient:
+    """
+    Calls an app in-process: the head of a request is parsed by parse_head and the request built with its raw
+    body as on the server, routed through the hooks and the handlers and serialized, without sockets or threads.
+    Background tasks of a request run on the calling thread before the response is returned.
+    The pipeline is built when the client is created, hooks registered afterwards are not picked up.
+    Attributes:
+        app (RollAsBack): The app under test.
+        raise_server_exceptions (bool): Re-raises handler errors instead of answering 500.
+    """
+    __test__ = False  # Not a test case for pytest
+
+    def __init__(self, app, raise_server_exceptions=True):
+        self.app = app
+        self.raise_server_exceptions = raise_server_exceptions
+        self.pipeline = app.build_pipeline()
+
+    def request(self, method, path, params=None, headers=None, body=None, json_body=None):
+        """
+        Sends a request through the app.
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path, it can carry a query string.
+            params (dict): Query parameters appended to the path.
+            headers (dict): Additional header fields.
+            body (str | bytes): The raw body.
+            json_body: A value sent as a JSON body with the matching Content-Type.
+        Returns: TestResponse: The parsed response.
+        """
+        fields = Headers({"Host": "testserver"})
+        # Names given in any case replace the defaults
+        fields.update(headers or {})
+        if params:
+            path += ("&" if "?" in path else "?") + urlencode(params, doseq=True)
+        if json_body is not None:
+            body = json.dumps(json_body)
+            fields.setdefault("Content-Type", "application/json")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        body = body or b""
+        if body:
+            fields.setdefault("Content-Length", str(len(body)))
+
+        try:
+            head = parse_head(f"{method} {path} HTTP/1.1\r\n".encode("utf-8") + fields.to_bytes() + b"\r\n",
+                              ConnectionLimits())
+            body = body[:head.content_length]
+        except RequestReadError as error:
+            return TestResponse(serialize(_error_response(error.status)))
+        if head.method not in REQUEST_METHODS:
+            return TestResponse(serialize(_error_response(HTTPRESPONSECODES.BAD_REQUEST)))
+        request = HttpRequest.from_parts(head.method, head.path, head.http_version, head.fields, body)
+        request.client_address = TEST_CLIENT_ADDRESS
+        try:
+            response = self.pipeline(request)
+        except Exception:
+            if self.raise_server_exceptions:
+                raise
+            response = _error_response(HTTPRESPONSECODES.INTERNAL_SERVER_ERROR)
+        if method == "HEAD" and isinstance(response, StreamingResponse):
+            # Like the server, a HEAD is answered with the head alone
+            data = response.head()
+            response.close()
+        else:
+            data = serialize(response)
+            if method == "HEAD" and isinstance(response, HttpResponse):
+                data = data[:len(data) - len(response.message)]
+        # Background tasks run before returning, so tests can check their effects
+        for func, args, kwargs in request.background_tasks:
+            func(*args, **kwargs)
+        return TestResponse(data)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def head(self, path, **kwargs):
+        return self.request("HEAD", path, **kwargs)
+
+    def options(self, path, **kwargs):
+        return self.request("OPTIONS", path, **kwargs)
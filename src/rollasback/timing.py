@@ -0,0 +1,163 @@
+"""
+Author(s): CodeWiki
+File name: timing.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import time
+from contextlib import contextmanager
+
+from .http_response import HttpResponse, RawResponse
+
+SERVER_TIMING_HEADER = "Server-Timing"
+# The phases of a request in the order the server goes through them. The Server-Timing header is written
+# before the response is serialized, serialize and send only reach the access log
+PHASES = ("recv", "parse", "route", "handler", "serialize", "send")
+
+
+class RequestTiming:
+    """
+    Durations of the phases of one request and of the named spans its handler added,
+    measured with time.perf_counter_ns.
+
+    Attributes:
+        phases (dict): Nanoseconds spent in each phase the server went through, in that order.
+        spans (list): (name, nanoseconds, description) of the spans added by the handler.
+    """
+
+    __slots__ = ("phases", "spans")
+
+    def __init__(self):
+        self.phases = {}
+        self.spans = []
+
+    def add_phase(self, name, duration_ns):
+        """
+        Adds time to a phase of the server, a phase measured in several pieces adds up.
+        Args:
+            name (str): The phase, one of PHASES.
+            duration_ns (int): Nanoseconds spent.
+        """
+        self.phases[name] = self.phases.get(name, 0) + duration_ns
+
+    def add(self, name, duration_ns, description=None):
+        """
+        Adds a span measured by the handler, eg: the time of a query returned by a database driver.
+        Args:
+            name (str): The name of the span, a token without spaces, commas or semicolons.
+            duration_ns (int): Nanoseconds spent.
+            description (str): Optional human readable description.
+        """
+        self.spans.append((name, duration_ns, description))
+
+    @contextmanager
+    def span(self, name, description=None):
+        """
+        Measures the block it wraps as a span, eg: with request.timing.span("db"): ...
+        Args:
+            name (str): The name of the span, a token without spaces, commas or semicolons.
+            description (str): Optional human readable description.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter_ns() - start, description))
+
+    def header_value(self):
+        """
+        Returns: str: The Server-Timing header value, durations in milliseconds.
+        """
+        entries = [f"{name};dur={duration / 1e6:.3f}" for name, duration in self.phases.items()]
+        for name, duration, description in self.spans:
+            entry = f"{name};dur={duration / 1e6:.3f}"
+            if description is not None:
+                escaped = description.replace("\\", "\\\\").replace('"', '\\"')
+                entry += f';desc="{escaped}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+    def to_dict(self):
+        """
+        Returns: dict: Milliseconds per phase and per span, spans with the same name add up.
+        """
+        result = {name: round(duration / 1e6, 3) for name, duration in self.phases.items()}
+        for name, duration, _ in self.spans:
+            result[name] = round(result.get(name, 0) + duration / 1e6, 3)
+        return result
+
+
+class _NoTiming:
+    """
+    Stands in for a RequestTiming while timing is disabled, so handlers add spans without checking.
+    """
+
+    __slots__ = ()
+
+    def add_phase(self, name, duration_ns):
+        pass
+
+    def add(self, name, duration_ns, description=None):
+        pass
+
+    @contextmanager
+    def span(self, name, description=None):
+        yield
+
+
+NO_TIMING = _NoTiming()
+
+
+class ServerTiming:
+    """
+    Times the phases of every request served by the built-in server.
+
+    Attributes:
+        header (bool): Sends the phases measured before serialization and the spans of the handler
+            in a Server-Timing response header.
+        access_log (bool): Adds the milliseconds of every phase and span to the access log record.
+    """
+
+    def __init__(self, header=True, access_log=True):
+        self.header = header
+        self.access_log = access_log
+
+    def wrap(self, phase, func):
+        """
+        Wraps a step of the server so that its duration is added to a phase of every request it handles.
+        Only pipelines built while timing is enabled pay for the clock reads.
+        Args:
+            phase (str): The phase, one of PHASES.
+            func: Callable taking an HttpRequest.
+        Returns: callable: The timed step.
+        """
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed(request):
+            start = perf_counter_ns()
+            try:
+                return func(request)
+            finally:
+                request.timing.add_phase(phase, perf_counter_ns() - start)
+
+        return timed
+
+    def add_header(self, response, timing):
+        """
+        Sets the Server-Timing header of a response. A RawResponse is rendered once and shared, it is left as it is.
+        Args:
+            response: The response returned by the pipeline.
+            timing (RequestTiming): The timing of the request.
+        """
+        if self.header and isinstance(response, HttpResponse) and not isinstance(response, RawResponse):
+            response.response_headers[SERVER_TIMING_HEADER] = timing.header_value()
@@ -0,0 +1,93 @@
+"""
+Author(s): CodeWiki
+File name: tls.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import ssl
+import subprocess
+
+DEFAULT_ALPN_PROTOCOLS = ("http/1.1",)
+# TLS 1.3 session tickets sent after each full handshake, a client resuming several connections needs one each
+DEFAULT_SESSION_TICKETS = 2
+
+
+def server_context(certfile, keyfile=None, password=None, alpn_protocols=DEFAULT_ALPN_PROTOCOLS,
+                   session_tickets=DEFAULT_SESSION_TICKETS):
+    """
+    Builds the TLS context of the server.
+    Returning clients resume their session instead of doing a full handshake: with a TLS 1.3 session ticket,
+    or a TLS 1.2 ticket or session ID found in the session cache of the context. context.session_stats()
+    counts the resumptions.
+    Args:
+        certfile (str): PEM file with the certificate chain, and the private key when keyfile is None.
+        keyfile (str): PEM file with the private key.
+        password: Password of the private key, a str, bytes or a callable returning one.
+        alpn_protocols (tuple): Protocols offered in ALPN, in order of preference.
+        session_tickets (int): Number of TLS 1.3 tickets sent after a full handshake, 0 disables resumption.
+    Returns: SSLContext: The context.
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.load_cert_chain(certfile, keyfile, password)
+    context.options |= ssl.OP_NO_COMPRESSION
+    if session_tickets:
+        context.options &= ~ssl.OP_NO_TICKET
+    else:
+        context.options |= ssl.OP_NO_TICKET
+    if hasattr(context, "num_tickets"):
+        context.num_tickets = session_tickets
+    if alpn_protocols:
+        context.set_alpn_protocols(list(alpn_protocols))
+    return context
+
+
+def client_context(cafile=None, verify=True, alpn_protocols=DEFAULT_ALPN_PROTOCOLS):
+    """
+    Builds a TLS client context, eg: for tests and the bench tool talking to a server with a self-signed certificate.
+    Args:
+        cafile (str): PEM file of the trusted certificates, the system ones when None.
+        verify (bool): False accepts any certificate, only for local testing.
+        alpn_protocols (tuple): Protocols offered in ALPN.
+    Returns: SSLContext: The context.
+    """
+    context = ssl.create_default_context(cafile=cafile)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if alpn_protocols:
+        context.set_alpn_protocols(list(alpn_protocols))
+    return context
+
+
+def generate_self_signed(certfile, keyfile, hostname="localhost", days=30):
+    """
+    Writes a self-signed certificate and its private key, valid for hostname, localhost, 127.0.0.1 and ::1.
+    The standard library can not create certificates, the openssl command is used.
+    Args:
+        certfile (str): Path of the certificate to write.
+        keyfile (str): Path of the private key to write.
+        hostname (str): Common name of the certificate.
+        days (int): Validity of the certificate.
+    Raises: RuntimeError: If the openssl command is missing or fails.
+    """
+    names = f"DNS:{hostname},DNS:localhost,IP:127.0.0.1,IP:::1"
+    command = ["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1", "-nodes",
+               "-keyout", keyfile, "-out", certfile, "-days", str(days), "-subj", f"/CN={hostname}",
+               "-addext", f"subjectAltName={names}"]
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise RuntimeError("The openssl command is required to generate a certificate")
+    except subprocess.CalledProcessError as error:
+        raise RuntimeError(f"openssl failed: {error.stderr.decode('utf-8', 'replace').strip()}")
@@ -0,0 +1,701 @@
+"""
+Author(s): CodeWiki
+File name: websocket.py
+Date: 19th October 2026
+
+Description: Web backend framework written in Python named as RollAsBack.
+
+Disclaimer: This software is provided "as is" without warranty of any kind,
+express or implied, including but not limited to the warranties of merchantability,
+fitness for a particular purpose, and noninfringement. In no event shall the authors
+or copyright holders be liable for any claim, damages, or other liability,
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection
+with the software or the use or other dealings in the software.
+
+Copyright @ CodeWiki by MIT License
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+
+from .http_response import HTTPRESPONSECODES, RawResponse
+
+# RFC 6455 section 1.3, appended to the key of the client to compute Sec-WebSocket-Accept
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+VERSION = "13"
+
+CONTINUATION = 0x0
+TEXT = 0x1
+BINARY = 0x2
+CLOSE = 0x8
+PING = 0x9
+PONG = 0xA
+DATA_OPCODES = frozenset((CONTINUATION, TEXT, BINARY))
+CONTROL_OPCODES = frozenset((CLOSE, PING, PONG))
+
+NORMAL_CLOSURE = 1000
+GOING_AWAY = 1001
+PROTOCOL_ERROR = 1002
+NO_STATUS = 1005
+ABNORMAL_CLOSURE = 1006
+INVALID_PAYLOAD = 1007
+POLICY_VIOLATION = 1008
+MESSAGE_TOO_BIG = 1009
+INTERNAL_ERROR = 1011
+
+DEFAULT_MAX_MESSAGE_SIZE = 1048576
+CLOSE_TIMEOUT = 5.0
+# Returned by the protocol for frames that are not a message, eg: a ping answered with a pong
+_CONTROL = object()
+
+
+class WebSocketError(Exception):
+    """Raised when the peer breaks the protocol, code is the close code to answer with."""
+
+    def __init__(self, message, code=PROTOCOL_ERROR):
+        self.message = message
+        self.code = code
+        super().__init__(self.message)
+
+
+class HandshakeError(Exception):
+    """Raised when an upgrade request is not a valid WebSocket handshake, status is the response code."""
+
+    def __init__(self, message, status=HTTPRESPONSECODES.BAD_REQUEST):
+        self.message = message
+        self.status = status
+        super().__init__(self.message)
+
+    def response(self):
+        """
+        Returns: RawResponse: The error response, 426 responses name the supported version.
+        """
+        headers = {"Sec-WebSocket-Version": VERSION} if self.status == HTTPRESPONSECODES.UPGRADE_REQUIRED else {}
+        return RawResponse(self.message, headers, status=self.status)
+
+
+def accept_key(key):
+    """
+    Returns: str: The Sec-WebSocket-Accept value answering the Sec-WebSocket-Key of a client.
+    """
+    return base64.b64encode(hashlib.sha1((key + GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def handshake(method, http_version, headers, subprotocols=()):
+    """
+    Validates an upgrade request.
+    Args:
+        method (str): The HTTP method.
+        http_version (str): The HTTP version.
+        headers: The request header fields, looked up by lowercase name.
+        subprotocols: The subprotocols the route speaks, in order of preference.
+    Returns: tuple: The Sec-WebSocket-Accept value and the chosen subprotocol, None if there is none.
+    Raises: HandshakeError: If the request is not a valid WebSocket handshake.
+    """
+    if method != "GET" or http_version != "HTTP/1.1":
+        raise HandshakeError("WebSocket handshakes are HTTP/1.1 GET requests")
+    if headers.get("upgrade", "").lower() != "websocket":
+        raise HandshakeError("Missing Upgrade: websocket")
+    if "upgrade" not in [token.strip().lower() for token in headers.get("connection", "").split(",")]:
+        raise HandshakeError("Missing Connection: Upgrade")
+    if headers.get("sec-websocket-version") != VERSION:
+        raise HandshakeError("Unsupported WebSocket version", HTTPRESPONSECODES.UPGRADE_REQUIRED)
+    key = headers.get("sec-websocket-key", "")
+    try:
+        if len(base64.b64decode(key, validate=True)) != 16:
+            raise HandshakeError("Invalid Sec-WebSocket-Key")
+    except binascii.Error:
+        raise HandshakeError("Invalid Sec-WebSocket-Key")
+    offered = [token.strip() for token in headers.get("sec-websocket-protocol", "").split(",") if token.strip()]
+    subprotocol = next((protocol for protocol in subprotocols if protocol in offered), None)
+    return accept_key(key), subprotocol
+
+
+def handshake_response(accept, subprotocol=None):
+    """
+    Returns: bytes: The 101 Switching Protocols response completing the handshake.
+    """
+    lines = ["HTTP/1.1 101 Switching Protocols", "Upgrade: websocket", "Connection: Upgrade",
+             f"Sec-WebSocket-Accept: {accept}"]
+    if subprotocol:
+        lines.append(f"Sec-WebSocket-Protocol: {subprotocol}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def apply_mask(data, key):
+    """
+    XORs data with the 4-byte masking key, as a single big integer operation rather than byte by byte.
+    """
+    length = len(data)
+    if not length:
+        return b""
+    repeated = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+
+
+def encode_frame(opcode, payload=b"", fin=True, mask=None):
+    """
+    Encodes a single frame.
+    Args:
+        opcode (int): The frame opcode.
+        payload (bytes): The payload.
+        fin (bool): False for all but the last frame of a fragmented message.
+        mask (bytes): A 4-byte masking key, clients mask every frame, servers never do.
+    Returns: bytes: The frame.
+    """
+    first = (0x80 if fin else 0) | opcode
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header = struct.pack("!BB", first, mask_bit | length)
+    elif length < 65536:
+        header = struct.pack("!BBH", first, mask_bit | 126, length)
+    else:
+        header = struct.pack("!BBQ", first, mask_bit | 127, length)
+    if mask:
+        return header + mask + apply_mask(payload, mask)
+    return header + payload
+
+
+def encode_close(code=NORMAL_CLOSURE, reason=""):
+    """
+    Returns: bytes: The payload of a close frame.
+    """
+    if code == NO_STATUS:
+        return b""
+    # Control frames carry at most 125 bytes, the reason is cut on a character boundary
+    return struct.pack("!H", code) + reason.encode("utf-8")[:123].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _valid_close_code(code):
+    return 1000 <= code <= 1003 or 1007 <= code <= 1011 or 3000 <= code <= 4999
+
+
+class FrameParser:
+    """
+    Incremental frame decoder, fed with the bytes read from the connection.
+    Fragmented messages are reassembled, control frames are returned as soon as they are complete,
+    even between the fragments of a message.
+    """
+
+    def __init__(self, max_message_size=DEFAULT_MAX_MESSAGE_SIZE, mask_required=True):
+        self.max_message_size = max_message_size
+        self.mask_required = mask_required
+        self.buffer = bytearray()
+        self.__fragments = []
+        self.__opcode = None
+        self.__size = 0
+
+    def feed(self, data):
+        self.buffer += data
+
+    def next_frame(self):
+        """
+        Returns: tuple: The opcode and the payload of the next control frame or whole message,
+            None until more bytes are fed.
+        Raises: WebSocketError: If the peer breaks the protocol or sends a message over max_message_size.
+        """
+        while True:
+            buffer = self.buffer
+            if len(buffer) < 2:
+                return None
+            first, second = buffer[0], buffer[1]
+            fin, opcode = first & 0x80, first & 0x0F
+            if first & 0x70:
+                raise WebSocketError("Reserved bits set without a negotiated extension")
+            if opcode not in DATA_OPCODES and opcode not in CONTROL_OPCODES:
+                raise WebSocketError(f"Unknown opcode {opcode}")
+            masked, length = second & 0x80, second & 0x7F
+            if self.mask_required and not masked:
+                raise WebSocketError("Client frames must be masked")
+            offset = 2
+            if length == 126:
+                if len(buffer) < 4:
+                    return None
+                length = struct.unpack_from("!H", buffer, 2)[0]
+                offset = 4
+            elif length == 127:
+                if len(buffer) < 10:
+                    return None
+                length = struct.unpack_from("!Q", buffer, 2)[0]
+                offset = 10
+            if opcode in CONTROL_OPCODES:
+                if not fin or length > 125:
+                    raise WebSocketError("Control frames must be single frames of at most 125 bytes")
+            elif self.__size + length > self.max_message_size:
+                # Rejected from the header, the payload is never buffered
+                raise WebSocketError("Message too big", MESSAGE_TOO_BIG)
+            if masked:
+                offset += 4
+            if len(buffer) < offset + length:
+                return None
+            payload = bytes(buffer[offset:offset + length])
+            if masked:
+                payload = apply_mask(payload, bytes(buffer[offset - 4:offset]))
+            del buffer[:offset + length]
+
+            if opcode in CONTROL_OPCODES:
+                return opcode, payload
+            if opcode == CONTINUATION:
+                if self.__opcode is None:
+                    raise WebSocketError("Continuation frame without a message to continue")
+            elif self.__opcode is not None:
+                raise WebSocketError("New message in the middle of a fragmented message")
+            else:
+                self.__opcode = opcode
+            if fin and not self.__fragments:
+                message_opcode, self.__opcode = self.__opcode, None
+                return message_opcode, payload
+            self.__fragments.append(payload)
+            self.__size += length
+            if fin:
+                message_opcode, self.__opcode = self.__opcode, None
+                message, self.__fragments, self.__size = b"".join(self.__fragments), [], 0
+                return message_opcode, message
+
+
+class _Protocol:
+    """
+    State shared by the WebSocket flavours: frame decoding, the replies to control frames and the close handshake.
+    """
+
+    def __init__(self, request, subprotocol, max_message_size, buffered=b""):
+        self.request = request
+        self.subprotocol = subprotocol
+        self.parser = FrameParser(max_message_size)
+        self.parser.feed(buffered)
+        self.closed = False
+        self.close_code = None
+        self.close_reason = ""
+        self.close_sent = False
+
+    def _event(self, opcode, payload):
+        """
+        Returns: tuple: The message (str, bytes, None once closed or _CONTROL) and the frame to send back, if any.
+        """
+        if opcode == TEXT:
+            try:
+                return payload.decode("utf-8"), None
+            except UnicodeDecodeError:
+                raise WebSocketError("Text message is not valid UTF-8", INVALID_PAYLOAD)
+        if opcode == BINARY:
+            return payload, None
+        if opcode == PING:
+            return _CONTROL, encode_frame(PONG, payload)
+        if opcode == PONG:
+            return _CONTROL, None
+        # Close frame
+        if len(payload) == 1:
+            raise WebSocketError("Close frame with a truncated code")
+        code = struct.unpack("!H", payload[:2])[0] if payload else NO_STATUS
+        if payload and not _valid_close_code(code):
+            raise WebSocketError(f"Invalid close code {code}")
+        try:
+            reason = payload[2:].decode("utf-8")
+        except UnicodeDecodeError:
+            raise WebSocketError("Close reason is not valid UTF-8", INVALID_PAYLOAD)
+        self.closed = True
+        self.close_code, self.close_reason = code, reason
+        if self.close_sent:
+            return None, None
+        self.close_sent = True
+        return None, encode_frame(CLOSE, encode_close(code if payload else NORMAL_CLOSURE))
+
+    def _failed(self, error):
+        """
+        Returns: bytes: The close frame answering a protocol error, the connection is then closed.
+        """
+        self.closed = True
+        self.close_code, self.close_reason = error.code, error.message
+        if self.close_sent:
+            return None
+        self.close_sent = True
+        return encode_frame(CLOSE, encode_close(error.code, error.message))
+
+    @staticmethod
+    def _frame(message):
+        if isinstance(message, str):
+            return encode_frame(TEXT, message.encode("utf-8"))
+        if isinstance(message, (bytes, bytearray, memoryview)):
+            return encode_frame(BINARY, bytes(message))
+        raise TypeError(f"WebSocket messages are str or bytes, not {type(message).__name__}")
+
+
+class WebSocket(_Protocol):
+    """
+    A WebSocket served on a connection thread, given to def handlers registered with app.websocket.
+    receive() blocks the handler thread, send() can be called from any thread.
+
+    Attributes:
+        request (HttpRequest): The handshake request, with its path and query parameters.
+        subprotocol (str): The negotiated subprotocol, None if there is none.
+        closed (bool): True once a close frame was received or the connection was lost.
+        close_code (int): The close code of the peer, 1006 when the connection was lost without one.
+    """
+
+    def __init__(self, client_socket, request, subprotocol=None, max_message_size=DEFAULT_MAX_MESSAGE_SIZE,
+                 buffered=b"", write_timeout=30.0):
+        super().__init__(request, subprotocol, max_message_size, buffered)
+        self.socket = client_socket
+        # Each send writes its whole frame within write_timeout, reads without a deadline retry on the same timeout
+        self.socket.settimeout(write_timeout)
+        self.__send_lock = threading.Lock()
+
+    def __recv(self, deadline):
+        while True:
+            try:
+                return self.socket.recv(65536)
+            except socket.timeout:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def __write(self, frame):
+        with self.__send_lock:
+            self.socket.sendall(frame)
+
+    def receive(self, timeout=None):
+        """
+        Waits for the next message, answering pings and close frames on the way.
+        Args:
+            timeout (float): Seconds to wait, socket.timeout is raised when they are over. None waits forever.
+        Returns: str | bytes: The message, str for text messages. None once the WebSocket is closed.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.closed:
+            try:
+                frame = self.parser.next_frame()
+            except WebSocketError as error:
+                self.__write_quietly(self._failed(error))
+                return None
+            if frame is None:
+                try:
+                    data = self.__recv(deadline)
+                except socket.timeout:
+                    raise
+                except OSError:
+                    data = b""
+                if not data:
+                    self.closed = True
+                    self.close_code = ABNORMAL_CLOSURE
+                    return None
+                self.parser.feed(data)
+                continue
+            try:
+                message, reply = self._event(*frame)
+            except WebSocketError as error:
+                self.__write_quietly(self._failed(error))
+                return None
+            if reply is not None:
+                self.__write_quietly(reply)
+            if message is not _CONTROL:
+                return message
+        return None
+
+    def __write_quietly(self, frame):
+        if frame is None:
+            return
+        try:
+            self.__write(frame)
+        except OSError:
+            pass
+
+    def receive_json(self, timeout=None):
+        """
+        Returns: Any: The next message decoded from JSON, None once the WebSocket is closed.
+        """
+        message = self.receive(timeout)
+        return None if message is None else json.loads(message)
+
+    def send(self, message):
+        """
+        Sends a message, str as a text message and bytes as a binary one.
+        Raises: ConnectionError: If the WebSocket is closed.
+        """
+        if self.close_sent:
+            raise ConnectionError("WebSocket is closed")
+        self.__write(self._frame(message))
+
+    def send_json(self, value):
+        self.send(json.dumps(value))
+
+    def ping(self, data=b""):
+        self.__write(encode_frame(PING, data))
+
+    def close(self, code=NORMAL_CLOSURE, reason=""):
+        """
+        Starts the close handshake and waits, at most CLOSE_TIMEOUT seconds, for the close frame of the peer.
+        """
+        if not self.close_sent:
+            self.close_sent = True
+            self.__write_quietly(encode_frame(CLOSE, encode_close(code, reason)))
+        deadline = time.monotonic() + CLOSE_TIMEOUT
+        try:
+            while not self.closed and time.monotonic() < deadline:
+                self.receive(timeout=max(deadline - time.monotonic(), 0.01))
+        except OSError:
+            self.closed = True
+
+    def __iter__(self):
+        while True:
+            message = self.receive()
+            if message is None:
+                return
+            yield message
+
+
+class AsyncWebSocket(_Protocol):
+    """
+    A WebSocket served on the event loop thread of the app, given to async def handlers.
+    The connection is handed over to the loop after the handshake, so an open WebSocket holds no thread.
+    """
+
+    def __init__(self, reader, writer, request, subprotocol=None, max_message_size=DEFAULT_MAX_MESSAGE_SIZE,
+                 buffered=b""):
+        super().__init__(request, subprotocol, max_message_size, buffered)
+        self.reader = reader
+        self.writer = writer
+        self.__send_lock = asyncio.Lock()
+
+    async def __write(self, frame):
+        if frame is None:
+            return
+        async with self.__send_lock:
+            self.writer.write(frame)
+            await self.writer.drain()
+
+    async def __write_quietly(self, frame):
+        try:
+            await self.__write(frame)
+        except OSError:
+            pass
+
+    async def receive(self, timeout=None):
+        """
+        Waits for the next message, answering pings and close frames on the way.
+        Returns: str | bytes: The message, None once the WebSocket is closed.
+        Raises: asyncio.TimeoutError: If timeout seconds pass without a message.
+        """
+        while not self.closed:
+            try:
+                frame = self.parser.next_frame()
+                event = self._event(*frame) if frame is not None else None
+            except WebSocketError as error:
+                await self.__write_quietly(self._failed(error))
+                return None
+            if event is None:
+                try:
+                    data = await asyncio.wait_for(self.reader.read(65536), timeout)
+                except OSError:
+                    data = b""
+                if not data:
+                    self.closed = True
+                    self.close_code = ABNORMAL_CLOSURE
+                    return None
+                self.parser.feed(data)
+                continue
+            message, reply = event
+            await self.__write_quietly(reply)
+            if message is not _CONTROL:
+                return message
+        return None
+
+    async def receive_json(self, timeout=None):
+        message = await self.receive(timeout)
+        return None if message is None else json.loads(message)
+
+    async def send(self, message):
+        if self.close_sent:
+            raise ConnectionError("WebSocket is closed")
+        await self.__write(self._frame(message))
+
+    async def send_json(self, value):
+        await self.send(json.dumps(value))
+
+    async def ping(self, data=b""):
+        await self.__write(encode_frame(PING, data))
+
+    async def close(self, code=NORMAL_CLOSURE, reason=""):
+        if not self.close_sent:
+            self.close_sent = True
+            await self.__write_quietly(encode_frame(CLOSE, encode_close(code, reason)))
+        try:
+            while not self.closed:
+                await asyncio.wait_for(self.receive(), CLOSE_TIMEOUT)
+        except (asyncio.TimeoutError, OSError):
+            self.closed = True
+        self.writer.close()
+
+    def abort(self, code=GOING_AWAY):
+        """
+        Sends a close frame without waiting for the answer of the peer and closes the connection.
+        """
+        if not self.close_sent:
+            self.close_sent = True
+            self.writer.write(encode_frame(CLOSE, encode_close(code)))
+        self.closed = True
+        self.writer.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.receive()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class ASGIWebSocket:
+    """
+    The WebSocket of an ASGI websocket scope, with the API of AsyncWebSocket. The ASGI server does the framing.
+    """
+
+    def __init__(self, receive, send, request, subprotocol=None):
+        self.__receive = receive
+        self.__send = send
+        self.request = request
+        self.subprotocol = subprotocol
+        self.closed = False
+        self.close_code = None
+        self.close_reason = ""
+        self.close_sent = False
+
+    async def accept(self):
+        await self.__send({"type": "websocket.accept", "subprotocol": self.subprotocol})
+
+    async def receive(self, timeout=None):
+        while not self.closed:
+            event = await asyncio.wait_for(self.__receive(), timeout)
+            if event["type"] == "websocket.receive":
+                return event["text"] if event.get("text") is not None else event.get("bytes")
+            if event["type"] == "websocket.disconnect":
+                self.closed = True
+                self.close_code = event.get("code", NORMAL_CLOSURE)
+        return None
+
+    async def receive_json(self, timeout=None):
+        message = await self.receive(timeout)
+        return None if message is None else json.loads(message)
+
+    async def send(self, message):
+        if self.close_sent:
+            raise ConnectionError("WebSocket is closed")
+        if isinstance(message, str):
+            await self.__send({"type": "websocket.send", "text": message})
+        else:
+            await self.__send({"type": "websocket.send", "bytes": bytes(message)})
+
+    async def send_json(self, value):
+        await self.send(json.dumps(value))
+
+    async def ping(self, data=b""):
+        # ASGI servers keep the connection alive themselves
+        pass
+
+    async def close(self, code=NORMAL_CLOSURE, reason=""):
+        if not self.close_sent:
+            self.close_sent = True
+            await self.__send({"type": "websocket.close", "code": code, "reason": reason})
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.receive()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class BlockingWebSocket:
+    """
+    The blocking API of WebSocket over an AsyncWebSocket or ASGIWebSocket, for def handlers served by an event loop.
+    Calls are run on the loop and block the handler thread until they are done.
+    """
+
+    def __init__(self, websocket, loop):
+        self.websocket = websocket
+        self.loop = loop
+
+    def __run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def __getattr__(self, name):
+        # request, subprotocol, closed and close_code
+        return getattr(self.websocket, name)
+
+    def receive(self, timeout=None):
+        return self.__run(self.websocket.receive(timeout))
+
+    def receive_json(self, timeout=None):
+        return self.__run(self.websocket.receive_json(timeout))
+
+    def send(self, message):
+        self.__run(self.websocket.send(message))
+
+    def send_json(self, value):
+        self.__run(self.websocket.send_json(value))
+
+    def ping(self, data=b""):
+        self.__run(self.websocket.ping(data))
+
+    def close(self, code=NORMAL_CLOSURE, reason=""):
+        self.__run(self.websocket.close(code, reason))
+
+    def __iter__(self):
+        while True:
+            message = self.receive()
+            if message is None:
+                return
+            yield message
+
+
+class ThreadedWebSocket:
+    """
+    The API of AsyncWebSocket over a blocking WebSocket, for async def handlers on TLS connections.
+    An encrypted socket can not be handed over to the event loop, its blocking calls run in the executor of the loop.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+
+    @staticmethod
+    async def __call(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def __getattr__(self, name):
+        # request, subprotocol, closed and close_code
+        return getattr(self.websocket, name)
+
+    async def receive(self, timeout=None):
+        return await self.__call(self.websocket.receive, timeout)
+
+    async def receive_json(self, timeout=None):
+        return await self.__call(self.websocket.receive_json, timeout)
+
+    async def send(self, message):
+        await self.__call(self.websocket.send, message)
+
+    async def send_json(self, value):
+        await self.__call(self.websocket.send_json, value)
+
+    async def ping(self, data=b""):
+        await self.__call(self.websocket.ping, data)
+
+    async def close(self, code=NORMAL_CLOSURE, reason=""):
+        await self.__call(self.websocket.close, code, reason)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.receive()
+        if message is None:
+            raise StopAsyncIteration
+        return message
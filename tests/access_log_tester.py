@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+import unittest
+
+from src.rollasback.access_log import AccessLogger, DeferredQueueHandler, setup_app_logger
+from src.rollasback.app import RollAsBack
+
+
+class TestAccessLogger(unittest.TestCase):
+
+    def test_records_are_written_as_json_lines(self):
+        stream = io.StringIO()
+        access_log = AccessLogger(target=stream, capacity=10)
+        access_log.log("127.0.0.1", "GET", "/user/1?x=1", "/user/{user_id}", 200, 120, 0.0015)
+        access_log.log("127.0.0.1", "GET", "/missing", None, 404, 80, 0.0002)
+        access_log.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["route"], "/user/{user_id}")
+        self.assertEqual(records[0]["bytes"], 120)
+        self.assertEqual(records[0]["duration_ms"], 1.5)
+        self.assertIsNone(records[1]["route"])
+        self.assertEqual(records[1]["status"], 404)
+
+    def test_sampling_and_level_filtering(self):
+        stream = io.StringIO()
+        access_log = AccessLogger(target=stream, sample_rate=0.0)
+        access_log.log("127.0.0.1", "GET", "/ok", "/ok", 200, 10, 0.001)
+        access_log.log("127.0.0.1", "GET", "/error", "/error", 500, 10, 0.001)
+        access_log.close()
+        self.assertEqual([json.loads(line)["status"] for line in stream.getvalue().splitlines()], [500])
+
+        stream = io.StringIO()
+        access_log = AccessLogger(target=stream, level=logging.WARNING)
+        access_log.log("127.0.0.1", "GET", "/ok", "/ok", 200, 10, 0.001)
+        access_log.log("127.0.0.1", "GET", "/gone", "/gone", 410, 10, 0.001)
+        access_log.close()
+        self.assertEqual([json.loads(line)["status"] for line in stream.getvalue().splitlines()], [410])
+
+
+    def test_logger_is_not_registered_and_propagation_is_opt_in(self):
+        access_log = AccessLogger(target=io.StringIO())
+        access_log.close()
+        self.assertNotIn(access_log.logger, logging.Logger.manager.loggerDict.values())
+        self.assertIsNone(access_log.logger.parent)
+
+        access_log = AccessLogger(target=io.StringIO(), propagate=True)
+        with self.assertLogs("rollasback.access", "WARNING") as captured:
+            access_log.log("127.0.0.1", "GET", "/missing", None, 404, 80, 0.0002)
+        access_log.close()
+        self.assertEqual(captured.records[0].status, 404)
+
+
+class TestAppLogger(unittest.TestCase):
+
+    def test_records_reach_the_root_handlers(self):
+        with self.assertLogs(level="WARNING") as captured:
+            setup_app_logger().warning("disk almost full")
+        self.assertEqual(captured.output, ["WARNING:rollasback:disk almost full"])
+
+    def test_apps_share_a_single_handler(self):
+        RollAsBack("First")
+        RollAsBack("Second")
+        handlers = [handler for handler in setup_app_logger().handlers if isinstance(handler, DeferredQueueHandler)]
+        self.assertEqual(len(handlers), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
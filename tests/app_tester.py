@@ -0,0 +1,71 @@
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+
+
+class TestMiddlewarePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+        self.calls = []
+
+        @self.app.endpoint("/hello")
+        def hello(request):
+            self.calls.append("handler")
+            return HttpResponse("Hello", response_headers={}, status=200)
+
+    def test_pipeline_without_hooks_is_the_router(self):
+        client = self.app.test_client()
+        self.assertEqual(client.get("/hello").status, 200)
+        self.assertEqual(client.get("/missing").status, 404)
+
+    def test_hooks_run_in_order(self):
+        @self.app.before_request
+        def before(request):
+            self.calls.append("before")
+
+        @self.app.middleware
+        def outer(request, call_next):
+            self.calls.append("outer")
+            return call_next(request)
+
+        @self.app.middleware
+        def inner(request, call_next):
+            self.calls.append("inner")
+            return call_next(request)
+
+        @self.app.after_request
+        def after(request, response):
+            self.calls.append("after")
+            response.response_headers["X-After"] = "1"
+
+        response = self.app.test_client().get("/hello")
+        self.assertEqual(self.calls, ["before", "outer", "inner", "handler", "after"])
+        self.assertEqual(response.headers["X-After"], "1")
+
+    def test_middleware_short_circuit(self):
+        @self.app.middleware
+        def deny(request, call_next):
+            return HttpResponse("Forbidden", response_headers={}, status=403)
+
+        @self.app.after_request
+        def replace(request, response):
+            self.calls.append(response.status)
+
+        response = self.app.test_client().get("/hello")
+        self.assertEqual(response.status, 403)
+        self.assertEqual(self.calls, [403])
+
+    def test_before_request_short_circuit(self):
+        @self.app.before_request
+        def deny(request):
+            return HttpResponse("Unauthorized", response_headers={}, status=401)
+
+        response = self.app.test_client().get("/hello")
+        self.assertEqual(response.status, 401)
+        self.assertNotIn("handler", self.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import socket
+import threading
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.background import BackgroundTaskPool
+from src.rollasback.http_response import HttpResponse
+from tests.helpers import serve
+
+
+class TestBackgroundTaskPool(unittest.TestCase):
+
+    def test_tasks_run_and_drain(self):
+        pool = BackgroundTaskPool(workers=2)
+        done = []
+        for i in range(5):
+            pool.submit(done.append, i)
+        with self.assertLogs("rollasback", "ERROR"):
+            pool.submit(lambda: 1 / 0)
+            self.assertTrue(pool.drain(timeout=5))
+        self.assertEqual(sorted(done), [0, 1, 2, 3, 4])
+        self.assertEqual(pool.stats(), {"queued": 0, "running": 0, "completed": 5, "failed": 1, "inline": 0})
+        self.assertFalse(pool.submit(done.append, 5))
+        self.assertEqual(done[-1], 5)
+        with self.assertLogs("rollasback", "ERROR"):
+            self.assertFalse(pool.submit(lambda: 1 / 0))
+        self.assertEqual(pool.stats(), {"queued": 0, "running": 0, "completed": 5, "failed": 2, "inline": 1})
+
+    def test_full_queue_runs_inline(self):
+        pool = BackgroundTaskPool(workers=1, max_queue=1)
+        release = threading.Event()
+        pool.submit(release.wait)
+        time.sleep(0.05)
+        pool.submit(release.wait)
+        caller = []
+        self.assertFalse(pool.submit(lambda: caller.append(threading.current_thread())))
+        self.assertEqual(caller, [threading.current_thread()])
+        self.assertIn('rollasback_background_tasks_total{outcome="inline"} 1', pool.render())
+        release.set()
+        self.assertTrue(pool.drain(timeout=5))
+
+
+class TestBackgroundTasksOnServer(unittest.TestCase):
+
+    def test_response_is_sent_before_the_task_runs(self):
+        app = RollAsBack("TestApp")
+        finished = threading.Event()
+
+        @app.endpoint("/signup")
+        def signup(request):
+            request.add_background_task(lambda: (time.sleep(0.3), finished.set()))
+            return HttpResponse("ok", response_headers={})
+
+        serve(app)
+        try:
+            with socket.create_connection(app.server_address) as client:
+                client.sendall(b"GET /signup HTTP/1.1\r\nConnection: close\r\n\r\n")
+                self.assertTrue(client.recv(65536).startswith(b"HTTP/1.1 200"))
+                self.assertFalse(finished.is_set())
+            self.assertTrue(finished.wait(5))
+        finally:
+            app.stop_server()
+
+    def test_test_client_runs_tasks_before_returning(self):
+        app = RollAsBack("TestApp")
+        sent = []
+
+        @app.endpoint("/signup")
+        def signup(request):
+            request.add_background_task(sent.append, "welcome mail")
+            return HttpResponse("ok", response_headers={})
+
+        self.assertEqual(app.test_client().get("/signup").status, 200)
+        self.assertEqual(sent, ["welcome mail"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from src.rollasback.bench import LatencyHistogram, load_mix, read_response
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles_keep_relative_precision(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        self.assertEqual(histogram.total, 10000)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 10000)
+        for percentile, expected in ((50, 5000), (99, 9900), (100, 10000)):
+            self.assertAlmostEqual(histogram.percentile(percentile), expected, delta=expected * 0.01)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(100)
+        second.record(300)
+        first.merge(second)
+        self.assertEqual((first.total, first.min, first.max), (2, 100, 300))
+
+
+class TestRequestMix(unittest.TestCase):
+
+    def test_weights_and_json_lines(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write("# comment\n3 GET /hello\n\n{\"method\": \"POST\", \"path\": \"/api\", \"body\": {\"a\": 1}}\n")
+        try:
+            requests = load_mix(file.name, "127.0.0.1:8000", keep_alive=True)
+        finally:
+            os.remove(file.name)
+        self.assertEqual(len(requests), 4)
+        self.assertTrue(requests[0].startswith(b"GET /hello HTTP/1.1\r\n"))
+        self.assertIn(b"Connection: keep-alive\r\n", requests[0])
+        self.assertTrue(requests[3].endswith(b"Content-Length: 8\r\n\r\n{\"a\": 1}"))
+
+
+class TestReadResponse(unittest.TestCase):
+
+    def read(self, data, head_request=False):
+        server, client = socket.socketpair()
+        with server, client:
+            client.settimeout(1)
+            server.sendall(data)
+            return read_response(client, b"", head_request)
+
+    def test_chunked_body_keeps_the_connection(self):
+        response = (b"HTTP/1.1 200 OK\r\nConnection: keep-alive\r\nTransfer-Encoding: chunked\r\n\r\n"
+                    b"5\r\nhello\r\n6;x=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n")
+        status, size, keep_alive, leftover = self.read(response + b"HTTP/1.1 204")
+        self.assertEqual((status, size, keep_alive, leftover), (200, len(response), True, b"HTTP/1.1 204"))
+
+    def test_responses_without_body(self):
+        interim = b"HTTP/1.1 100 Continue\r\n\r\n"
+        for data, head_request, status in ((b"HTTP/1.1 204 No Content\r\nConnection: keep-alive\r\n\r\n", False, 204),
+                                           (b"HTTP/1.1 304 Not Modified\r\nConnection: keep-alive\r\n\r\n", False, 304),
+                                           (b"HTTP/1.1 200 OK\r\nConnection: keep-alive\r\nContent-Length: 5\r\n\r\n",
+                                            True, 200)):
+            self.assertEqual(self.read(interim + data, head_request), (status, len(interim + data), True, b""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import http.client
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.client import CircuitOpenError, UpstreamClient, UpstreamError
+from tests.helpers import serve
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        if self.path.endswith("/stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (b"one,", b"two,", b"three"):
+                self.wfile.write(b"%x\r\n%b\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        body = f"{self.path} {self.headers.get('X-Forwarded-For')}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+
+    def handle_error(self, request, client_address):
+        # The timeout test hangs up before the slow response is written
+        pass
+
+
+class TestUpstreamClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubServer(("127.0.0.1", 0), StubHandler)
+        cls.base = f"http://127.0.0.1:{cls.stub.server_address[1]}"
+        threading.Thread(target=cls.stub.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.shutdown()
+        cls.stub.server_close()
+
+    def test_connections_are_reused(self):
+        client = UpstreamClient()
+        for i in range(3):
+            self.assertEqual(client.get(f"{self.base}/item/{i}").text, f"/item/{i} None")
+        self.assertEqual(client.post(f"{self.base}/echo", body="hello").read(), b"hello")
+        stats = client.stats()[self.base[len("http://"):]]
+        self.assertEqual(stats["connections_created"], 1)
+        self.assertEqual(stats["success"], 4)
+        self.assertEqual(stats["idle"], 1)
+        client.close()
+
+    def test_read_timeout_and_circuit_breaker(self):
+        client = UpstreamClient(read_timeout=0.1, retries=1, backoff=0, breaker_threshold=2, breaker_reset=60)
+        with self.assertRaises(UpstreamError) as context:
+            client.get(f"{self.base}/slow")
+        self.assertEqual(context.exception.status, 504)
+        with self.assertRaises(CircuitOpenError):
+            client.get(f"{self.base}/item/1")
+        self.assertIn('rollasback_upstream_circuit_open{host="127.0.0.1:', client.render())
+        client.close()
+
+    def test_connection_errors_are_retried(self):
+        client = UpstreamClient(retries=2, backoff=0)
+        with self.assertRaises(UpstreamError) as context:
+            client.get("http://127.0.0.1:9/unreachable")
+        self.assertEqual(context.exception.status, 502)
+        self.assertEqual(client.stats()["127.0.0.1:9"]["retries"], 2)
+
+    def test_proxy_streams_the_upstream_response(self):
+        app = RollAsBack("ProxyApp")
+        upstream = app.enable_http_client()
+        base = self.base
+
+        @app.endpoint("/api/{path}")
+        def proxy(request):
+            return upstream.proxy(request, base)
+
+        serve(app)
+        try:
+            connection = http.client.HTTPConnection(*app.server_address, timeout=5)
+            connection.request("GET", "/api/stream")
+            response = connection.getresponse()
+            self.assertEqual(response.getheader("Transfer-Encoding"), "chunked")
+            self.assertEqual(response.read(), b"one,two,three")
+            connection.request("GET", "/api/item?x=1")
+            response = connection.getresponse()
+            self.assertEqual(response.read(), b"/api/item?x=1 127.0.0.1")
+            connection.close()
+            self.assertEqual(upstream.stats()[base[len("http://"):]]["connections_created"], 1)
+        finally:
+            app.stop_server()
+
+
+if __name__ == '__main__':
+    unittest.main()
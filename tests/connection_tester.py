@@ -0,0 +1,243 @@
+import json
+import socket
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.connection import ConnectionLimits, RequestReadError, parse_head
+from src.rollasback.http_response import HttpResponse
+from tests.helpers import read_all, serve
+
+
+def start_app(**limit_options):
+    app = RollAsBack("TestApp")
+
+    @app.endpoint("/echo")
+    def echo(request):
+        return HttpResponse({"body": request.body}, response_headers={})
+
+    @app.endpoint("/whoami")
+    def whoami(request):
+        return HttpResponse({"user": request.headers.get_all("X-User"), "body": request.body}, response_headers={})
+
+    @app.endpoint("/small", max_body_size=4)
+    def small(request):
+        return HttpResponse(request.body, response_headers={})
+
+    serve(app, **limit_options)
+    return app
+
+
+class TestParseHead(unittest.TestCase):
+
+    def test_header_limits(self):
+        limits = ConnectionLimits(max_header_count=2, max_line_length=40)
+        head = parse_head(b"GET / HTTP/1.1\r\nHost: a\r\nConnection: close\r\n\r\n", limits)
+        self.assertEqual(head.headers, {"host": "a", "connection": "close"})
+        self.assertFalse(head.keep_alive)
+
+        with self.assertRaises(RequestReadError) as context:
+            parse_head(b"GET / HTTP/1.1\r\nA: 1\r\nB: 2\r\nC: 3\r\n\r\n", limits)
+        self.assertEqual(context.exception.status, 431)
+        with self.assertRaises(RequestReadError) as context:
+            parse_head(b"GET / HTTP/1.1\r\nA: " + b"x" * 50 + b"\r\n\r\n", limits)
+        self.assertEqual(context.exception.status, 431)
+        with self.assertRaises(RequestReadError) as context:
+            parse_head(b"GARBAGE\r\n\r\n", limits)
+        self.assertEqual(context.exception.status, 400)
+
+    def test_empty_line_ends_the_head(self):
+        head = parse_head(b"GET / HTTP/1.1\nHost: a\n\nX-Evil: 1\r\n\r\n", ConnectionLimits())
+        self.assertEqual(head.fields, [("Host", "a")])
+
+    def test_invalid_content_length(self):
+        for value in ("-1", "1e3", "\u00b2", "\u00b9"):
+            head = parse_head(f"POST / HTTP/1.1\r\nContent-Length: {value}\r\n\r\n".encode("latin-1"),
+                              ConnectionLimits())
+            with self.assertRaises(RequestReadError):
+                head.content_length
+
+    def test_repeated_singleton_fields(self):
+        for field in ("Host: a\r\nhost: b", "Content-Length: 5\r\nContent-Length: 0"):
+            with self.assertRaises(RequestReadError) as context:
+                parse_head(f"POST / HTTP/1.1\r\n{field}\r\n\r\n".encode(), ConnectionLimits())
+            self.assertEqual(context.exception.status, 400)
+        head = parse_head(b"GET / HTTP/1.1\r\nAccept: a\r\nAccept: b\r\n\r\n", ConnectionLimits())
+        self.assertEqual(head.headers["accept"], "a")
+        self.assertEqual(head.fields, [("Accept", "a"), ("Accept", "b")])
+
+
+class TestServerConnections(unittest.TestCase):
+
+    def setUp(self):
+        self.app = start_app(header_timeout=0.3, idle_timeout=0.3, max_connections=2)
+        self.address = self.app.server_address
+
+    def tearDown(self):
+        self.app.stop_server()
+
+    def test_keep_alive_and_body(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"POST /echo HTTP/1.1\r\nContent-Type: text/plain\r\nContent-Length: 5\r\n\r\nhel")
+            time.sleep(0.05)
+            client.sendall(b"lo")
+            first = client.recv(65536)
+            self.assertIn(b"Connection: keep-alive", first)
+            self.assertTrue(first.endswith(b'{"body": "hello"}'))
+            client.sendall(b"GET /echo HTTP/1.1\r\nConnection: close\r\n\r\n")
+            second = read_all(client)
+            self.assertTrue(second.startswith(b"HTTP/1.1 200"))
+            self.assertIn(b"Connection: close", second)
+
+    def test_body_lines_are_not_headers(self):
+        body = b'{\n"name": "bob",\nX-User: admin\n}'
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"POST /whoami HTTP/1.1\r\nX-User: bob\r\nContent-Type: text/plain\r\n"
+                           b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body))
+            response = read_all(client)
+        self.assertEqual(json.loads(response.partition(b"\r\n\r\n")[2]), {"user": ["bob"], "body": body.decode()})
+
+    def test_head_ends_at_the_first_empty_line(self):
+        for head in (b"POST /whoami HTTP/1.1\nX-User: bob\nContent-Length: 13\n\n",
+                     b"POST /whoami HTTP/1.1\r\nX-User: bob\r\nContent-Length: 13\r\n\n"):
+            with socket.create_connection(self.address) as client:
+                client.sendall(head + b"X-User: x\r\n\r\nGET /whoami HTTP/1.1\r\nConnection: close\r\n\r\n")
+                response = read_all(client)
+            self.assertEqual(json.loads(response.partition(b"\r\n\r\n")[2].partition(b"HTTP/1.1")[0]),
+                             {"user": ["bob"], "body": "X-User: x\r\n\r\n"})
+
+    def test_head_response_has_no_body(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"HEAD /echo HTTP/1.1\r\n\r\nGET /echo HTTP/1.1\r\nConnection: close\r\n\r\n")
+            response = read_all(client)
+        head, _, rest = response.partition(b"\r\n\r\n")
+        self.assertIn(b"Content-Length: 14\r\n", head + b"\r\n")
+        self.assertTrue(rest.startswith(b"HTTP/1.1 200"))
+        self.assertTrue(rest.endswith(b'{"body": null}'))
+
+    def test_non_ascii_content_length_gets_400(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"POST /echo HTTP/1.1\r\nContent-Length: \xb2\r\n\r\n")
+            self.assertTrue(read_all(client).startswith(b"HTTP/1.1 400"))
+
+    def test_repeated_content_length_gets_400(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"POST /echo HTTP/1.1\r\nContent-Length: 0\r\nContent-Length: 5\r\n\r\nhello")
+            self.assertTrue(read_all(client).startswith(b"HTTP/1.1 400"))
+
+    def test_slow_header_gets_408(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"GET /echo HTTP/1.1\r\nHo")
+            self.assertTrue(read_all(client).startswith(b"HTTP/1.1 408"))
+
+    def test_silent_client_is_disconnected(self):
+        with socket.create_connection(self.address) as client:
+            client.settimeout(2)
+            self.assertEqual(read_all(client), b"")
+
+    def test_connections_over_the_cap_get_503(self):
+        idle = [socket.create_connection(self.address) for _ in range(2)]
+        try:
+            time.sleep(0.05)
+            with socket.create_connection(self.address) as client:
+                self.assertTrue(read_all(client).startswith(b"HTTP/1.1 503"))
+        finally:
+            for client in idle:
+                client.close()
+
+    def test_too_many_headers_gets_431(self):
+        headers = b"".join(b"X-%d: 1\r\n" % i for i in range(200))
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"GET /echo HTTP/1.1\r\n" + headers + b"\r\n")
+            self.assertTrue(read_all(client).startswith(b"HTTP/1.1 431"))
+
+
+class TestRequestBodyLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.app = start_app(max_body_size=16)
+        self.address = self.app.server_address
+
+    def tearDown(self):
+        self.app.stop_server()
+
+    def test_oversized_body_gets_413_before_it_is_sent(self):
+        for path, size in (("/echo", 17), ("/small", 5)):
+            with socket.create_connection(self.address) as client:
+                client.sendall(b"POST %s HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (path.encode(), size))
+                self.assertTrue(read_all(client).startswith(b"HTTP/1.1 413"))
+
+    def test_expect_continue(self):
+        with socket.create_connection(self.address) as client:
+            client.sendall(b"POST /small HTTP/1.1\r\nContent-Length: 4\r\nExpect: 100-continue\r\n"
+                           b"Connection: close\r\n\r\n")
+            self.assertEqual(client.recv(65536), b"HTTP/1.1 100 Continue\r\n\r\n")
+            client.sendall(b"ping")
+            response = read_all(client)
+            self.assertTrue(response.startswith(b"HTTP/1.1 200"))
+            self.assertTrue(response.endswith(b"ping"))
+
+    def test_rejected_expectations_get_no_continue(self):
+        cases = ((b"/small", b"Content-Length: 5\r\nExpect: 100-continue", b"HTTP/1.1 413"),
+                 (b"/small", b"Content-Length: 1\r\nExpect: something-else", b"HTTP/1.1 417"))
+        for path, headers, status in cases:
+            with socket.create_connection(self.address) as client:
+                client.sendall(b"POST " + path + b" HTTP/1.1\r\n" + headers + b"\r\n\r\n")
+                self.assertTrue(read_all(client).startswith(status))
+
+
+class TestExpectWithoutRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+        self.app.redirects({"/old": "/new"})
+
+        @self.app.middleware
+        def upload(request, call_next):
+            if request.path == "/upload":
+                return HttpResponse(f"got {request.raw_body.decode()}", response_headers={})
+            return call_next(request)
+
+        serve(self.app)
+        self.addCleanup(self.app.stop_server)
+
+    def test_dispatch_answers_after_continue(self):
+        for path, status in ((b"/old", b"HTTP/1.1 301"), (b"/upload", b"HTTP/1.1 200"), (b"/missing", b"HTTP/1.1 404")):
+            with socket.create_connection(self.app.server_address) as client:
+                client.sendall(b"POST " + path + b" HTTP/1.1\r\nContent-Length: 4\r\nExpect: 100-continue\r\n"
+                               b"Connection: close\r\n\r\n")
+                self.assertEqual(client.recv(65536), b"HTTP/1.1 100 Continue\r\n\r\n")
+                client.sendall(b"ping")
+                response = read_all(client)
+            self.assertTrue(response.startswith(status), path)
+            if path == b"/upload":
+                self.assertTrue(response.endswith(b"got ping"))
+
+
+class TestExpectWithoutHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.app = start_app()
+        self.app.redirects({"/old": "/echo"})
+        self.addCleanup(self.app.stop_server)
+
+    def test_answered_without_continue(self):
+        for path, status in ((b"/old", b"HTTP/1.1 301"), (b"/missing", b"HTTP/1.1 404")):
+            with socket.create_connection(self.app.server_address) as client:
+                client.sendall(b"POST " + path + b" HTTP/1.1\r\nContent-Length: 4\r\nExpect: 100-continue\r\n\r\n")
+                response = read_all(client)
+            self.assertTrue(response.startswith(status), path)
+            self.assertNotIn(b"100 Continue", response)
+            self.assertIn(b"Connection: close", response)
+
+    def test_routed_path_gets_continue(self):
+        with socket.create_connection(self.app.server_address) as client:
+            client.sendall(b"POST /echo HTTP/1.1\r\nContent-Length: 4\r\nExpect: 100-continue\r\n"
+                           b"Connection: close\r\n\r\n")
+            self.assertEqual(client.recv(65536), b"HTTP/1.1 100 Continue\r\n\r\n")
+            client.sendall(b"ping")
+            self.assertTrue(read_all(client).endswith(b'{"body": "ping"}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.event_loop import EventLoopThread
+from src.rollasback.http_response import HttpResponse
+
+
+class TestAsyncHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+
+        @self.app.endpoint("/fan-out/{count}")
+        async def fan_out(request):
+            async def backend(i):
+                await asyncio.sleep(0.2)
+                return i
+
+            results = await asyncio.gather(*(backend(i) for i in range(int(request.path_params[0]))))
+            return HttpResponse({"results": results}, response_headers={})
+
+        @self.app.endpoint("/broken")
+        async def broken(request):
+            raise ValueError("boom")
+
+    def tearDown(self):
+        self.app.event_loop.stop()
+
+    def test_awaits_overlap_within_a_request(self):
+        self.assertTrue(self.app.routes[0].is_async)
+        client = self.app.test_client()
+        start = time.perf_counter()
+        response = client.get("/fan-out/5")
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(response.json(), {"results": [0, 1, 2, 3, 4]})
+
+    def test_errors_are_raised_on_the_calling_thread(self):
+        with self.assertRaises(ValueError):
+            self.app.test_client().get("/broken")
+        self.assertEqual(self.app.test_client(raise_server_exceptions=False).get("/broken").status, 500)
+
+
+class TestEventLoopThread(unittest.TestCase):
+
+    def test_stop_cancels_pending_tasks(self):
+        loop_thread = EventLoopThread()
+        self.assertEqual(loop_thread.run(asyncio.sleep(0, result=1)), 1)
+        pending = asyncio.run_coroutine_threadsafe(asyncio.sleep(60), loop_thread.loop)
+        loop_thread.stop()
+        self.assertTrue(pending.cancelled())
+        self.assertTrue(loop_thread.loop.is_closed())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import unittest
+from wsgiref.util import setup_testing_defaults
+from wsgiref.validate import validator
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+
+
+def make_app():
+    app = RollAsBack("GatewayApp")
+
+    @app.endpoint("/user/{user_id}")
+    def user(request):
+        return HttpResponse({"id": request.path_params[0], "page": request.query_params.get("page"),
+                             "body": request.body, "token": request.headers.get("X-Token")},
+                            response_headers={"X-Handled": "yes"}, mimetype="application/json")
+
+    @app.endpoint("/broken")
+    def broken(request):
+        raise RuntimeError("boom")
+
+    return app
+
+
+class TestWsgi(unittest.TestCase):
+
+    def call(self, app, environ):
+        environ.setdefault("SCRIPT_NAME", "")
+        environ.setdefault("QUERY_STRING", "")
+        setup_testing_defaults(environ)
+        result = {}
+
+        def start_response(status, headers, exc_info=None):
+            result["status"] = status
+            result["headers"] = dict(headers)
+            return lambda data: None
+
+        iterable = validator(app.wsgi_app)(environ, start_response)
+        body = b"".join(iterable)
+        iterable.close()
+        return result["status"], result["headers"], body
+
+    def test_request_and_response(self):
+        payload = b'{"name": "ada"}'
+        status, headers, body = self.call(make_app(), {
+            "REQUEST_METHOD": "POST", "PATH_INFO": "/user/42", "QUERY_STRING": "page=2",
+            "CONTENT_TYPE": "application/json", "CONTENT_LENGTH": str(len(payload)),
+            "HTTP_X_TOKEN": "secret", "wsgi.input": io.BytesIO(payload),
+        })
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(headers["X-Handled"], "yes")
+        self.assertEqual(headers["Content-Length"], str(len(body)))
+        self.assertNotIn("Connection", headers)
+        self.assertEqual(body, b'{"id": "42", "page": ["2"], "body": {"name": "ada"}, "token": "secret"}')
+
+    def test_errors(self):
+        app = make_app()
+        self.assertEqual(self.call(app, {"PATH_INFO": "/missing"})[0], "404 Not Found")
+        with self.assertLogs("rollasback", "ERROR"):
+            self.assertEqual(self.call(app, {"PATH_INFO": "/broken"})[0], "500 Internal Server Error")
+
+
+class TestAsgi(unittest.TestCase):
+
+    def call(self, app, scope, body_chunks):
+        messages = [{"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1}
+                    for i, chunk in enumerate(body_chunks)]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(app.asgi(scope, receive, send))
+        return sent
+
+    def test_request_and_response(self):
+        scope = {"type": "http", "method": "POST", "path": "/user/7", "raw_path": b"/user/7",
+                 "query_string": b"page=1", "http_version": "1.1", "client": ["127.0.0.1", 5000],
+                 "headers": [(b"content-type", b"application/json"), (b"x-token", b"secret")]}
+        sent = self.call(make_app(), scope, [b'{"name": ', b'"ada"}'])
+        self.assertEqual(sent[0]["type"], "http.response.start")
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"x-handled", b"yes"), sent[0]["headers"])
+        body = b"".join(message["body"] for message in sent[1:])
+        self.assertEqual(body, b'{"id": "7", "page": ["1"], "body": {"name": "ada"}, "token": "secret"}')
+        self.assertFalse(sent[-1]["more_body"])
+
+    def test_lifespan(self):
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(make_app().asgi({"type": "lifespan"}, receive, send))
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.cookie import Cookie
+from src.rollasback.headers import Headers
+from src.rollasback.http_request import HttpRequest
+from src.rollasback.http_response import HttpResponse
+
+
+class TestHeaders(unittest.TestCase):
+
+    def test_case_insensitive_lookup(self):
+        headers = Headers({"Content-Type": "text/plain"})
+        self.assertEqual(headers["content-type"], "text/plain")
+        self.assertIn("CONTENT-TYPE", headers)
+        self.assertNotIn("Host", headers)
+        self.assertIsNone(headers.get("host"))
+        self.assertEqual(headers, {"content-type": "text/plain"})
+
+    def test_repeated_fields(self):
+        headers = Headers()
+        headers.add("Set-Cookie", "a=1")
+        headers.add("set-cookie", "b=2")
+        headers["Server"] = "one"
+        self.assertEqual(headers.get_all("Set-Cookie"), ["a=1", "b=2"])
+        self.assertEqual(headers["Set-Cookie"], "a=1")
+        self.assertEqual(headers.get("SET-COOKIE"), "a=1")
+        self.assertEqual(len(headers), 2)
+        self.assertEqual(list(headers), ["Set-Cookie", "Server"])
+        # Assignment replaces every field of the name
+        headers["SET-COOKIE"] = "c=3"
+        self.assertEqual(headers.get_all("set-cookie"), ["c=3"])
+        del headers["server"]
+        self.assertEqual(headers.items(), [("SET-COOKIE", "c=3")])
+        with self.assertRaises(KeyError):
+            del headers["Server"]
+
+    def test_to_bytes(self):
+        headers = Headers([("X-A", 1), ("X-A", "2")])
+        self.assertEqual(headers.to_bytes(), b"X-A: 1\r\nX-A: 2\r\n")
+        headers.add("X-B", "3")
+        self.assertEqual(bytes(headers), b"X-A: 1\r\nX-A: 2\r\nX-B: 3\r\n")
+        self.assertEqual(Headers().to_bytes(), b"")
+
+    def test_request_headers_keep_their_case(self):
+        request = HttpRequest("POST /data HTTP/1.1\r\ncontent-type: application/json\r\nAccept: a\r\n"
+                              "Accept: b\r\n\r\n{'key': 'value'}")
+        self.assertEqual(request.body, {"key": "value"})
+        self.assertEqual(request.headers.get_all("accept"), ["a", "b"])
+        self.assertEqual(request.headers["Accept"], "a")
+        self.assertIn("content-type: application/json\r\n", str(request))
+
+
+class TestResponseHeaders(unittest.TestCase):
+
+    def test_repeated_set_cookie(self):
+        app = RollAsBack("TestApp")
+
+        @app.endpoint("/login")
+        def login(request):
+            response = HttpResponse("ok", response_headers={"X-Trace": "1"})
+            response.set_cookie(Cookie("session", "abc", expires="", path="/", domain=""))
+            response.set_cookie(Cookie("theme", "dark", expires="", path="/", domain=""))
+            return response
+
+        response = app.test_client().get("/login")
+        self.assertEqual(len(response.headers.get_all("Set-Cookie")), 2)
+        self.assertEqual(response.headers["x-trace"], "1")
+        self.assertIn(b"\r\nX-Trace: 1\r\n", response.raw)
+
+    def test_default_fields_are_sent_once(self):
+        data = bytes(HttpResponse("ok", response_headers={}))
+        self.assertEqual(data.count(b"\r\nServer: "), 1)
+        self.assertEqual(data.count(b"\r\nAccept-Ranges: bytes\r\n"), 1)
+        data = bytes(HttpResponse("ok", response_headers=Headers([("server", "edge")])))
+        self.assertEqual(data.lower().count(b"\r\nserver: "), 1)
+        self.assertIn(b"\r\nserver: edge\r\n", data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import socket
+import threading
+import time
+
+from src.rollasback.http_request import HttpRequest
+
+
+def make_request(path, method="GET", headers=""):
+    """
+    Builds a request for tests calling a handler or a wrapper directly, headers are extra "Name: value\\r\\n" lines.
+    """
+    return HttpRequest(f"{method} {path} HTTP/1.1\r\nHost: example.com\r\n{headers}\r\n")
+
+
+def serve(app, address=("127.0.0.1", 0), **options):
+    """
+    Starts the built-in server of an app on a daemon thread and waits until it listens.
+    :param app: The RollAsBack app to serve.
+    :param address: Host and port, a free port by default. None for a Unix socket or an inherited one.
+    :param options: Further keyword arguments of start_server.
+    :return: The server thread.
+    """
+    thread = threading.Thread(target=app.start_server, args=address or (), kwargs=options, daemon=True)
+    thread.start()
+    while app.server_address is None:
+        time.sleep(0.01)
+    return thread
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def read_all(client):
+    """
+    :return: Everything the peer sends until it closes the connection, as bytes.
+    """
+    data = b""
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+def get(address, path, headers=""):
+    """
+    Sends a GET on a new connection that the server closes after the response.
+    :param address: Host and port, or the path of a Unix socket.
+    :param path: The request target.
+    :param headers: Extra "Name: value\\r\\n" lines.
+    :return: The raw response, as bytes.
+    """
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family) as client:
+        client.settimeout(5)
+        client.connect(address)
+        client.sendall(f"GET {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n{headers}\r\n".encode())
+        return read_all(client)
+
+
+def response_headers(data):
+    """
+    :return: The header fields of a raw response, as a dict.
+    """
+    head = data.partition(b"\r\n\r\n")[0].decode("latin-1")
+    return dict(line.split(": ", 1) for line in head.split("\r\n")[1:])
@@ -0,0 +1,230 @@
+import base64
+import socket
+import struct
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.hpack import Decoder, Encoder, HeaderListTooLarge, huffman_decode, huffman_encode
+from src.rollasback.http2 import (ACK, DATA, END_HEADERS, END_STREAM, HEADERS, PREFACE, RST_STREAM, SETTINGS,
+                                  SETTINGS_INITIAL_WINDOW_SIZE, SETTINGS_MAX_CONCURRENT_STREAMS, WINDOW_UPDATE,
+                                  encode_frame, encode_settings)
+from src.rollasback.http_response import HttpResponse
+from tests.helpers import get, serve
+
+BIG_BODY = "x" * 100000
+
+
+def start_app():
+    app = RollAsBack("TestApp")
+
+    @app.endpoint("/slow")
+    def slow(request):
+        time.sleep(0.5)
+        return HttpResponse("slow", response_headers={})
+
+    @app.endpoint("/fast")
+    def fast(request):
+        return HttpResponse(f"fast {request.http_version}", response_headers={})
+
+    @app.endpoint("/echo", max_body_size=1000)
+    def echo(request):
+        return HttpResponse(f"{request.raw_body.decode()}|{request.headers.get('Cookie')}", response_headers={})
+
+    @app.endpoint("/big")
+    def big(request):
+        return HttpResponse(BIG_BODY, response_headers={})
+
+    serve(app, handle_signals=False, http2=True)
+    return app
+
+
+class Client:
+
+    def __init__(self, address, settings=None, upgrade_path=None):
+        self.socket = socket.create_connection(address, timeout=5)
+        self.encoder = Encoder()
+        self.decoder = Decoder()
+        self.buffer = b""
+        self.settings = {}
+        if upgrade_path is not None:
+            token = base64.urlsafe_b64encode(encode_settings(settings or {})).rstrip(b"=").decode()
+            self.socket.sendall(f"GET {upgrade_path} HTTP/1.1\r\nHost: test\r\nConnection: Upgrade, HTTP2-Settings\r\n"
+                                f"Upgrade: h2c\r\nHTTP2-Settings: {token}\r\n\r\n".encode())
+            while b"\r\n\r\n" not in self.buffer:
+                self.buffer += self.socket.recv(65536)
+            self.head, _, self.buffer = self.buffer.partition(b"\r\n\r\n")
+        self.socket.sendall(PREFACE + encode_frame(SETTINGS, 0, 0, encode_settings(settings or {})))
+
+    def request(self, stream_id, method, path, body=b"", headers=()):
+        fields = [(":method", method), (":scheme", "http"), (":path", path), (":authority", "test")] + list(headers)
+        flags = END_HEADERS | (0 if body else END_STREAM)
+        frames = encode_frame(HEADERS, flags, stream_id, self.encoder.encode(fields))
+        if body:
+            frames += encode_frame(DATA, END_STREAM, stream_id, body)
+        self.socket.sendall(frames)
+
+    def __read(self, size):
+        while len(self.buffer) < size:
+            chunk = self.socket.recv(65536)
+            if not chunk:
+                raise EOFError()
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def frame(self):
+        header = self.__read(9)
+        length = int.from_bytes(header[:3], "big")
+        return header[3], header[4], int.from_bytes(header[5:], "big") & 0x7FFFFFFF, self.__read(length)
+
+    def responses(self, count, on_data=None):
+        """
+        Returns: tuple: The responses keyed by stream, (headers, body), and the streams in the order they ended.
+        """
+        responses = {}
+        ended = []
+        while len(ended) < count:
+            frame_type, flags, stream_id, payload = self.frame()
+            if frame_type == SETTINGS and not flags & ACK:
+                for offset in range(0, len(payload), 6):
+                    identifier, value = struct.unpack_from(">HI", payload, offset)
+                    self.settings[identifier] = value
+            elif frame_type == HEADERS:
+                responses[stream_id] = (dict(self.decoder.decode(payload)), b"")
+            elif frame_type == DATA:
+                headers, body = responses[stream_id]
+                responses[stream_id] = (headers, body + payload)
+                if on_data is not None:
+                    on_data(stream_id, payload)
+            elif frame_type == RST_STREAM:
+                ended.append(stream_id)
+                continue
+            if frame_type in (HEADERS, DATA) and flags & END_STREAM:
+                ended.append(stream_id)
+        return responses, ended
+
+    def close(self):
+        self.socket.close()
+
+
+class TestHPACK(unittest.TestCase):
+
+    def test_rfc_7541_request_examples(self):
+        # RFC 7541 C.4, requests with Huffman coding sharing one dynamic table
+        decoder = Decoder()
+        self.assertEqual(decoder.decode(bytes.fromhex("828684418cf1e3c2e5f23a6ba0ab90f4ff")),
+                         [(":method", "GET"), (":scheme", "http"), (":path", "/"), (":authority", "www.example.com")])
+        self.assertEqual(decoder.decode(bytes.fromhex("828684be5886a8eb10649cbf"))[-1], ("cache-control", "no-cache"))
+        self.assertEqual(decoder.decode(bytes.fromhex("828785bf408825a849e95ba97d7f8925a849e95bb8e8b4bf"))[-1],
+                         ("custom-key", "custom-value"))
+        self.assertEqual(decoder.table.size, 164)
+
+    def test_huffman(self):
+        self.assertEqual(huffman_encode(b"www.example.com").hex(), "f1e3c2e5f23a6ba0ab90f4ff")
+        self.assertEqual(huffman_decode(bytes.fromhex("6402")), b"302")
+        data = bytes(range(256))
+        self.assertEqual(huffman_decode(huffman_encode(data)), data)
+
+    def test_encoder_indexes_repeated_fields(self):
+        encoder = Encoder()
+        decoder = Decoder()
+        headers = [(":status", "200"), ("content-type", "text/html"), ("server", "RollAsBack"),
+                   ("content-length", "5"), ("set-cookie", "a=b")]
+        first = encoder.encode(headers)
+        second = encoder.encode(headers)
+        self.assertLess(len(second), len(first))
+        self.assertEqual(decoder.decode(first), headers)
+        self.assertEqual(decoder.decode(second), headers)
+        # Only the two stable fields were indexed
+        self.assertEqual(len(decoder.table.entries), 2)
+
+    def test_header_list_limit(self):
+        encoder = Encoder()
+        # One indexed entry, then fifty one byte references to it
+        block = encoder.encode([("x-big", "y" * 100)]) + encoder.encode([("x-big", "y" * 100)] * 50)
+        self.assertLess(len(block), 200)
+        with self.assertRaises(HeaderListTooLarge):
+            Decoder(max_header_list_size=1000).decode(block)
+
+
+class TestHttp2Server(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = start_app()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.stop_server()
+
+    def setUp(self):
+        self.client = None
+
+    def tearDown(self):
+        if self.client is not None:
+            self.client.close()
+
+    def test_streams_are_served_concurrently(self):
+        self.client = Client(self.app.server_address)
+        self.client.request(1, "GET", "/slow")
+        self.client.request(3, "GET", "/fast")
+        responses, ended = self.client.responses(2)
+        self.assertEqual(ended, [3, 1])
+        self.assertEqual(responses[1][0][":status"], "200")
+        self.assertEqual(responses[1][1], b"slow")
+        self.assertEqual(responses[3][1], b"fast HTTP/2")
+        self.assertEqual(self.client.settings[SETTINGS_MAX_CONCURRENT_STREAMS], 100)
+
+    def test_upgrade(self):
+        self.client = Client(self.app.server_address, upgrade_path="/fast")
+        self.assertTrue(self.client.head.startswith(b"HTTP/1.1 101"))
+        self.client.request(3, "GET", "/fast")
+        responses, _ = self.client.responses(2)
+        self.assertEqual(responses[1][1], b"fast HTTP/1.1")
+        self.assertEqual(responses[3][1], b"fast HTTP/2")
+
+    def test_request_body_and_split_cookies(self):
+        self.client = Client(self.app.server_address)
+        self.client.request(1, "POST", "/echo", b"payload", [("cookie", "a=1"), ("cookie", "b=2")])
+        responses, _ = self.client.responses(1)
+        self.assertEqual(responses[1][1], b"payload|a=1; b=2")
+
+    def test_body_too_large(self):
+        self.client = Client(self.app.server_address)
+        self.client.request(1, "POST", "/echo", b"x" * 2000)
+        responses, _ = self.client.responses(1)
+        self.assertEqual(responses[1][0][":status"], "413")
+
+    def test_repeated_content_length(self):
+        self.client = Client(self.app.server_address)
+        self.client.request(1, "POST", "/echo", b"x", [("content-length", "1"), ("content-length", "9")])
+        responses, _ = self.client.responses(1)
+        self.assertEqual(responses[1][0][":status"], "400")
+
+    def test_flow_control(self):
+        self.client = Client(self.app.server_address, {SETTINGS_INITIAL_WINDOW_SIZE: 1000})
+        windows = {0: 65535, 1: 1000}
+
+        def on_data(stream_id, payload):
+            # The server never sends more than the windows allow
+            for key in (0, stream_id):
+                windows[key] -= len(payload)
+                self.assertGreaterEqual(windows[key], 0)
+            if windows[stream_id] < 500:
+                increment = 1000 - windows[stream_id]
+                windows[0] += increment
+                windows[stream_id] += increment
+                self.client.socket.sendall(encode_frame(WINDOW_UPDATE, 0, 0, struct.pack(">I", increment))
+                                           + encode_frame(WINDOW_UPDATE, 0, stream_id, struct.pack(">I", increment)))
+
+        self.client.request(1, "GET", "/big")
+        responses, _ = self.client.responses(1, on_data)
+        self.assertEqual(responses[1][1], BIG_BODY.encode())
+
+    def test_http1_clients_are_still_served(self):
+        self.assertTrue(get(self.app.server_address, "/fast").endswith(b"fast HTTP/1.1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -82,6 +82,39 @@ class TestHttpRequest(unittest.TestCase):
         self.assertEqual(http_request.headers, {"Content-Type": "application/x-www-form-urlencoded"})
         self.assertEqual(http_request.body, {"key1": "value1", "key2": "value2"})
 
+    def test_multi_line_body(self):
+        body = "{\n  'note': 'line one',\n  'owner': 'admin'\n}\nX-Injected: yes\n"
+        http_request = HttpRequest(f"POST /api/data HTTP/1.1\r\nContent-Type: text/plain\r\n\r\n{body}")
+        self.assertEqual(http_request.headers, {"Content-Type": "text/plain"})
+        self.assertEqual(http_request.body, body)
+        self.assertEqual(http_request.raw_body, body.encode())
+        http_request.parse(f"POST /api/data HTTP/1.1\nContent-Type: application/json\n \n{body.split('X-')[0]}")
+        self.assertEqual(http_request.body, {"note": "line one", "owner": "admin"})
+
+    def test_bare_lf_empty_line_ends_the_head(self):
+        http_request = HttpRequest("POST / HTTP/1.1\nHost: x\nContent-Length: 3\n\nX-Evil: 1\r\n\r\nabc")
+        self.assertEqual(http_request.headers, {"Host": "x", "Content-Length": "3"})
+        self.assertEqual(http_request.raw_body, b"X-Evil: 1\r\n\r\nabc")
+
+    def test_unparsable_body_is_none(self):
+        http_request = HttpRequest("POST /api/data HTTP/1.1\r\nContent-Type: application/json\r\n\r\n{'key'")
+        self.assertEqual(http_request.method, "POST")
+        self.assertIsNone(http_request.body)
+        self.assertEqual(http_request.raw_body, b"{'key'")
+
+    def test_parse_resets_a_reused_request(self):
+        http_request = HttpRequest("POST /api/data HTTP/1.1\r\nContent-Type: application/json\r\n\r\n{'key': 'value'}")
+        http_request.route = object()
+        http_request.add_background_task(print)
+        http_request.parse("GET /next HTTP/1.1\r\nHost: example.com\r\n\r\n")
+        self.assertEqual(http_request.path, "/next")
+        self.assertEqual(http_request.headers, {"Host": "example.com"})
+        self.assertIsNone(http_request.body)
+        self.assertIsNone(http_request.route)
+        self.assertEqual(http_request.background_tasks, [])
+        self.assertEqual(http_request.raw_body, b"")
+        self.assertFalse(hasattr(http_request, "__dict__"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+import errno
+import os
+import socket
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.listener import systemd_listen_fds, unix_listener
+from tests.helpers import get, serve
+
+
+def start_app(**options):
+    app = RollAsBack("TestApp")
+
+    @app.endpoint("/hello")
+    def hello(request):
+        return HttpResponse(f"hello {request.client_address[0]}", response_headers={})
+
+    return app, serve(app, address=None, handle_signals=False, **options)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets are not available")
+class TestUnixSocket(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "app.sock")
+
+    def test_serve_and_remove_the_socket_file(self):
+        app, thread = start_app(unix_socket=self.path, unix_socket_mode=0o600)
+        self.assertEqual(app.server_address, self.path)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertTrue(get(self.path, "/hello").endswith(b"\r\n\r\nhello unix"))
+        app.stop_server()
+        thread.join(5)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_stale_socket_is_replaced_and_a_live_one_is_not(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        listener = unix_listener(self.path, 5)
+        with self.assertRaises(OSError) as raised:
+            unix_listener(self.path, 5)
+        self.assertEqual(raised.exception.errno, errno.EADDRINUSE)
+        listener.close()
+
+
+class TestInheritedSocket(unittest.TestCase):
+
+    def test_fd(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(5)
+        address = listener.getsockname()
+        app, thread = start_app(fd=listener.detach())
+        self.assertEqual(app.server_address, address)
+        self.assertIn(b"200 OK", get(address, "/hello"))
+        app.stop_server()
+        thread.join(5)
+
+    def test_systemd_listen_fds(self):
+        with mock.patch.dict(os.environ, {"LISTEN_PID": str(os.getpid()), "LISTEN_FDS": "2"}):
+            self.assertEqual(systemd_listen_fds(), [3, 4])
+            self.assertNotIn("LISTEN_FDS", os.environ)
+        with mock.patch.dict(os.environ, {"LISTEN_PID": "1", "LISTEN_FDS": "1"}):
+            self.assertEqual(systemd_listen_fds(), [])
+
+    def test_no_address(self):
+        with self.assertRaises(ValueError):
+            RollAsBack("TestApp").start_server(handle_signals=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_quantiles_from_histogram(self):
+        registry = MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            registry.observe("/fast", 200, 0.005)
+        for _ in range(10):
+            registry.observe("/fast", 200, 0.5)
+        self.assertLessEqual(registry.quantile("/fast", 0.5), 0.01)
+        self.assertGreater(registry.quantile("/fast", 0.99), 0.1)
+        self.assertIsNone(registry.quantile("/unknown", 0.5))
+
+    def test_track_records_failures(self):
+        registry = MetricsRegistry()
+
+        def broken(request):
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            registry.track("/broken", broken)(None)
+        stats = registry.routes["/broken"]
+        self.assertEqual(stats.status_counts, {500: 1})
+        self.assertEqual(stats.in_flight, 0)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def test_prometheus_page(self):
+        app = RollAsBack("TestApp")
+
+        @app.endpoint("/hello")
+        def hello(request):
+            return HttpResponse("Hello", response_headers={}, status=200)
+
+        app.enable_metrics()
+        client = app.test_client()
+        client.get("/hello")
+        client.get("/hello")
+        client.get("/missing")
+
+        page = client.get("/__metrics").text
+        self.assertIn('rollasback_requests_total{route="/hello"} 2', page)
+        self.assertIn('rollasback_responses_total{route="<unmatched>",status="404"} 1', page)
+        self.assertIn('rollasback_request_duration_seconds_bucket{route="/hello",le="+Inf"} 2', page)
+        self.assertIn('rollasback_requests_in_flight{route="/hello"} 0', page)
+        self.assertIn('quantile="0.99"', page)
+        self.assertNotIn('route="/__metrics"', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from tests.helpers import get, serve
+
+# Process handlers are pickled by reference, they live at module level
+notified = []
+
+
+def notify(message):
+    notified.append((os.getpid(), message))
+
+
+def report(request):
+    request.add_background_task(notify, request.path_params[0])
+    return HttpResponse({"pid": os.getpid(), "id": request.path_params[0], "page": request.query_params.get("page"),
+                         "body": request.body, "agent": request.headers.get("User-Agent")},
+                        response_headers={"X-Report": "1"})
+
+
+def pid(request):
+    return HttpResponse(str(os.getpid()), response_headers={})
+
+
+def slow(request):
+    time.sleep(10)
+    return HttpResponse("too late", response_headers={})
+
+
+def broken(request):
+    raise RuntimeError("failed in the worker")
+
+
+class TestProcessPool(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+        self.addCleanup(lambda: self.app.process_pool and self.app.process_pool.close())
+
+    def test_handler_runs_in_a_worker_process(self):
+        self.app.endpoint("/report/{id}", executor="process")(report)
+        response = self.app.test_client().post("/report/7?page=2", json_body={"a": 1},
+                                               headers={"User-Agent": "tester"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["X-Report"], "1")
+        data = response.json()
+        self.assertNotEqual(data["pid"], os.getpid())
+        self.assertEqual([data["id"], data["page"], data["body"], data["agent"]], ["7", ["2"], {"a": 1}, "tester"])
+        # Background tasks added in the worker run in the server process
+        self.assertEqual(notified[-1], (os.getpid(), "7"))
+
+    def test_timeout_frees_the_worker(self):
+        self.app.configure_process_pool(workers=1)
+        self.app.endpoint("/slow", executor="process", timeout=0.5)(slow)
+        self.app.endpoint("/pid", executor="process")(pid)
+        client = self.app.test_client()
+        start = time.monotonic()
+        with self.assertLogs("rollasback", "WARNING"):
+            self.assertEqual(client.get("/slow").status, 504)
+        self.assertLess(time.monotonic() - start, 5)
+        # The alarm of the worker stopped the handler, the only worker is free again
+        self.assertEqual(client.get("/pid").status, 200)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(self.app.process_pool.stats(), {"completed": 1, "failed": 0, "timed_out": 1, "running": 0})
+
+    def test_workers_are_recycled(self):
+        self.app.configure_process_pool(workers=1, max_tasks_per_child=2)
+        self.app.endpoint("/pid", executor="process")(pid)
+        client = self.app.test_client()
+        pids = [client.get("/pid").text for _ in range(4)]
+        self.assertEqual(len(set(pids)), 2)
+        self.assertEqual(pids[0], pids[1])
+
+    def test_workers_are_recycled_before_python_3_11(self):
+        self.app.configure_process_pool(workers=1, max_tasks_per_child=2)
+        self.app.endpoint("/pid", executor="process")(pid)
+        client = self.app.test_client()
+        with mock.patch("src.rollasback.process_pool.NATIVE_RECYCLING", False):
+            pids = [client.get("/pid").text for _ in range(5)]
+        self.assertEqual(len(set(pids)), 3)
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+
+    def test_handler_error_is_a_500(self):
+        self.app.endpoint("/broken", executor="process")(broken)
+        with self.assertRaises(RuntimeError):
+            self.app.test_client().get("/broken")
+        self.assertEqual(self.app.test_client(raise_server_exceptions=False).get("/broken").status, 500)
+
+    def test_server_closes_the_connection(self):
+        # Workers do not inherit the client sockets, closing the connection ends it
+        self.app.endpoint("/pid", executor="process")(pid)
+        serve(self.app, handle_signals=False)
+        self.addCleanup(self.app.stop_server)
+        data = get(self.app.server_address, "/pid")
+        self.assertIn(b"200 OK", data)
+        self.assertNotEqual(data.rpartition(b"\r\n\r\n")[2], str(os.getpid()).encode())
+
+    def test_invalid_registrations(self):
+        with self.assertRaises(ValueError):
+            self.app.endpoint("/x", executor="fork")
+
+        async def handler(request):
+            pass
+
+        with self.assertRaises(ValueError):
+            self.app.endpoint("/x", executor="process")(handler)
+
+
+if __name__ == "__main__":
+    unittest.main()
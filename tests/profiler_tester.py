@@ -0,0 +1,95 @@
+import marshal
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.profiler import RequestProfiler
+from tests.helpers import make_request
+
+
+def slow_handler(request):
+    sum(i * i for i in range(1000))
+    return HttpResponse("done", response_headers={}, status=200)
+
+
+class TestRequestProfiler(unittest.TestCase):
+
+    def test_disabled_sampling_does_not_profile(self):
+        profiler = RequestProfiler(sample_rate=0.0)
+        profiler.wrap("/slow", slow_handler)(make_request("/slow"))
+        self.assertEqual(profiler.routes(), {})
+        self.assertIsNone(profiler.dump())
+
+    def test_sampled_requests_are_aggregated_per_route(self):
+        profiler = RequestProfiler(sample_rate=1.0)
+        handler = profiler.wrap("/slow", slow_handler)
+        handler(make_request("/slow"))
+        handler(make_request("/slow"))
+        self.assertEqual(profiler.routes(), {"/slow": 2})
+        self.assertIn("slow_handler", profiler.report("/slow", sort="tottime"))
+        stats = marshal.loads(profiler.dump("/slow"))
+        self.assertTrue(any(name == "slow_handler" for _, _, name in stats))
+
+    def test_trusted_header(self):
+        profiler = RequestProfiler(token="secret")
+        handler = profiler.wrap("/slow", slow_handler)
+        handler(make_request("/slow", headers="X-RollAsBack-Profile: wrong\r\n"))
+        self.assertEqual(profiler.routes(), {})
+        handler(make_request("/slow", headers="X-RollAsBack-Profile: secret\r\n"))
+        self.assertEqual(profiler.routes(), {"/slow": 1})
+
+
+class TestProfileEndpoint(unittest.TestCase):
+
+    def test_download_and_report(self):
+        app = RollAsBack("TestApp")
+        app.endpoint("/slow")(slow_handler)
+        app.enable_profiling(sample_rate=1.0, allow_anonymous=True)
+        client = app.test_client()
+        client.get("/slow")
+
+        report = client.get("/__profile", params={"route": "/slow", "sort": "calls", "limit": "5"})
+        self.assertEqual(report.status, 200)
+        self.assertIn("/slow: 1 profiled requests", report.text)
+
+        download = client.get("/__profile?format=prof")
+        self.assertEqual(download.headers["Content-Type"], "application/octet-stream")
+        self.assertIsInstance(marshal.loads(download.body), dict)
+
+    def test_invalid_parameters(self):
+        app = RollAsBack("TestApp")
+        app.enable_profiling(sample_rate=1.0, allow_anonymous=True)
+        client = app.test_client()
+        for query in ("sort=bogus", "limit=ten", "limit=-1", "limit=%C2%B2"):
+            response = client.get(f"/__profile?{query}")
+            self.assertEqual(response.status, 400, query)
+
+    def test_endpoint_requires_a_token(self):
+        app = RollAsBack("TestApp")
+        app.endpoint("/slow")(slow_handler)
+        app.enable_profiling(sample_rate=1.0)
+        client = app.test_client()
+        client.get("/slow")
+        self.assertEqual(client.get("/__profile").status, 404)
+        self.assertEqual(app.profiler.routes(), {"/slow": 1})
+
+        app = RollAsBack("TestApp")
+        app.enable_profiling(token="secret")
+        client = app.test_client()
+        self.assertEqual(client.get("/__profile").status, 403)
+        self.assertEqual(client.get("/__profile", headers={"X-RollAsBack-Profile": "secret"}).status, 200)
+
+    def test_async_handlers_are_not_profiled(self):
+        app = RollAsBack("TestApp")
+
+        @app.endpoint("/async")
+        async def handler(request):
+            return HttpResponse("done", response_headers={})
+
+        app.enable_profiling(sample_rate=1.0)
+        self.assertEqual(app.test_client().get("/async").status, 200)
+        self.assertEqual(app.profiler.routes(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
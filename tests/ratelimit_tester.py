@@ -0,0 +1,69 @@
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_request import HttpRequest
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.ratelimit import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket(self):
+        limiter = RateLimiter(rate=2, burst=3)
+        self.assertEqual([limiter.acquire("a", now=0.0) for _ in range(4)], [True, True, True, False])
+        self.assertTrue(limiter.acquire("b", now=0.0))
+        self.assertFalse(limiter.acquire("a", now=0.25))
+        self.assertTrue(limiter.acquire("a", now=0.5))
+        self.assertFalse(limiter.acquire("a", now=0.5))
+        self.assertEqual(limiter.rejected, 3)
+        self.assertEqual(limiter.retry_after, 1)
+
+    def test_table_is_bounded(self):
+        limiter = RateLimiter(rate=1, burst=1, max_keys=100)
+        for i in range(10000):
+            limiter.acquire(f"10.0.{i // 256}.{i % 256}", now=0.0)
+        self.assertEqual(len(limiter), 100)
+        # The oldest keys were evicted and start with a full bucket again
+        self.assertTrue(limiter.acquire("10.0.0.0", now=0.0))
+        self.assertFalse(limiter.acquire("10.0.39.15", now=0.0))
+
+    def test_header_key_falls_back_to_the_client_ip(self):
+        limiter = RateLimiter(rate=1, key="header:X-Api-Key")
+        request = HttpRequest("GET / HTTP/1.1\r\nX-Api-Key: k1\r\n\r\n")
+        self.assertEqual(limiter.key(request), "k1")
+        request = HttpRequest("GET / HTTP/1.1\r\nHost: a\r\n\r\n")
+        request.client_address = ("192.0.2.1", 4000)
+        self.assertEqual(limiter.key(request), "192.0.2.1")
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, key="cookie")
+
+
+class TestAppRateLimits(unittest.TestCase):
+
+    def test_global_and_route_limits(self):
+        app = RollAsBack("TestApp")
+        calls = []
+
+        @app.endpoint("/login", rate_limit=RateLimiter(rate=0.5, burst=1))
+        def login(request):
+            calls.append("login")
+            return HttpResponse("ok", response_headers={})
+
+        @app.endpoint("/home")
+        def home(request):
+            calls.append("home")
+            return HttpResponse("ok", response_headers={})
+
+        app.enable_rate_limit(rate=1, burst=3)
+        client = app.test_client()
+        self.assertEqual(client.get("/login").status, 200)
+        response = client.get("/login")
+        self.assertEqual(response.status, 429)
+        self.assertEqual(response.headers["Retry-After"], "2")
+        self.assertEqual(client.get("/home").status, 200)
+        self.assertEqual(client.get("/home").status, 429)
+        self.assertEqual(calls, ["login", "home"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.redirects import RedirectTable, render_redirect
+
+
+class TestRedirectTable(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_lookup_shares_rendered_responses(self):
+        table = RedirectTable({"/old/": "/new", "/legacy": "/new", "/moved": ("/there", 308)})
+        self.assertEqual(len(table), 3)
+        self.assertIs(table.lookup("/old"), table.lookup("/legacy"))
+        self.assertIsNone(table.lookup("/new"))
+        self.assertEqual(table.lookup("/moved").status, 308)
+        self.assertIn(b"Location: /new\r\n", table.lookup("/old").to_bytes("close"))
+        with self.assertRaises(ValueError):
+            RedirectTable({"/a": ("/b", 200)})
+
+    def test_csv_and_json_files(self):
+        path = self.write("map.csv", "# from,to,status\n/a,/b\n/c,https://example.com/d,307\n")
+        table = RedirectTable(path, status=302)
+        self.assertEqual(table.lookup("/a").status, 302)
+        self.assertEqual(table.lookup("/c").status, 307)
+        path = self.write("map.json", json.dumps([{"from": "/x", "to": "/y", "status": 301}]))
+        self.assertEqual(RedirectTable(path).lookup("/x").status, 301)
+
+    def test_reload(self):
+        path = self.write("map.json", json.dumps({"/a": "/b"}))
+        table = RedirectTable(path)
+        self.write("map.json", json.dumps({"/c": "/d", "/e": "/f"}))
+        self.assertEqual(table.load(), 2)
+        self.assertIsNone(table.lookup("/a"))
+        self.assertIsNotNone(table.lookup("/e"))
+
+    def test_location_is_escaped_in_the_body(self):
+        response = render_redirect('/a?b="c"', 302)
+        self.assertIn(b"url=/a?b=&quot;c&quot;", response.to_bytes("close"))
+
+
+class TestAppRedirects(unittest.TestCase):
+
+    def test_redirects_before_routes(self):
+        app = RollAsBack("TestApp")
+
+        @app.endpoint("/products/{id}")
+        def product(request):
+            return HttpResponse("product", response_headers={})
+
+        app.redirects({"/products/legacy": "/products/1"})
+        client = app.test_client()
+        response = client.get("/products/legacy?ref=mail")
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.headers["Location"], "/products/1")
+        self.assertEqual(client.get("/products/2").status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
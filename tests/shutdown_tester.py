@@ -0,0 +1,96 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+
+from tests.helpers import free_port, get
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_SCRIPT = textwrap.dedent("""
+    import os
+    import sys
+    import time
+    sys.path.insert(0, ROOT)
+    from src.rollasback.app import RollAsBack
+    from src.rollasback.http_response import HttpResponse
+
+    app = RollAsBack("ShutdownApp")
+
+    @app.endpoint("/pid")
+    def pid(request):
+        return HttpResponse(str(os.getpid()), response_headers={})
+
+    @app.endpoint("/slow")
+    def slow(request):
+        time.sleep(0.5)
+        return HttpResponse(str(os.getpid()), response_headers={})
+
+    app.start_server("127.0.0.1", int(sys.argv[1]), shutdown_timeout=5)
+""")
+
+
+def wait_until_up(address):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            return get(address, "/pid")
+        except OSError:
+            time.sleep(0.05)
+    raise AssertionError("server did not start")
+
+
+class TestGracefulShutdown(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        script = os.path.join(self.directory.name, "server.py")
+        with open(script, "w") as file:
+            file.write(SERVER_SCRIPT.replace("ROOT", repr(ROOT)))
+        self.port = free_port()
+        self.process = subprocess.Popen([sys.executable, script, str(self.port)], stderr=subprocess.DEVNULL)
+        self.address = ("127.0.0.1", self.port)
+        wait_until_up(self.address)
+
+    def tearDown(self):
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.directory.cleanup()
+
+    def test_sigterm_finishes_in_flight_requests(self):
+        responses = []
+        request = threading.Thread(target=lambda: responses.append(get(self.address, "/slow")))
+        request.start()
+        time.sleep(0.2)
+        self.process.send_signal(signal.SIGTERM)
+        request.join()
+        self.assertTrue(responses[0].startswith(b"HTTP/1.1 200"))
+        self.assertEqual(self.process.wait(timeout=5), 0)
+        with self.assertRaises(OSError):
+            get(self.address, "/pid")
+
+    def test_sighup_hands_the_socket_to_a_new_process(self):
+        old_pid = str(self.process.pid).encode()
+        responses = []
+        request = threading.Thread(target=lambda: responses.append(get(self.address, "/slow")))
+        request.start()
+        time.sleep(0.2)
+        self.process.send_signal(signal.SIGHUP)
+        self.assertEqual(self.process.wait(timeout=10), 0)
+        request.join()
+        self.assertTrue(responses[0].endswith(old_pid))
+
+        new_pid = re.search(rb"(\d+)$", get(self.address, "/pid")).group(1)
+        self.addCleanup(os.kill, int(new_pid), signal.SIGTERM)
+        self.assertNotEqual(new_pid, old_pid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import socket
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.sse import EventHub, EventStreamResponse, HEARTBEAT, encode_event
+from tests.helpers import serve
+
+
+class TestEncoding(unittest.TestCase):
+
+    def test_encode_event(self):
+        self.assertEqual(encode_event("a\r\nb", event="tick", id=7),
+                         b"event: tick\nid: 7\ndata: a\ndata: b\n\n")
+        self.assertEqual(encode_event({"n": 1}), b'data: {"n":1}\n\n')
+        with self.assertRaises(ValueError):
+            encode_event("x", event="a\nb")
+
+    def test_response(self):
+        response = EventStreamResponse(iter(["hello", b"data: raw\n\n"]), retry=3000)
+        self.assertIn(b"Content-Type: text/event-stream\r\n", response.head())
+        self.assertIn(b"Cache-Control: no-cache\r\n", response.head())
+        self.assertEqual(b"".join(response.iter_body()), b"retry: 3000\n\ndata: hello\n\ndata: raw\n\n")
+
+
+class TestEventHub(unittest.TestCase):
+
+    def test_broadcast_shares_the_encoded_event(self):
+        hub = EventHub(heartbeat=0.01)
+        first, second = hub.subscribe(), hub.subscribe()
+        hub.publish("hi", event="greeting")
+        self.assertIs(next(first), next(second))
+        self.assertEqual(next(first), HEARTBEAT)
+        first.close()
+        self.assertEqual(len(hub), 1)
+        with self.assertRaises(StopIteration):
+            next(first)
+
+    def test_replay_after_last_event_id(self):
+        hub = EventHub(history=3)
+        for number in range(5):
+            hub.publish(number)
+        subscription = hub.subscribe(last_event_id="3")
+        self.assertEqual([next(subscription), next(subscription)], [encode_event(3, id="4"), encode_event(4, id="5")])
+        # An ID gone from the ring buffer replays everything it holds
+        self.assertEqual(len(hub.subscribe(last_event_id="1").backlog), 3)
+
+    def test_overflow_policies(self):
+        hub = EventHub(queue_size=2)
+        subscription = hub.subscribe()
+        for number in range(4):
+            hub.publish(number)
+        self.assertEqual(subscription.dropped, 2)
+        self.assertEqual(next(subscription), encode_event(2, id="3"))
+
+        hub = EventHub(queue_size=2, overflow="disconnect")
+        subscription = hub.subscribe()
+        for number in range(3):
+            hub.publish(number)
+        self.assertTrue(subscription.closed)
+        self.assertEqual(len(hub), 0)
+        with self.assertRaises(StopIteration):
+            next(subscription)
+
+
+class TestServerEvents(unittest.TestCase):
+
+    def test_stream_ends_when_the_server_stops(self):
+        app = RollAsBack("TestApp")
+        hub = app.event_hub()
+
+        @app.endpoint("/events")
+        def events(request):
+            return hub.stream(request)
+
+        serve(app, handle_signals=False, shutdown_timeout=5)
+        hub.publish("zero")
+        hub.publish("one")
+        with socket.create_connection(app.server_address, timeout=5) as client:
+            client.sendall(b"GET /events HTTP/1.1\r\nHost: test\r\nLast-Event-ID: 1\r\n\r\n")
+            while len(hub) == 0:
+                time.sleep(0.01)
+            hub.publish("two")
+            data = b""
+            while b"data: two" not in data:
+                data += client.recv(65536)
+            self.assertIn(b"Transfer-Encoding: chunked", data)
+            self.assertNotIn(b"data: zero", data)
+            self.assertIn(b"id: 2\ndata: one\n\n", data)
+            started = time.monotonic()
+            app.stop_server()
+            while not data.endswith(b"0\r\n\r\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            self.assertTrue(data.endswith(b"0\r\n\r\n"))
+            self.assertLess(time.monotonic() - started, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+
+
+class TestTestClient(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+
+        @self.app.endpoint("/items/{item_id}")
+        def item(request):
+            return HttpResponse({"id": request.path_params[0], "q": request.query_params.get("q"),
+                                 "body": request.body, "client": request.client_address[0]},
+                                response_headers={"X-Item": request.path_params[0]})
+
+        @self.app.endpoint("/echo")
+        def echo(request):
+            return HttpResponse(request.raw_body, response_headers={}, mimetype="application/octet-stream")
+
+        @self.app.endpoint("/broken")
+        def broken(request):
+            raise RuntimeError("boom")
+
+        @self.app.after_request
+        def tag(request, response):
+            response.response_headers["X-Tagged"] = "yes"
+
+    def test_request_goes_through_the_pipeline(self):
+        client = self.app.test_client()
+        response = client.post("/items/3", params={"q": "x"}, json_body={"name": "ada"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["X-Item"], "3")
+        self.assertEqual(response.headers["X-Tagged"], "yes")
+        self.assertEqual(response.json(), {"id": "3", "q": ["x"], "body": {"name": "ada"}, "client": "testclient"})
+        self.assertEqual(client.get("/missing").status, 404)
+
+    def test_head_has_no_body(self):
+        client = self.app.test_client()
+        head = client.head("/items/3")
+        self.assertEqual(head.headers["Content-Length"], str(len(client.get("/items/3").body)))
+        self.assertEqual(head.body, b"")
+
+    def test_binary_body_and_server_head_parsing(self):
+        client = self.app.test_client()
+        response = client.post("/echo", body=bytes([0xff, 0, 0x10]))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, bytes([0xff, 0, 0x10]))
+        # The head is checked by parse_head, an invalid Content-Length gets the 400 of the server
+        self.assertEqual(client.get("/items/3", headers={"Content-Length": "x"}).status, 400)
+
+    def test_handler_errors(self):
+        with self.assertRaises(RuntimeError):
+            self.app.test_client().get("/broken")
+        self.assertEqual(self.app.test_client(raise_server_exceptions=False).get("/broken").status, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import json
+import time
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_request import HttpRequest
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.timing import RequestTiming
+from tests.helpers import get, response_headers, serve
+
+
+class TestRequestTiming(unittest.TestCase):
+
+    def test_header_value_and_dict(self):
+        timing = RequestTiming()
+        timing.add_phase("recv", 250000)
+        timing.add_phase("handler", 1000000)
+        timing.add_phase("handler", 500000)
+        timing.add("db", 2000000, 'orders "open"')
+        timing.add("db", 1000000)
+        self.assertEqual(timing.header_value(), 'recv;dur=0.250, handler;dur=1.500, db;dur=2.000;desc="orders \\"open\\"", '
+                                                'db;dur=1.000')
+        self.assertEqual(timing.to_dict(), {"recv": 0.25, "handler": 1.5, "db": 3.0})
+
+    def test_span(self):
+        timing = RequestTiming()
+        with timing.span("cache"):
+            time.sleep(0.01)
+        name, duration, description = timing.spans[0]
+        self.assertEqual((name, description), ("cache", None))
+        self.assertGreaterEqual(duration, 10000000)
+
+    def test_spans_are_ignored_while_disabled(self):
+        request = HttpRequest("GET / HTTP/1.1\r\nHost: test\r\n\r\n")
+        with request.timing.span("db"):
+            pass
+        request.timing.add("cache", 1000)
+
+
+class TestServerTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.app = RollAsBack("TestApp")
+
+        @self.app.endpoint("/orders")
+        def orders(request):
+            with request.timing.span("db", "orders query"):
+                time.sleep(0.01)
+            return HttpResponse("orders", response_headers={})
+
+        self.orders = orders
+
+    def start(self):
+        serve(self.app, handle_signals=False)
+        self.addCleanup(self.app.stop_server)
+
+    def test_header_and_access_log(self):
+        stream = io.StringIO()
+        self.app.enable_access_log(target=stream)
+        self.app.enable_server_timing()
+        self.start()
+        header = response_headers(get(self.app.server_address, "/orders"))["Server-Timing"]
+        self.assertEqual([entry.split(";")[0] for entry in header.split(", ")],
+                         ["recv", "parse", "route", "handler", "db"])
+        self.assertIn(';desc="orders query"', header)
+        self.app.access_log.close()
+        timings = json.loads(stream.getvalue().splitlines()[0])["timings"]
+        self.assertEqual(list(timings), ["recv", "parse", "route", "handler", "serialize", "send", "db"])
+        self.assertGreaterEqual(timings["handler"], timings["db"])
+        self.assertGreaterEqual(timings["db"], 10)
+
+    def test_header_disabled(self):
+        stream = io.StringIO()
+        self.app.enable_access_log(target=stream)
+        self.app.enable_server_timing(header=False)
+        self.start()
+        self.assertNotIn("Server-Timing", response_headers(get(self.app.server_address, "/orders")))
+        self.app.access_log.close()
+        self.assertIn("db", json.loads(stream.getvalue().splitlines()[0])["timings"])
+
+    def test_timers_are_added_only_when_enabled(self):
+        self.app.build_pipeline()
+        self.assertIs(self.app.routes[0].handler, self.orders)
+        self.app.enable_server_timing()
+        pipeline = self.app.build_pipeline()
+        self.assertIsNot(self.app.routes[0].handler, self.orders)
+        request = HttpRequest("GET /orders HTTP/1.1\r\nHost: test\r\n\r\n")
+        request.timing = RequestTiming()
+        self.assertEqual(pipeline(request).message, b"orders")
+        self.assertEqual(list(request.timing.phases), ["route", "handler"])
+
+    def test_disabled_by_default(self):
+        stream = io.StringIO()
+        self.app.enable_access_log(target=stream)
+        self.start()
+        self.assertNotIn("Server-Timing", response_headers(get(self.app.server_address, "/orders")))
+        self.app.access_log.close()
+        self.assertNotIn("timings", json.loads(stream.getvalue().splitlines()[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
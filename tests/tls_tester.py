@@ -0,0 +1,95 @@
+import base64
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.http_response import HttpResponse
+from src.rollasback.tls import client_context, generate_self_signed
+from src.rollasback.websocket import FrameParser, TEXT, encode_frame
+from tests.helpers import read_all, serve
+
+
+@unittest.skipIf(shutil.which("openssl") is None, "the openssl command is required to generate a certificate")
+class TestTLSServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.certfile = os.path.join(cls.directory.name, "cert.pem")
+        keyfile = os.path.join(cls.directory.name, "key.pem")
+        generate_self_signed(cls.certfile, keyfile)
+        # A session is resumed with the context it was created by
+        cls.context = client_context(cafile=cls.certfile)
+        cls.app = RollAsBack("TestApp")
+
+        @cls.app.endpoint("/hello")
+        def hello(request):
+            return HttpResponse("hello", response_headers={})
+
+        @cls.app.websocket("/echo")
+        async def echo(websocket):
+            async for message in websocket:
+                await websocket.send(message)
+
+        serve(cls.app, handle_signals=False, certfile=cls.certfile, keyfile=keyfile)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.stop_server()
+        cls.directory.cleanup()
+
+    def connect(self, session=None):
+        raw = socket.create_connection(self.app.server_address, timeout=5)
+        return self.context.wrap_socket(raw, server_hostname="localhost", session=session)
+
+
+    def test_resumed_session_and_alpn(self):
+        with self.connect() as client:
+            self.assertEqual(client.selected_alpn_protocol(), "http/1.1")
+            self.assertFalse(client.session_reused)
+            client.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+            self.assertTrue(read_all(client).endswith(b"\r\n\r\nhello"))
+            session = client.session
+        hits = self.app.tls_context.session_stats()["hits"]
+        with self.connect(session) as client:
+            self.assertTrue(client.session_reused)
+            client.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+            self.assertIn(b"200 OK", read_all(client))
+        self.assertEqual(self.app.tls_context.session_stats()["hits"], hits + 1)
+
+    def test_plain_text_client_does_not_block_others(self):
+        with socket.create_connection(self.app.server_address, timeout=5) as plain:
+            plain.sendall(b"GET /hello HTTP/1.1\r\n\r\n")
+            with self.connect() as client:
+                client.sendall(b"GET /hello HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n")
+                self.assertIn(b"200 OK", read_all(client))
+            try:
+                answer = plain.recv(65536)
+            except ConnectionResetError:
+                answer = b""
+            self.assertNotIn(b"HTTP/1.1", answer)
+
+    def test_async_websocket(self):
+        key = base64.b64encode(os.urandom(16)).decode()
+        with self.connect() as client:
+            client.sendall(f"GET /echo HTTP/1.1\r\nHost: test\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                           f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+            data = b""
+            while b"\r\n\r\n" not in data:
+                data += client.recv(65536)
+            self.assertTrue(data.startswith(b"HTTP/1.1 101"))
+            parser = FrameParser(mask_required=False)
+            parser.feed(data.partition(b"\r\n\r\n")[2])
+            client.sendall(encode_frame(TEXT, b"over tls", mask=os.urandom(4)))
+            frame = parser.next_frame()
+            while frame is None:
+                parser.feed(client.recv(65536))
+                frame = parser.next_frame()
+            self.assertEqual(frame, (TEXT, b"over tls"))
+
+
+if __name__ == "__main__":
+    unittest.main()
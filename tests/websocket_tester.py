@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import os
+import socket
+import threading
+import unittest
+
+from src.rollasback.app import RollAsBack
+from src.rollasback.websocket import (BINARY, CLOSE, PING, PONG, TEXT, CONTINUATION, FrameParser, WebSocketError,
+                                      accept_key, encode_close, encode_frame)
+from tests.helpers import serve
+
+
+def masked(opcode, payload=b"", fin=True):
+    return encode_frame(opcode, payload, fin=fin, mask=os.urandom(4))
+
+
+def start_app():
+    app = RollAsBack("TestApp")
+
+    @app.websocket("/echo/{room}", max_message_size=64)
+    def echo(websocket):
+        for message in websocket:
+            websocket.send(f"{websocket.request.path_params[0]}:{message}" if isinstance(message, str) else message)
+
+    @app.websocket("/async", subprotocols=("chat",))
+    async def async_echo(websocket):
+        async for message in websocket:
+            await websocket.send_json({"echo": message, "subprotocol": websocket.subprotocol})
+
+    serve(app)
+    return app
+
+
+class Client:
+
+    def __init__(self, address, path, extra=""):
+        self.socket = socket.create_connection(address, timeout=5)
+        self.key = base64.b64encode(os.urandom(16)).decode()
+        self.socket.sendall((f"GET {path} HTTP/1.1\r\nHost: test\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                             f"Sec-WebSocket-Key: {self.key}\r\nSec-WebSocket-Version: 13\r\n{extra}\r\n").encode())
+        self.parser = FrameParser(mask_required=False)
+        data = b""
+        while b"\r\n\r\n" not in data:
+            data += self.socket.recv(4096)
+        self.head, _, rest = data.partition(b"\r\n\r\n")
+        self.parser.feed(rest)
+
+    def frame(self):
+        while True:
+            frame = self.parser.next_frame()
+            if frame is not None:
+                return frame
+            self.parser.feed(self.socket.recv(65536))
+
+
+class TestFrames(unittest.TestCase):
+
+    def test_accept_key(self):
+        # RFC 6455 section 1.3
+        self.assertEqual(accept_key("dGhlIHNhbXBsZSBub25jZQ=="), "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=")
+
+    def test_fragments_with_a_ping_in_between(self):
+        parser = FrameParser()
+        data = masked(TEXT, b"hel", fin=False) + masked(PING, b"p") + masked(CONTINUATION, "lo ü".encode())
+        # Fed byte by byte, frames only come out once complete
+        frames = []
+        for byte in data:
+            parser.feed(bytes([byte]))
+            frame = parser.next_frame()
+            if frame is not None:
+                frames.append(frame)
+        self.assertEqual(frames, [(PING, b"p"), (TEXT, "hello ü".encode())])
+
+    def test_long_lengths(self):
+        parser = FrameParser(max_message_size=1 << 20)
+        payload = os.urandom(70000)
+        parser.feed(masked(BINARY, payload))
+        self.assertEqual(parser.next_frame(), (BINARY, payload))
+
+    def test_protocol_errors(self):
+        cases = [(encode_frame(TEXT, b"a"), 1002), (masked(CONTINUATION, b"a"), 1002),
+                 (masked(PING, b"a", fin=False), 1002), (masked(BINARY, b"x" * 20), 1009)]
+        for data, code in cases:
+            parser = FrameParser(max_message_size=10)
+            parser.feed(data)
+            with self.assertRaises(WebSocketError) as context:
+                parser.next_frame()
+            self.assertEqual(context.exception.code, code)
+
+
+class TestServerWebSockets(unittest.TestCase):
+
+    def setUp(self):
+        self.app = start_app()
+        self.address = self.app.server_address
+
+    def tearDown(self):
+        self.app.stop_server()
+
+    def test_blocking_handler(self):
+        client = Client(self.address, "/echo/lobby")
+        self.assertTrue(client.head.startswith(b"HTTP/1.1 101 Switching Protocols"))
+        self.assertIn(f"Sec-WebSocket-Accept: {accept_key(client.key)}".encode(), client.head)
+        client.socket.sendall(masked(TEXT, b"hi") + masked(PING, b"x") + masked(BINARY, b"\x00\x01"))
+        self.assertEqual(client.frame(), (TEXT, b"lobby:hi"))
+        self.assertEqual(client.frame(), (PONG, b"x"))
+        self.assertEqual(client.frame(), (BINARY, b"\x00\x01"))
+        client.socket.sendall(masked(CLOSE, encode_close(1000)))
+        self.assertEqual(client.frame(), (CLOSE, encode_close(1000)))
+        client.socket.close()
+
+    def test_message_too_big(self):
+        client = Client(self.address, "/echo/lobby")
+        client.socket.sendall(masked(TEXT, b"x" * 100))
+        opcode, payload = client.frame()
+        self.assertEqual((opcode, payload[:2]), (CLOSE, b"\x03\xf1"))
+        client.socket.close()
+
+    def test_async_handler_holds_no_thread(self):
+        clients = [Client(self.address, "/async", "Sec-WebSocket-Protocol: other, chat\r\n") for _ in range(20)]
+        threads = threading.active_count()
+        for index, client in enumerate(clients):
+            self.assertIn(b"Sec-WebSocket-Protocol: chat", client.head)
+            client.socket.sendall(masked(TEXT, str(index).encode()))
+        for index, client in enumerate(clients):
+            self.assertEqual(client.frame(), (TEXT, f'{{"echo": "{index}", "subprotocol": "chat"}}'.encode()))
+        self.assertLessEqual(threading.active_count(), threads)
+        for client in clients:
+            client.socket.close()
+
+    def test_bad_handshake(self):
+        with socket.create_connection(self.address, timeout=5) as client:
+            client.sendall(b"GET /echo/a HTTP/1.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                           b"Sec-WebSocket-Key: abc\r\nSec-WebSocket-Version: 8\r\n\r\n")
+            response = client.recv(65536)
+        self.assertTrue(response.startswith(b"HTTP/1.1 426"))
+        self.assertIn(b"Sec-WebSocket-Version: 13", response)
+
+
+class TestASGIWebSockets(unittest.TestCase):
+
+    def test_asgi_scope(self):
+        app = RollAsBack("TestApp")
+
+        @app.websocket("/live")
+        def live(websocket):
+            websocket.send("hello " + websocket.receive())
+
+        events = [{"type": "websocket.connect"}, {"type": "websocket.receive", "text": "bob"}]
+        sent = []
+
+        async def receive():
+            return events.pop(0) if events else {"type": "websocket.disconnect", "code": 1000}
+
+        async def send(event):
+            sent.append(event)
+
+        asyncio.run(app.asgi({"type": "websocket", "path": "/live", "headers": [], "query_string": b""},
+                             receive, send))
+        self.assertEqual([event["type"] for event in sent], ["websocket.accept", "websocket.send", "websocket.close"])
+        self.assertEqual(sent[1]["text"], "hello bob")
+
+
+if __name__ == '__main__':
+    unittest.main()